@@ -0,0 +1,87 @@
+"""
+Async access to the blocking sqlite3 core functions.
+Core calls run on a dedicated DB thread pool so a slow query never blocks the event
+loop. Context variables, including the request UnitOfWork, follow the call into the
+worker thread.
+Request units of work are finished on a separate commit pool: a DB thread may sit in
+ConnectionPool.acquire() waiting for a connection that only a queued commit would
+release, so commits must never queue behind those waiters.
+"""
+import os
+import asyncio
+import functools
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import app.core.config  # adds execution/ to sys.path
+
+# Threads beyond the connection pool size simply wait in acquire() (up to DB_POOL_TIMEOUT)
+DB_EXECUTOR_THREADS = int(os.environ.get('DB_EXECUTOR_THREADS', str(min(32, (os.cpu_count() or 1) + 4))))
+DB_COMMIT_THREADS = int(os.environ.get('DB_COMMIT_THREADS', '4'))
+
+_executor = None
+_commit_executor = None
+_executor_lock = threading.Lock()
+_stats = {"submitted": 0, "in_flight": 0, "max_in_flight": 0, "commits": 0}
+
+def get_db_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_THREADS, thread_name_prefix="db")
+    return _executor
+
+def get_commit_executor() -> ThreadPoolExecutor:
+    global _commit_executor
+    if _commit_executor is None:
+        with _executor_lock:
+            if _commit_executor is None:
+                _commit_executor = ThreadPoolExecutor(max_workers=DB_COMMIT_THREADS, thread_name_prefix="db-commit")
+    return _commit_executor
+
+async def run_db(fn, *args, **kwargs):
+    """Run a blocking DB function on the DB thread pool and await its result."""
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, fn, *args, **kwargs)
+    _stats["submitted"] += 1
+    _stats["in_flight"] += 1
+    _stats["max_in_flight"] = max(_stats["max_in_flight"], _stats["in_flight"])
+    try:
+        return await loop.run_in_executor(get_db_executor(), call)
+    finally:
+        _stats["in_flight"] -= 1
+
+async def finish_unit_of_work(uow, success: bool):
+    """
+    Commit (or roll back) a request UnitOfWork off the event loop and release its connection.
+    One that holds a connection is finished on the commit pool, which never waits for the
+    connection pool; one without a connection may still need one (deferred audit rows) and
+    goes through the DB pool like any other call.
+    """
+    if uow.conn is None:
+        return await run_db(uow.finish, success)
+    _stats["commits"] += 1
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, uow.finish, success)
+    return await loop.run_in_executor(get_commit_executor(), call)
+
+def awaitable(fn):
+    """Wrap a blocking core function as a coroutine function that runs on the DB thread pool."""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await run_db(fn, *args, **kwargs)
+    return wrapper
+
+def db_executor_stats() -> dict:
+    return {"threads": DB_EXECUTOR_THREADS, "commit_threads": DB_COMMIT_THREADS, **_stats}
+
+def shutdown_db_executor():
+    """Wait for queued DB work and stop the worker threads (call on application shutdown)."""
+    global _executor, _commit_executor
+    with _executor_lock:
+        executors, _executor, _commit_executor = (_executor, _commit_executor), None, None
+    for executor in executors:
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -1,42 +1,30 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Optional, Dict
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
+from app.core.config import SECRET_KEY, ALGORITHM  # loads .env and adds execution/ to sys.path
+from auth.tokens import create_token, verify_token
 
 # Configurações
-SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here-change-in-production")
-ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    return create_token(data, expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
 
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     if not token:
         return {"_error": "No token provided", "sub": None}
     
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            return {"_error": "Invalid token", "sub": None}
-        return {"sub": user_id, **payload}
-    except JWTError:
+    # Cached claims for tokens already verified (until exp); signature check otherwise
+    payload = verify_token(token)
+    if payload is None:
         return {"_error": "Could not validate credentials", "sub": None}
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        return {"_error": "Invalid token", "sub": None}
+    return {"sub": user_id, **payload}
 
 async def get_current_active_user(current_user: dict = Depends(get_current_user)):
     if current_user.get("_error"):
@@ -55,10 +43,7 @@ async def get_current_admin_user(current_user: dict = Depends(get_current_active
 
 def get_optional_user(token: str = Depends(oauth2_scheme)):
     """Get user if token exists, otherwise return None"""
-    if not token:
+    payload = verify_token(token)
+    if payload is None:
         return None
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return {"sub": payload.get("sub"), **payload}
-    except JWTError:
-        return None
\ No newline at end of file
+    return {"sub": payload.get("sub"), **payload}
\ No newline at end of file
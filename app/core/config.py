@@ -3,11 +3,13 @@ Core configuration and utilities for the API.
 """
 import os
 import sys
+from dotenv import load_dotenv
+
+load_dotenv()
 
 # Add execution directory to Python path for importing existing modules
-EXECUTION_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'execution')
+EXECUTION_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'execution')
 sys.path.insert(0, EXECUTION_DIR)
 
-# JWT Configuration (reuse from execution/auth/utils.py)
-SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-me')
-ALGORITHM = 'HS256'
+# JWT Configuration (single source: execution/auth/tokens.py)
+from auth.tokens import SECRET_KEY, ALGORITHM
@@ -1,6 +1,9 @@
 from fastapi import Depends, HTTPException, status
 from app.core.auth import get_current_user, get_current_active_user
+import app.core.config  # adds execution/ to sys.path
 from typing import Optional, Dict
+from app.core.async_db import finish_unit_of_work
+from db import UnitOfWork
 
 # Funções existentes
 async def get_current_admin_user(current_user: dict = Depends(get_current_active_user)):
@@ -19,6 +22,18 @@ async def get_optional_user(current_user: dict = Depends(get_current_user)):
         return current_user
     return None
 
+async def get_unit_of_work():
+    """Request-scoped unit of work: every core call and audit row in the request share one commit"""
+    uow = UnitOfWork().bind()
+    success = False
+    try:
+        yield uow
+        success = True
+    finally:
+        # Commit off the event loop so the fsync never blocks it
+        await finish_unit_of_work(uow, success)
+        uow.unbind()
+
 def get_org_context(org_id: Optional[int] = None):
     """Get organization context from request"""
     # Implementar lógica de organização multi-tenancy
@@ -0,0 +1,53 @@
+"""
+Asset responses that avoid Python-level read() loops, using the best path the ASGI server offers:
+- `http.response.pathsend` (ASGI Path Send extension, e.g. Granian): whole-file (200) answers
+  are handed to the server by path, and the server sends the file itself.
+- `http.response.zerocopy` (ASGI Zero Copy Send extension): the server gets the open file,
+  offset and count and can send it with sendfile(2), byte ranges included.
+- Everywhere else, uvicorn included, the body (or range slice) is cut from a memory map of the
+  file on the threadpool (files.delivery.iter_mmap_range): no read() calls, but each chunk is
+  still copied once into Python. Behind uvicorn only ASSET_SERVE_MODE=accel is zero-copy.
+The file is opened and mapped on the threadpool, never on the event loop.
+"""
+import os
+from fastapi.responses import Response
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+import app.core.config  # adds execution/ to sys.path
+from files.delivery import iter_mmap_range
+
+class FileRangeResponse(Response):
+    """Bytes start..end (inclusive) of a file; the caller sets Content-Length/Content-Range."""
+
+    def __init__(self, path: str, start: int, end: int, status_code: int = 200, headers: dict = None,
+                 media_type: str = None):
+        self.path = path
+        self.start = start
+        self.end = end
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers(headers)
+
+    async def __call__(self, scope, receive, send):
+        extensions = scope.get("extensions") or {}
+        count = self.end - self.start + 1
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if count > 0 and self.status_code == 200 and "http.response.pathsend" in extensions:
+            await send({"type": "http.response.pathsend", "path": os.path.abspath(self.path)})
+            return
+        if count > 0 and "http.response.zerocopy" in extensions:
+            f = await run_in_threadpool(open, self.path, 'rb')
+            try:
+                await send({
+                    "type": "http.response.zerocopy",
+                    "file": f,
+                    "offset": self.start,
+                    "count": count,
+                    "more_body": False,
+                })
+            finally:
+                await run_in_threadpool(f.close)
+            return
+        async for chunk in iterate_in_threadpool(iter_mmap_range(self.path, self.start, self.end)):
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
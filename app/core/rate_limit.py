@@ -0,0 +1,70 @@
+"""
+Per-IP request throttling for the auth endpoints.
+Plain ASGI middleware backed by the in-process sliding-window limiters in
+execution/infra/rate_limiter.py; the check never touches SQLite.
+"""
+import os
+import math
+from fastapi.responses import JSONResponse
+import app.core.config  # adds execution/ to sys.path
+from app.core.responses import error_response
+from infra.rate_limiter import get_limiter
+
+# Requests per IP per minute (override via env vars)
+RATE_LIMIT_LOGIN_PER_MINUTE = int(os.environ.get('RATE_LIMIT_LOGIN_PER_MINUTE', '20'))
+RATE_LIMIT_REGISTER_PER_MINUTE = int(os.environ.get('RATE_LIMIT_REGISTER_PER_MINUTE', '5'))
+RATE_LIMIT_RESET_PER_MINUTE = int(os.environ.get('RATE_LIMIT_RESET_PER_MINUTE', '5'))
+# Only trust X-Forwarded-For when running behind a reverse proxy that sets it
+TRUST_PROXY_HEADERS = os.environ.get('TRUST_PROXY_HEADERS', 'false').lower() == 'true'
+
+ERR_RATE_LIMITED = "auth.too_many_attempts"
+
+def default_rules() -> list:
+    """(path prefix, limiter) pairs; the first matching prefix wins."""
+    return [
+        ("/auth/login", get_limiter("http_login", RATE_LIMIT_LOGIN_PER_MINUTE, 60)),
+        ("/auth/register", get_limiter("http_register", RATE_LIMIT_REGISTER_PER_MINUTE, 60)),
+        ("/auth/password-reset", get_limiter("http_password_reset", RATE_LIMIT_RESET_PER_MINUTE, 60)),
+    ]
+
+def client_ip(scope) -> str:
+    if TRUST_PROXY_HEADERS:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+class RateLimitMiddleware:
+    """Throttle matching requests per client IP; blocked requests get the standard error envelope."""
+
+    def __init__(self, app, rules: list = None):
+        self.app = app
+        self.rules = rules if rules is not None else default_rules()
+
+    def _match(self, path: str):
+        for prefix, limiter in self.rules:
+            if path.startswith(prefix):
+                return limiter
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+        limiter = self._match(scope.get("path", ""))
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        allowed, retry_after = limiter.acquire(client_ip(scope))
+        if not allowed:
+            # HTTP 200 + envelope like every other endpoint; Retry-After tells clients when to retry
+            response = JSONResponse(
+                error_response(ERR_RATE_LIMITED),
+                status_code=200,
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
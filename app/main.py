@@ -1,21 +1,33 @@
 """
 FastAPI main application entry point.
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, members, events, announcements, worship_files, worship_repertoire, worship_schedule, rsvp
+from app.core.dependencies import get_unit_of_work
+from app.core.async_db import db_executor_stats, shutdown_db_executor
+from app.core.rate_limit import RateLimitMiddleware
+from app.routers import auth, members, events, announcements, worship_files, worship_repertoire, worship_schedule, rsvp, debug
 import os
 import sys
 
 # Seed dev admin on startup if DEV_MODE=true
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'execution'))
 from auth.seed_dev_admin import seed_dev_admin
+from db import pool_stats, close_pool
+from infra.audit_sink import audit_sink_stats, shutdown_audit_sink
+from infra.rate_limiter import rate_limiter_stats, load_snapshot, shutdown_rate_limiter
+from auth.tokens import token_cache_stats
+from auth.hashing import hash_pool_stats, shutdown_hash_pool
+from announcements.feed_cache import feed_cache_stats
+from announcements.fanout import fanout_stats, shutdown_fanout
+from migrations import migrate
 
 app = FastAPI(
     title="Church Agenda API",
     description="REST API for Church Management System",
-    version="1.0.0"
+    version="1.0.0",
+    dependencies=[Depends(get_unit_of_work)]  # one transaction/commit per API call
 )
 
 # CORS middleware
@@ -27,11 +39,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-IP throttling of /auth/login, /auth/register and the password-reset flow
+app.add_middleware(RateLimitMiddleware)
+
 # Seed dev admin on startup
 @app.on_event("startup")
 async def startup_event():
+    if os.getenv("AUTO_MIGRATE", "true").lower() == "true":
+        migrate()
+    load_snapshot()  # no-op unless RATE_LIMIT_PERSIST=true
     seed_dev_admin()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    shutdown_db_executor()
+    shutdown_fanout()
+    shutdown_audit_sink()
+    shutdown_rate_limiter()
+    shutdown_hash_pool()
+    close_pool()
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(members.router)
@@ -41,6 +68,7 @@ app.include_router(worship_files.router)
 app.include_router(worship_repertoire.router)
 app.include_router(worship_schedule.router)
 app.include_router(rsvp.router)  # <--- NOVO ROUTER DE RSVP
+app.include_router(debug.router)
 
 @app.get("/")
 async def root():
@@ -50,4 +78,29 @@ async def root():
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    return {"ok": True, "data": {"status": "healthy"}, "error_key": None}
\ No newline at end of file
+    return {"ok": True, "data": {"status": "healthy"}, "error_key": None}
+
+@app.get("/health/db")
+async def health_db():
+    """Database connection pool and DB thread pool stats."""
+    return {"ok": True, "data": {"pool": pool_stats(), "executor": db_executor_stats()}, "error_key": None}
+
+@app.get("/health/audit")
+async def health_audit():
+    """Background audit sink queue depth and flush latency."""
+    return {"ok": True, "data": {"audit_sink": audit_sink_stats()}, "error_key": None}
+
+@app.get("/health/rate-limit")
+async def health_rate_limit():
+    """Allowed/blocked counters of the in-memory rate limiters."""
+    return {"ok": True, "data": rate_limiter_stats(), "error_key": None}
+
+@app.get("/health/auth")
+async def health_auth():
+    """Verified-token cache hit rate and password-hashing pool latency histograms."""
+    return {"ok": True, "data": {"token_cache": token_cache_stats(), "hash_pool": hash_pool_stats()}, "error_key": None}
+
+@app.get("/health/cache")
+async def health_cache():
+    """Announcement feed cache hit rate/invalidation counters and fan-out worker queue."""
+    return {"ok": True, "data": {"feed_cache": feed_cache_stats(), "feed_fanout": fanout_stats()}, "error_key": None}
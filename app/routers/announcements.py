@@ -2,6 +2,7 @@
 Announcements router - handles announcement endpoints.
 All endpoints return HTTP 200 with response envelope.
 """
+from typing import Optional
 from fastapi import APIRouter, Depends, Query, Response
 from app.schemas.announcements import PostAnnouncementRequest
 from app.services import announcements_service
@@ -22,22 +23,38 @@ async def post_announcement(req: PostAnnouncementRequest, current_user: dict = D
     actor_role = current_user['role']
     org_id = current_user.get('org')
     
-    result = announcements_service.post_announcement(
+    result = await announcements_service.post_announcement(
         actor_id, actor_role, req.title, req.body,
         req.target_type, req.target_id, req.expires_at, req.is_pinned, org_id
     )
     response.status_code = 200
     return result
 
+@router.delete("/{announcement_id}")
+async def delete_announcement(announcement_id: int, current_user: dict = Depends(get_current_active_user), org_id: int | None = Depends(get_org_context), response: Response = None):
+    """Delete announcement (Admin/Staff or its author)."""
+    # Check for auth error
+    if current_user.get("_error"):
+        response.status_code = 200
+        return current_user
+    
+    result = await announcements_service.delete_announcement(
+        current_user['sub'], current_user['role'], announcement_id, current_user.get('org')
+    )
+    response.status_code = 200
+    return result
+
 @router.get("/feed")
 async def get_feed(
     limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    since: Optional[str] = Query(None, description="since_cursor from an earlier response: only newer announcements"),
+    offset: Optional[int] = Query(None, ge=0, deprecated=True, description="Deprecated: pass next_cursor as `cursor`"),
     org_id: int | None = Depends(get_org_context),
     current_user: dict = Depends(get_current_active_user),
     response: Response = None
 ):
-    """Get announcement feed (Active users only) with pagination."""
+    """Get announcement feed (Active users only): pinned first, newest first, keyset-paginated."""
     # Check for auth error
     if current_user.get("_error"):
         response.status_code = 200
@@ -46,6 +63,6 @@ async def get_feed(
     user_id = current_user['sub']
     user_role = current_user['role']
 
-    result = announcements_service.get_feed(user_id, user_role, limit, offset, org_id)
+    result = await announcements_service.get_feed(user_id, user_role, limit, cursor, org_id, since, offset)
     response.status_code = 200
     return result
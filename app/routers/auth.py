@@ -2,10 +2,12 @@
 Auth router - handles authentication endpoints.
 All endpoints return HTTP 200 with response envelope.
 """
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, Depends, Request, Response
 from app.schemas.auth import RegisterRequest, LoginRequest, ApproveRequest
 from app.services import auth_service
 from app.core.dependencies import get_current_admin_user
+from app.core.async_db import run_db
+from app.core.rate_limit import client_ip
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -13,14 +15,16 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 async def register(req: RegisterRequest, response: Response):
     """Register a new user."""
     print(f"📢 Router: register chamado para {req.email}")  # <-- PRINT AQUI DENTRO
-    result = auth_service.register_user(req.email, req.password, req.full_name, getattr(req, 'organization_slug', None))
+    result = await run_db(auth_service.register_user, req.email, req.password, req.full_name, getattr(req, 'organization_slug', None))
     response.status_code = 200
     return result
 
 @router.post("/login")
-async def login(req: LoginRequest, response: Response):
+async def login(req: LoginRequest, request: Request, response: Response):
     """Login and get JWT token."""
-    result = auth_service.login_user(req.email, req.password, getattr(req, 'organization_slug', None))
+    # Failures count against both the client IP and the account
+    result = await run_db(auth_service.login_user, req.email, req.password, getattr(req, 'organization_slug', None),
+                          client_ip(request.scope))
     response.status_code = 200
     return result
 
@@ -33,6 +37,6 @@ async def approve(req: ApproveRequest, current_user: dict = Depends(get_current_
         return current_user
     
     admin_id = current_user['sub']
-    result = auth_service.approve_user(admin_id, req.email)
+    result = await run_db(auth_service.approve_user, admin_id, req.email)
     response.status_code = 200
     return result
\ No newline at end of file
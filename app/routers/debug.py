@@ -0,0 +1,38 @@
+"""
+Debug router - runtime diagnostics for developers.
+Only enabled when DEV_MODE=true.
+All endpoints return HTTP 200 with response envelope.
+"""
+import os
+from fastapi import APIRouter, Response
+from app.core.async_db import run_db
+from db import get_db_connection
+from infra.query_registry import query_report
+from index_advisor import advise
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+def _dev_mode() -> bool:
+    return os.getenv("DEV_MODE", "false").lower() == "true"
+
+def _query_report_with_plans() -> list:
+    with get_db_connection() as conn:
+        return query_report(conn)
+
+@router.get("/queries")
+async def canonical_queries(response: Response):
+    """Hit rate and EXPLAIN QUERY PLAN for every canonical read statement."""
+    response.status_code = 200
+    if not _dev_mode():
+        return {"ok": False, "data": None, "error_key": "debug.disabled"}
+    results = await run_db(_query_report_with_plans)
+    return {"ok": True, "data": {"results": results}, "error_key": None}
+
+@router.get("/index-advisor")
+async def index_advisor(response: Response):
+    """EXPLAIN QUERY PLAN of every core query, flagging full table scans and temp sorts."""
+    response.status_code = 200
+    if not _dev_mode():
+        return {"ok": False, "data": None, "error_key": "debug.disabled"}
+    results = await run_db(advise)
+    return {"ok": True, "data": {"results": results}, "error_key": None}
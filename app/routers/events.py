@@ -5,15 +5,15 @@ Timestamps are interpreted as UTC (ISO-8601 with Z suffix preferred).
 """
 from fastapi import APIRouter, Depends, Path, Query, Response
 from app.schemas.events import EventCreate, EventUpdate, EventInDB
-from app.schemas.rsvp import RSVPCreate, RSVPInDB
-from app.services import events_service
+from app.schemas.rsvp import RSVPCreate, RSVPInDB, BulkRSVPRequest
+from app.services import events_service, rsvp_service
 from app.core.dependencies import get_current_admin_user, get_current_active_user, get_optional_user, get_org_context
 from fastapi import Query
 from typing import Optional, List
 
 router = APIRouter(prefix="/events", tags=["events"])
 
-@router.post("/", response_model=EventInDB)
+@router.post("/")
 async def create_event(
     req: EventCreate,
     current_user: dict = Depends(get_current_admin_user),
@@ -27,7 +27,7 @@ async def create_event(
         return current_user
     
     admin_id = current_user['sub']
-    result = events_service.create_event(
+    result = await events_service.create_event(
         admin_id, 
         req.title, 
         req.start_time,  # Mudado de start_at para start_time
@@ -41,22 +41,46 @@ async def create_event(
     response.status_code = 200
     return result
 
-@router.get("/", response_model=List[EventInDB])
+@router.get("/")
 async def list_events(
     from_date: str = Query(None, alias="from", description="UTC ISO-8601 timestamp"),
     to_date: str = Query(None, alias="to", description="UTC ISO-8601 timestamp"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated result fields, e.g. id,title,start"),
+    view: str = Query("list", pattern="^(list|summary)$", description="summary: per-day counts instead of events"),
+    window: Optional[str] = Query(None, pattern="^(week|month)$", description="summary: week/month containing `from`"),
     org_id: Optional[int] = Depends(get_org_context),
     current_user: dict = Depends(get_optional_user),
     response: Response = None
 ):
-    """List events (token optional, filters by status and date range). Timestamps are UTC."""
+    """List events (token optional, filters by status and date range, keyset-paginated). Timestamps are UTC."""
     viewer_id = current_user['sub'] if current_user else None
     
-    result = events_service.list_events(viewer_id, from_date, to_date, org_id)
+    if view == "summary":
+        result = await events_service.summarize_events(viewer_id, from_date, to_date, org_id, window)
+    else:
+        result = await events_service.list_events(viewer_id, from_date, to_date, org_id, limit, cursor, fields)
+    response.status_code = 200
+    return result
+
+@router.post("/rsvp/bulk")
+async def bulk_rsvp(
+    req: BulkRSVPRequest,
+    current_user: dict = Depends(get_current_active_user),
+    response: Response = None
+):
+    """RSVP many (user, event) pairs at once - family and group check-ins. Per-item results."""
+    if current_user.get("_error"):
+        response.status_code = 200
+        return current_user
+    
+    actor_id = current_user['sub']
+    result = await events_service.bulk_rsvp(actor_id, [item.dict() for item in req.items])
     response.status_code = 200
     return result
 
-@router.post("/{event_id}/rsvp", response_model=RSVPInDB)
+@router.post("/{event_id}/rsvp")
 async def rsvp_event(
     event_id: int = Path(...),
     req: RSVPCreate = None,
@@ -77,11 +101,11 @@ async def rsvp_event(
     else:
         req.event_id = event_id
     
-    result = events_service.rsvp_event(user_id, event_id, req.status)
+    result = await rsvp_service.save_rsvp(user_id, event_id, req.status, req.guests_count, req.notes)
     response.status_code = 200
     return result
 
-@router.get("/{event_id}", response_model=EventInDB)
+@router.get("/{event_id}")
 async def get_event(
     event_id: int = Path(...),
     current_user: dict = Depends(get_optional_user),
@@ -89,11 +113,11 @@ async def get_event(
 ):
     """Get event details by ID."""
     viewer_id = current_user['sub'] if current_user else None
-    result = events_service.get_event_by_id(event_id, viewer_id)
+    result = await events_service.get_event_by_id(event_id, viewer_id)
     response.status_code = 200
     return result
 
-@router.put("/{event_id}", response_model=EventInDB)
+@router.put("/{event_id}")
 async def update_event(
     event_id: int = Path(...),
     req: EventUpdate = None,
@@ -106,7 +130,7 @@ async def update_event(
         return current_user
     
     admin_id = current_user['sub']
-    result = events_service.update_event(event_id, admin_id, req.dict(exclude_unset=True))
+    result = await events_service.update_event(event_id, admin_id, req.dict(exclude_unset=True))
     response.status_code = 200
     return result
 
@@ -122,6 +146,6 @@ async def delete_event(
         return current_user
     
     admin_id = current_user['sub']
-    result = events_service.delete_event(event_id, admin_id)
+    result = await events_service.delete_event(event_id, admin_id)
     response.status_code = 200
     return result
\ No newline at end of file
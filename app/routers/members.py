@@ -2,8 +2,9 @@
 Members router - handles member management endpoints.
 All endpoints return HTTP 200 with response envelope.
 """
+from typing import Optional
 from fastapi import APIRouter, Depends, Query, Response
-from app.schemas.members import UpdateProfileRequest, AssignMinistryRequest
+from app.schemas.members import UpdateProfileRequest, AssignMinistryRequest, UnassignMinistryRequest
 from app.services import members_service
 from app.core.dependencies import get_current_active_user, get_current_admin_user
 
@@ -14,6 +15,7 @@ async def get_directory(
     search: str = Query(None),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     current_user: dict = Depends(get_current_active_user),
     response: Response = None
 ):
@@ -24,7 +26,7 @@ async def get_directory(
         return current_user
     
     viewer_id = current_user['sub']
-    result = members_service.get_directory(viewer_id, page=1, limit=limit, search=search, offset=offset)
+    result = await members_service.get_directory(viewer_id, page=1, limit=limit, search=search, offset=offset, cursor=cursor)
     response.status_code = 200
     return result
 
@@ -38,7 +40,7 @@ async def update_me(req: UpdateProfileRequest, current_user: dict = Depends(get_
     
     user_id = current_user['sub']
     updates = req.model_dump(exclude_unset=True)
-    result = members_service.update_profile(user_id, updates)
+    result = await members_service.update_profile(user_id, updates)
     response.status_code = 200
     return result
 
@@ -51,6 +53,19 @@ async def assign_ministry(req: AssignMinistryRequest, current_user: dict = Depen
         return current_user
     
     admin_id = current_user['sub']
-    result = members_service.assign_ministry(admin_id, req.user_id, req.ministry_id, req.role, req.is_lead)
+    result = await members_service.assign_ministry(admin_id, req.user_id, req.ministry_id, req.role, req.is_lead)
+    response.status_code = 200
+    return result
+
+@router.post("/unassign-ministry")
+async def unassign_ministry(req: UnassignMinistryRequest, current_user: dict = Depends(get_current_admin_user), response: Response = None):
+    """Remove user from ministry (Admin only)."""
+    # Check for auth error
+    if current_user.get("_error"):
+        response.status_code = 200
+        return current_user
+    
+    admin_id = current_user['sub']
+    result = await members_service.unassign_ministry(admin_id, req.user_id, req.ministry_id)
     response.status_code = 200
     return result
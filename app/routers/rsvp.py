@@ -1,70 +1,83 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.services.rsvp_service import RSVPService
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
+from app.services import rsvp_service
 from app.schemas.rsvp import RSVPCreate, RSVPInDB
 from app.core.auth import get_current_user
-from typing import List
 
+# Same RSVP engine (event_rsvps) as POST /events/{event_id}/rsvp; list endpoints return plain dicts.
 router = APIRouter(prefix="/rsvp", tags=["rsvp"])
 
+def _user_id(current_user: dict):
+    if current_user.get("_error"):
+        raise HTTPException(status_code=401, detail=current_user["_error"])
+    return current_user["sub"]
+
 @router.post("/events/{event_id}/rsvp", response_model=RSVPInDB)
-def create_rsvp(
+async def create_rsvp(
     event_id: int,
     rsvp_data: RSVPCreate,
-    db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Confirmar ou recusar presença em evento"""
-    service = RSVPService(db)
+    user_id = _user_id(current_user)
     # Garantir que o event_id na URL seja usado
-    rsvp_data.event_id = event_id
-    result = service.create_rsvp(current_user.id, rsvp_data)
-    if not result:
-        raise HTTPException(status_code=404, detail="Evento não encontrado")
-    return result
+    result = await rsvp_service.save_rsvp(user_id, event_id, rsvp_data.status, rsvp_data.guests_count, rsvp_data.notes)
+    if not result["ok"]:
+        if result["error_key"] == "event.not_found":
+            raise HTTPException(status_code=404, detail="Evento não encontrado")
+        raise HTTPException(status_code=400, detail=result["error_key"])
+    return result["data"]
 
-@router.get("/events/{event_id}/rsvps", response_model=List[RSVPInDB])
-def get_event_rsvps(
+@router.get("/events/{event_id}/rsvps")
+async def get_event_rsvps(
     event_id: int,
-    db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """Ver quem confirmou presença (apenas admin/organizador)"""
-    service = RSVPService(db)
-    return service.get_event_rsvps(event_id)
+    """Ver quem confirmou presença (apenas admin/organizador) - streamed as a JSON array"""
+    _user_id(current_user)
+    return StreamingResponse(
+        iterate_in_threadpool(rsvp_service.iter_event_rsvps_json(event_id)),
+        media_type="application/json",
+    )
 
-@router.get("/user/rsvps", response_model=List[RSVPInDB])
-def get_user_rsvps(
-    db: Session = Depends(get_db),
+@router.get("/user/rsvps")
+async def get_user_rsvps(
     current_user = Depends(get_current_user)
 ):
     """Meus eventos confirmados"""
-    service = RSVPService(db)
-    return service.get_user_rsvps(current_user.id)
+    result = await rsvp_service.list_user_rsvps(_user_id(current_user))
+    return result["data"]
 
 @router.get("/events/{event_id}/my-rsvp")
-def get_my_rsvp(
+async def get_my_rsvp(
     event_id: int,
-    db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Ver minha confirmação para um evento específico"""
-    service = RSVPService(db)
-    rsvp = service.get_rsvp_by_user_and_event(current_user.id, event_id)
-    if not rsvp:
+    result = await rsvp_service.get_user_event_rsvp(_user_id(current_user), event_id)
+    if not result["ok"]:
         return {"status": "not_responded"}
-    return rsvp
+    return result["data"]
+
+@router.delete("/events/{event_id}/rsvp")
+async def cancel_rsvp(
+    event_id: int,
+    current_user = Depends(get_current_user)
+):
+    """Cancelar minha confirmação para um evento"""
+    result = await rsvp_service.delete_rsvp(_user_id(current_user), event_id)
+    if not result["ok"]:
+        raise HTTPException(status_code=404, detail="Confirmação não encontrada")
+    return {"message": "Confirmação cancelada com sucesso"}
 
-@router.delete("/{rsvp_id}")
-def delete_rsvp(
+@router.delete("/{rsvp_id}", deprecated=True)
+async def delete_rsvp(
     rsvp_id: int,
-    db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """Cancelar minha confirmação"""
-    service = RSVPService(db)
-    success = service.delete_rsvp(rsvp_id, current_user.id)
-    if not success:
+    """Cancelar minha confirmação pelo id de uma confirmação antiga (tabela rsvps); use DELETE /rsvp/events/{event_id}/rsvp"""
+    result = await rsvp_service.delete_rsvp_by_id(_user_id(current_user), rsvp_id)
+    if not result["ok"]:
         raise HTTPException(status_code=404, detail="Confirmação não encontrada")
-    return {"message": "Confirmação cancelada com sucesso"}
\ No newline at end of file
+    return {"message": "Confirmação cancelada com sucesso"}
@@ -1,15 +1,26 @@
 """Worship files/assets router."""
-from fastapi import APIRouter, Depends, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, UploadFile, File, Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
 from app.schemas.common import ResponseEnvelope
 from app.schemas.worship import AssetUploadResponse, AssetLinkResponse
 from app.core.dependencies import require_active_user
+from app.core.async_db import run_db
 import sys
 import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from execution.files.core import upload_asset_core, delete_asset_core, get_asset_path_core, STORAGE_DIR
+from execution.files.core import (
+    stage_asset_upload, register_asset_upload_core, delete_asset_core, get_asset_path_core, sign_asset_url_core,
+    log_asset_download, STORAGE_DIR
+)
+from execution.files.signed_urls import verify_asset_token
+from execution.files.delivery import (
+    asset_headers, accel_headers, is_not_modified, parse_range, iter_file_range, UNSATISFIABLE, ASSET_SERVE_MODE,
+    ASSET_SERVE_MODES
+)
+from app.core.file_response import FileRangeResponse
 
 router = APIRouter(prefix="/worship/files", tags=["worship-files"])
 
@@ -19,16 +30,16 @@ async def upload_file(
     current_user: dict = Depends(require_active_user)
 ):
     """Upload MP3 or PDF file."""
-    # Read file content
-    content = await file.read()
-    
-    # Upload
-    result = upload_asset_core(
-        uploader_id=current_user['id'],
-        filename=file.filename,
-        file_content=content,
-        mime_type=file.content_type
-    )
+    # Copy, hash and fsync the spooled upload on the threadpool, in chunks (never the whole
+    # file in memory); the DB pool and a connection are only taken for the short insert
+    result = await run_in_threadpool(stage_asset_upload, file.file, file.content_type)
+    if result['ok']:
+        result = await run_db(register_asset_upload_core,
+            uploader_id=current_user['id'],
+            filename=file.filename,
+            mime_type=file.content_type,
+            staged=result['data']
+        )
     
     return ResponseEnvelope(
         ok=result['ok'],
@@ -36,13 +47,51 @@ async def upload_file(
         error_key=result['error_key']
     )
 
+def serve_asset(request: Request, asset: dict, mode: str = ASSET_SERVE_MODE) -> Response:
+    """Send an asset (or the requested byte range), answering 304/416 where they apply."""
+    if mode not in ASSET_SERVE_MODES:
+        raise ValueError(f"Unknown asset serve mode: {mode}")
+    headers = asset_headers(asset)
+    if is_not_modified(request.headers, headers.get("ETag"), headers.get("Last-Modified")):
+        return Response(status_code=304, headers=headers)
+    
+    if mode == "accel":
+        # The proxy serves the body and answers Range itself
+        return Response(status_code=200, media_type=asset['mime_type'], headers={**headers, **accel_headers(asset)})
+    
+    file_path = os.path.join(STORAGE_DIR, asset['storage_path'])
+    size = asset['size_bytes']
+    byte_range = parse_range(request.headers.get("range"), size, request.headers.get("if-range"),
+                             headers.get("ETag"), headers.get("Last-Modified"))
+    if byte_range == UNSATISFIABLE:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+    
+    status_code = 200
+    start, end = 0, size - 1
+    if byte_range is not None:
+        status_code = 206
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    if mode == "mmap":
+        return FileRangeResponse(file_path, start, end, status_code=status_code, headers=headers,
+                                 media_type=asset['mime_type'])
+    # Chunked read() calls on the threadpool
+    return StreamingResponse(
+        iterate_in_threadpool(iter_file_range(file_path, start, end)),
+        status_code=status_code,
+        media_type=asset['mime_type'],
+        headers=headers
+    )
+
 @router.get("/{asset_id}/download")
 async def download_file(
     asset_id: int,
+    request: Request,
     current_user: dict = Depends(require_active_user)
 ):
-    """Download file asset."""
-    result = get_asset_path_core(current_user['id'], asset_id)
+    """Download file asset (supports Range requests and ETag/Last-Modified revalidation)."""
+    result = await run_db(get_asset_path_core, current_user['id'], asset_id)
     
     if not result['ok']:
         return ResponseEnvelope(
@@ -51,21 +100,63 @@ async def download_file(
             error_key=result['error_key']
         )
     
-    # Return file
-    file_path = os.path.join(STORAGE_DIR, result['data']['storage_path'])
-    return FileResponse(
-        path=file_path,
-        filename=result['data']['filename'],
-        media_type=result['data']['mime_type']
+    return serve_asset(request, result['data'])
+
+@router.get("/{asset_id}/link", response_model=ResponseEnvelope[AssetLinkResponse])
+async def get_download_link(
+    asset_id: int,
+    request: Request,
+    current_user: dict = Depends(require_active_user)
+):
+    """Issue a time-limited signed download URL (e.g. for the web player)."""
+    result = await run_db(sign_asset_url_core, current_user['id'], asset_id)
+    
+    if not result['ok']:
+        return ResponseEnvelope(
+            ok=False,
+            data=None,
+            error_key=result['error_key']
+        )
+    
+    data = result['data']
+    return ResponseEnvelope(
+        ok=True,
+        data=AssetLinkResponse(
+            download_url=str(request.url_for("download_signed", token=data['token'])),
+            filename=data['filename'],
+            mime_type=data['mime_type'],
+            expires_at=data['expires_at']
+        ),
+        error_key=None
     )
 
+@router.get("/signed/{token}", name="download_signed")
+async def download_signed(token: str, request: Request):
+    """
+    Download through a signed URL: the signature is the authorization, so no DB lookup.
+    One batched audit event per playback (requests starting at byte 0), not per seek.
+    """
+    asset, error_key = verify_asset_token(token)
+    if asset is None:
+        return ResponseEnvelope(
+            ok=False,
+            data=None,
+            error_key=error_key
+        )
+    
+    response = serve_asset(request, asset)
+    if response.status_code == 200 or response.headers.get("content-range", "").startswith("bytes 0-"):
+        # Off the event loop: a full audit queue blocks ('block') or writes the spill file ('spill')
+        await run_in_threadpool(log_asset_download, asset['viewer_id'], asset['asset_id'], asset['filename'])
+    return response
+
 @router.delete("/{asset_id}", response_model=ResponseEnvelope)
 async def delete_file(
     asset_id: int,
     current_user: dict = Depends(require_active_user)
 ):
     """Delete file asset."""
-    result = delete_asset_core(current_user['id'], asset_id)
+    result = await run_db(delete_asset_core, current_user['id'], asset_id)
     
     return ResponseEnvelope(
         ok=result['ok'],
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends
 from app.schemas.common import ResponseEnvelope
 from app.schemas.worship import SongCreateRequest, SongUpdateRequest, SongAssetAddRequest
 from app.core.dependencies import require_active_user
+from app.core.async_db import run_db
 import sys
 import os
 
@@ -21,7 +22,7 @@ async def create_song(
     current_user: dict = Depends(require_active_user)
 ):
     """Create a new song in repertoire."""
-    result = create_song_core(
+    result = await run_db(create_song_core,
         creator_id=current_user['id'],
         title=request.title,
         artist=request.artist,
@@ -43,7 +44,7 @@ async def list_songs(
     current_user: dict = Depends(require_active_user)
 ):
     """List songs with optional search."""
-    result = list_songs_core(current_user['id'], search, limit, offset)
+    result = await run_db(list_songs_core, current_user['id'], search, limit, offset)
     
     return ResponseEnvelope(
         ok=result['ok'],
@@ -58,7 +59,7 @@ async def update_song(
     current_user: dict = Depends(require_active_user)
 ):
     """Update song details."""
-    result = update_song_core(
+    result = await run_db(update_song_core,
         updater_id=current_user['id'],
         song_id=song_id,
         updates=request.dict(exclude_unset=True)
@@ -77,7 +78,7 @@ async def add_song_asset(
     current_user: dict = Depends(require_active_user)
 ):
     """Add asset (link or file) to song."""
-    result = add_song_asset_core(
+    result = await run_db(add_song_asset_core,
         adder_id=current_user['id'],
         song_id=song_id,
         asset_type=request.type,
@@ -99,7 +100,7 @@ async def remove_song_asset(
     current_user: dict = Depends(require_active_user)
 ):
     """Remove song asset."""
-    result = remove_song_asset_core(current_user['id'], song_asset_id)
+    result = await run_db(remove_song_asset_core, current_user['id'], song_asset_id)
     
     return ResponseEnvelope(
         ok=result['ok'],
@@ -6,6 +6,7 @@ from app.schemas.worship import (
     RosterAssignRequest, RosterStatusUpdateRequest
 )
 from app.core.dependencies import require_active_user
+from app.core.async_db import run_db
 import sys
 import os
 
@@ -24,7 +25,7 @@ async def create_plan(
     current_user: dict = Depends(require_active_user)
 ):
     """Create a new service plan."""
-    result = create_service_plan_core(
+    result = await run_db(create_service_plan_core,
         creator_id=current_user['id'],
         date=request.date,
         event_id=request.event_id,
@@ -44,7 +45,7 @@ async def list_plans(
     current_user: dict = Depends(require_active_user)
 ):
     """List service plans with optional date range."""
-    result = list_plans_core(current_user['id'], from_date, to_date)
+    result = await run_db(list_plans_core, current_user['id'], from_date, to_date)
     
     return ResponseEnvelope(
         ok=result['ok'],
@@ -59,7 +60,7 @@ async def add_setlist_song(
     current_user: dict = Depends(require_active_user)
 ):
     """Add song to service setlist."""
-    result = add_setlist_song_core(
+    result = await run_db(add_setlist_song_core,
         adder_id=current_user['id'],
         plan_id=plan_id,
         song_id=request.song_id,
@@ -79,7 +80,7 @@ async def assign_roster(
     current_user: dict = Depends(require_active_user)
 ):
     """Assign musician to roster."""
-    result = assign_roster_entry_core(
+    result = await run_db(assign_roster_entry_core,
         assigner_id=current_user['id'],
         plan_id=plan_id,
         musician_id=request.musician_id,
@@ -102,7 +103,7 @@ async def update_roster_status(
     # Check if user is worship lead (simplified - would check ministry_assignments in production)
     is_lead = current_user.get('role') in ['Admin', 'Staff']
     
-    result = update_roster_status_core(
+    result = await run_db(update_roster_status_core,
         updater_id=current_user['id'],
         roster_id=roster_id,
         status=request.status,
@@ -17,3 +17,7 @@ class AssignMinistryRequest(BaseModel):
     ministry_id: int
     role: str
     is_lead: bool = False
+
+class UnassignMinistryRequest(BaseModel):
+    user_id: int
+    ministry_id: int
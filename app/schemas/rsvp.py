@@ -1,6 +1,6 @@
 from enum import Enum
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from pydantic import BaseModel
 
 class RSVPStatus(str, Enum):
@@ -15,8 +15,11 @@ class RSVPBase(BaseModel):
     guests_count: int = 1
     notes: Optional[str] = None
 
-class RSVPCreate(RSVPBase):
-    pass
+class RSVPCreate(BaseModel):
+    event_id: Optional[int] = None  # the event in the URL wins
+    status: str  # going | maybe | not_going (or confirmed | maybe | declined)
+    guests_count: int = 1  # the member plus guests
+    notes: Optional[str] = None
 
 class RSVPInDB(RSVPBase):
     id: int
@@ -25,4 +28,13 @@ class RSVPInDB(RSVPBase):
     updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class BulkRSVPItem(BaseModel):
+    user_id: int
+    event_id: int
+    status: str  # going | maybe | not_going
+    guests: int = 0
+
+class BulkRSVPRequest(BaseModel):
+    items: List[BulkRSVPItem]
@@ -14,6 +14,7 @@ class AssetLinkResponse(BaseModel):
     download_url: str
     filename: str
     mime_type: str
+    expires_at: Optional[str] = None
 
 # Music Repertoire schemas
 class SongCreateRequest(BaseModel):
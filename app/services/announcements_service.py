@@ -6,8 +6,10 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'execution'))
 
-from announcements.core import post_announcement_core, get_feed_core
+from app.core.async_db import awaitable
+from announcements.core import post_announcement_core, delete_announcement_core, get_feed_core
 
-# Re-export core functions
-post_announcement = post_announcement_core
-get_feed = get_feed_core
+# Re-export core functions as awaitables (run on the DB thread pool)
+post_announcement = awaitable(post_announcement_core)
+delete_announcement = awaitable(delete_announcement_core)
+get_feed = awaitable(get_feed_core)
@@ -3,15 +3,16 @@ from app.database import SessionLocal
 from app.models import User
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
-from jose import jwt
+from app.core.config import SECRET_KEY, ALGORITHM
+from auth.tokens import create_token
+from auth.hashing import get_hash_pool
+from auth.core import login_user_core
 import os
 import traceback
 
 print("🔧 Carregando auth_service.py...")
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key")
-ALGORITHM = "HS256"
 
 print(f"✅ auth_service.py carregado. SECRET_KEY: {SECRET_KEY[:5]}...")
 
@@ -22,18 +23,15 @@ def get_db():
     finally:
         db.close()
 
+# bcrypt also goes through the bounded hashing pool (concurrency cap + latency histograms)
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_hash_pool().run("verify", pwd_context.verify, plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return get_hash_pool().run("hash", pwd_context.hash, password)
 
 def create_access_token(data: dict):
-    to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=30)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    return create_token(data, timedelta(minutes=30))
 
     
     try:
@@ -101,30 +99,13 @@ def create_access_token(data: dict):
             db.close()
             print("✅ Sessão fechada")
 
-def login_user(email: str, password: str, organization_slug: str = None):
-    print(f"\n🔑 Login attempt: {email}")
-    db = SessionLocal()
-    try:
-        user = db.query(User).filter(User.email == email).first()
-        if not user or not verify_password(password, user.hashed_password):
-            return {"ok": False, "data": None, "error_key": "auth.invalid_credentials"}
-        
-        access_token = create_access_token({"sub": str(user.id), "email": user.email})
-        
-        return {
-            "ok": True,
-            "data": {
-                "access_token": access_token,
-                "token_type": "bearer"
-            },
-            "error_key": None
-        }
-    except Exception as e:
-        print(f"Erro no login: {e}")
-        traceback.print_exc()
-        return {"ok": False, "data": None, "error_key": "internal_error"}
-    finally:
-        db.close()
+def login_user(email: str, password: str, organization_slug: str = None, ip_address: str = None):
+    # Same path as the CLI: per-IP and per-account failure limits, Argon2 rehash and audit rows
+    result = login_user_core(email, password, organization_slug, ip_address)
+    if result["ok"]:
+        # Existing clients read access_token/token_type; keep them next to token/user_id/role
+        result["data"] = {"access_token": result["data"]["token"], "token_type": "bearer", **result["data"]}
+    return result
 
 def approve_user(admin_id: int, email: str):
     return {"ok": True, "data": {"approved": True}, "error_key": None}
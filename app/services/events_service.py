@@ -6,9 +6,15 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'execution'))
 
-from events.core import create_event_core, list_events_core, rsvp_event_core
+from app.core.async_db import awaitable
+from events.core import create_event_core, list_events_core, rsvp_event_core, get_event_by_id_core, update_event_core, delete_event_core, summarize_events_core, bulk_rsvp_core
 
-# Re-export core functions
-create_event = create_event_core
-list_events = list_events_core
-rsvp_event = rsvp_event_core
+# Re-export core functions as awaitables (run on the DB thread pool)
+create_event = awaitable(create_event_core)
+list_events = awaitable(list_events_core)
+summarize_events = awaitable(summarize_events_core)
+rsvp_event = awaitable(rsvp_event_core)
+bulk_rsvp = awaitable(bulk_rsvp_core)
+get_event_by_id = awaitable(get_event_by_id_core)
+update_event = awaitable(update_event_core)
+delete_event = awaitable(delete_event_core)
@@ -6,9 +6,11 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'execution'))
 
-from members.core import get_directory_core, update_profile_core, assign_ministry_core
+from app.core.async_db import awaitable
+from members.core import get_directory_core, update_profile_core, assign_ministry_core, unassign_ministry_core
 
-# Re-export core functions
-get_directory = get_directory_core
-update_profile = update_profile_core
-assign_ministry = assign_ministry_core
+# Re-export core functions as awaitables (run on the DB thread pool)
+get_directory = awaitable(get_directory_core)
+update_profile = awaitable(update_profile_core)
+assign_ministry = awaitable(assign_ministry_core)
+unassign_ministry = awaitable(unassign_ministry_core)
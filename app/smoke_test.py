@@ -0,0 +1,590 @@
+"""
+Smoke test for the FastAPI app: imports app.main, runs the startup hooks against a
+throwaway database and calls the API through TestClient.
+Usage: python app/smoke_test.py
+"""
+import sys
+import os
+import time
+import tempfile
+import hmac
+import base64
+import hashlib
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.join(BASE_DIR, 'execution'))
+
+import db
+
+def use_temp_database() -> str:
+    """Point execution/db.py at a fresh database file (created and migrated on app startup)."""
+    path = os.path.join(tempfile.mkdtemp(prefix='church_smoke_'), 'church_app.db')
+    db.close_pool()
+    db.DB_PATH = path
+    os.environ['ASSET_STORAGE_DIR'] = os.path.join(os.path.dirname(path), 'assets')  # read when files.core is imported
+    return path
+
+def test_startup(client) -> bool:
+    print("Test: app startup and /health/db")
+    r = client.get("/health/db")
+    if r.status_code != 200 or not r.json().get("ok"):
+        print(f"[FAIL] /health/db answered {r.status_code}: {r.text}")
+        return False
+    print("[PASS] App imported, migrated and answered\n")
+    return True
+
+def make_member(email: str, password: str = "Smoke-test-pass1!", full_name: str = "Smoke Member") -> int:
+    """Register and approve a member through the core functions; returns the user id."""
+    from auth.core import register_user_core, approve_user_core
+    user_id = register_user_core(email, password, full_name)["data"]["user_id"]
+    approve_user_core(None, email)
+    return user_id
+
+def pool_in_use(settle: float = 1.0) -> int:
+    """Connections checked out once background holders (audit flush, GC sweep) let go; waits up to `settle`s."""
+    deadline = time.monotonic() + settle
+    while db.pool_stats()["in_use"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return db.pool_stats()["in_use"]
+
+def auth_headers(user_id: int, role: str = "Member") -> dict:
+    import datetime
+    from auth.tokens import create_token
+    # "id" as well as "sub": the worship routers read current_user['id']
+    token = create_token({"sub": str(user_id), "id": user_id, "role": role}, datetime.timedelta(minutes=5))
+    return {"Authorization": f"Bearer {token}"}
+
+def test_login_lockout(client) -> bool:
+    from auth.utils import LOGIN_MAX_FAILURES
+    print(f"Test: /auth/login locks the account after {LOGIN_MAX_FAILURES} failures")
+    make_member("lockout@example.com")
+    ok = client.post("/auth/login", json={"email": "lockout@example.com", "password": "Smoke-test-pass1!"}).json()
+    if not ok["ok"] or not ok["data"].get("token"):
+        print(f"[FAIL] Valid login answered {ok}")
+        return False
+    if ok["data"].get("access_token") != ok["data"]["token"] or ok["data"].get("token_type") != "bearer":
+        print(f"[FAIL] Valid login dropped access_token/token_type: {ok['data']}")
+        return False
+    for _ in range(LOGIN_MAX_FAILURES):
+        r = client.post("/auth/login", json={"email": "lockout@example.com", "password": "wrong-password"}).json()
+        if r["error_key"] != "auth.invalid_credentials":
+            print(f"[FAIL] Failed login answered {r}")
+            return False
+    r = client.post("/auth/login", json={"email": "lockout@example.com", "password": "Smoke-test-pass1!"}).json()
+    if r["ok"] or r["error_key"] != "auth.too_many_attempts":
+        print(f"[FAIL] Login #{LOGIN_MAX_FAILURES + 1} answered {r}")
+        return False
+    print("[PASS] Account locked out, even with the right password\n")
+    return True
+
+def test_login_ip_lockout(client) -> bool:
+    import app.core.rate_limit as rate_limit
+    from auth.utils import LOGIN_MAX_FAILURES
+    print("Test: /auth/login locks the client IP after failures spread over several accounts")
+    make_member("ip-lockout@example.com")
+    rate_limit.TRUST_PROXY_HEADERS = True  # lets the test pick its client IP
+    try:
+        for n in range(LOGIN_MAX_FAILURES):
+            client.post("/auth/login", json={"email": f"nobody{n}@example.com", "password": "wrong-password"},
+                        headers={"X-Forwarded-For": "203.0.113.7"})
+        login = {"email": "ip-lockout@example.com", "password": "Smoke-test-pass1!"}
+        blocked = client.post("/auth/login", json=login, headers={"X-Forwarded-For": "203.0.113.7"}).json()
+        other = client.post("/auth/login", json=login, headers={"X-Forwarded-For": "203.0.113.8"}).json()
+    finally:
+        rate_limit.TRUST_PROXY_HEADERS = False
+    if blocked["error_key"] != "auth.too_many_attempts":
+        print(f"[FAIL] Login from the failing IP answered {blocked}")
+        return False
+    if not other["ok"]:
+        print(f"[FAIL] Login from another IP answered {other}")
+        return False
+    print("[PASS] Failing IP locked out, other IPs unaffected\n")
+    return True
+
+def test_summary_utc_days(client) -> bool:
+    from events.core import create_event_core
+    print("Test: calendar summary counts events per UTC day")
+    admin_id = make_member("summary@example.com")
+    for start, end in (("2030-03-31T10:00:00Z", "2030-03-31T11:00:00Z"),
+                       ("2030-03-31T23:30:00-03:00", "2030-04-01T01:00:00-03:00")):
+        create_event_core(admin_id, "Summary event", start, end, is_public=True)
+    r = client.get("/events/", params={"view": "summary", "from": "2030-03-31", "to": "2030-04-02"}).json()
+    days = {day["date"]: day["count"] for day in (r.get("data") or {}).get("days", [])}
+    if days != {"2030-03-31": 1, "2030-04-01": 1}:
+        print(f"[FAIL] Summary answered {r}")
+        return False
+    print("[PASS] 23:30-03:00 counted on the next UTC day\n")
+    return True
+
+def test_rsvp_stream_releases_connection(client) -> bool:
+    from events.core import create_event_core
+    print("Test: streamed RSVP lists hand their connection back to the pool")
+    user_id = make_member("rsvp-stream@example.com")
+    event_id = create_event_core(user_id, "Stream event", "2030-05-01T10:00:00Z", "2030-05-01T11:00:00Z",
+                                 is_public=True)["data"]["event_id"]
+    with db.get_db_connection() as conn:
+        conn.executemany("INSERT INTO event_rsvps (event_id, user_id, status) VALUES (?, ?, 'going')",
+                         [(event_id, 100000 + n) for n in range(1200)])  # several stream batches
+        conn.commit()
+    # Concurrent streams make iterate_in_threadpool resume each body on different threads
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(8) as pool:
+        responses = list(pool.map(lambda _: client.get(f"/rsvp/events/{event_id}/rsvps", headers=auth_headers(user_id)),
+                                  range(16)))
+    for r in responses:
+        if r.status_code != 200 or len(r.json()) != 1200:
+            print(f"[FAIL] Stream answered {r.status_code}: {r.text[:200]}")
+            return False
+    in_use = pool_in_use()
+    if in_use:
+        print(f"[FAIL] {in_use} connection(s) still checked out after the streams")
+        return False
+    print("[PASS] 16 concurrent streams of 1200 RSVPs, no connection left checked out\n")
+    return True
+
+def test_rsvp_delete_routes(client) -> bool:
+    from events.core import create_event_core
+    from events.rsvps import save_rsvp_core, get_user_event_rsvp_core
+    print("Test: DELETE /rsvp/events/{event_id}/rsvp and the legacy DELETE /rsvp/{rsvp_id}")
+    user_id = make_member("rsvp-delete@example.com")
+    headers = auth_headers(user_id)
+    first, second = (create_event_core(user_id, "Delete event", "2030-06-01T10:00:00Z", "2030-06-01T11:00:00Z",
+                                       is_public=True)["data"]["event_id"] for _ in range(2))
+    r = client.delete(f"/rsvp/events/{first}/rsvp", headers=headers)
+    if r.status_code != 404:
+        print(f"[FAIL] Cancelling a missing RSVP answered {r.status_code}: {r.text}")
+        return False
+    save_rsvp_core(user_id, first, "going")
+    r = client.delete(f"/rsvp/events/{first}/rsvp", headers=headers)
+    if r.status_code != 200 or get_user_event_rsvp_core(user_id, first)["ok"]:
+        print(f"[FAIL] Event-scoped cancel answered {r.status_code}: {r.text}")
+        return False
+    # An ORM-era RSVP (to `second`) whose legacy id happens to equal the event id `first`
+    save_rsvp_core(user_id, first, "going")
+    save_rsvp_core(user_id, second, "going")
+    with db.get_db_connection() as conn:
+        conn.execute("UPDATE event_rsvps SET legacy_rsvp_id = ? WHERE event_id = ? AND user_id = ?",
+                     (first, second, user_id))
+        conn.commit()
+    r = client.delete(f"/rsvp/{first}", headers=headers)
+    if (r.status_code != 200 or get_user_event_rsvp_core(user_id, second)["ok"]
+            or not get_user_event_rsvp_core(user_id, first)["ok"]):
+        print(f"[FAIL] Legacy id {first} answered {r.status_code} or cancelled the wrong RSVP")
+        return False
+    r = client.delete(f"/rsvp/{first}", headers=headers)  # no legacy id left: never read as an event id
+    if r.status_code != 404 or not get_user_event_rsvp_core(user_id, first)["ok"]:
+        print(f"[FAIL] Unknown legacy id answered {r.status_code}")
+        return False
+    print("[PASS] Event-scoped cancel by event, legacy cancel by legacy id only\n")
+    return True
+
+def test_feed_paging(client) -> bool:
+    from announcements.core import post_announcement_core
+    print("Test: feed keyset cursor pages and the deprecated offset fallback")
+    user_id = make_member("feed@example.com")
+    for n in range(5):
+        post_announcement_core(user_id, "Admin", f"Feed post {n}", is_pinned=(n == 1))
+    headers = auth_headers(user_id)
+
+    def walk(param):
+        ids, params = [], {"limit": 2}
+        while True:
+            data = client.get("/announcements/feed", params=params, headers=headers).json()["data"]
+            ids += [item["id"] for item in data["results"]]
+            if not data["next_cursor"]:
+                return ids
+            params = {"limit": 2, **param(data, len(ids))}
+
+    by_cursor = walk(lambda data, seen: {"cursor": data["next_cursor"]})
+    by_offset = walk(lambda data, seen: {"offset": seen})
+    if len(by_cursor) != 5 or len(set(by_cursor)) != 5 or by_offset != by_cursor:
+        print(f"[FAIL] cursor pages {by_cursor}, offset pages {by_offset}")
+        return False
+    pinned = client.get("/announcements/feed", params={"limit": 1}, headers=headers).json()["data"]["results"][0]
+    if not pinned["is_pinned"]:
+        print(f"[FAIL] First item is not the pinned post: {pinned}")
+        return False
+    print("[PASS] Cursor and offset walks return the same 5 posts, pinned first\n")
+    return True
+
+def test_feed_cache_sees_other_writers(client) -> bool:
+    import subprocess
+    from announcements.feed_cache import FEED_CACHE_ENABLED
+    from auth.utils import create_access_token
+    print("Test: a cached feed picks up an announcement posted by the CLI (another process)")
+    user_id = make_member("feed-cache@example.com")
+    with db.get_db_connection() as conn:
+        conn.execute("UPDATE users SET role = 'Admin' WHERE id = ?", (user_id,))
+        conn.commit()
+    headers = auth_headers(user_id, "Admin")
+
+    def titles():
+        results = client.get("/announcements/feed", params={"limit": 50}, headers=headers).json()["data"]["results"]
+        return [item["title"] for item in results]
+
+    titles()
+    titles()  # served from the cache when it is enabled
+    token = create_access_token({"sub": str(user_id), "role": "Admin"})
+    script = ("import sys, db; db.DB_PATH = sys.argv[1]; sys.argv = sys.argv[1:];"
+              "from announcements.post_message import post_message; post_message(sys.argv[1], 'Posted by the CLI', 'x')")
+    done = subprocess.run([sys.executable, "-c", script, db.DB_PATH, token], capture_output=True, text=True,
+                          cwd=os.path.join(BASE_DIR, 'execution'))
+    seen = titles()
+    if '"success": true' not in done.stdout or "Posted by the CLI" not in seen:
+        print(f"[FAIL] CLI said {done.stdout.strip() or done.stderr.strip()[-300:]}; feed (cache {FEED_CACHE_ENABLED}) {seen}")
+        return False
+    print("[PASS] CLI post visible on the next read, no TTL wait\n")
+    return True
+
+def upload(client, user_id: int, content: bytes, name: str = "song.mp3", mime: str = "audio/mpeg"):
+    return client.post("/worship/files/upload", files={"file": (name, content, mime)},
+                       headers=auth_headers(user_id)).json()
+
+def test_upload(client) -> bool:
+    import hashlib
+    from files.core import STORAGE_DIR, blob_storage_path, MAX_SIZE_MP3
+    print("Test: /worship/files/upload stages, hashes and stores the file")
+    user_id = make_member("upload@example.com")
+    content = os.urandom(300 * 1024)
+    r = upload(client, user_id, content)
+    stored = os.path.join(STORAGE_DIR, blob_storage_path(hashlib.sha256(content).hexdigest()))
+    if not r["ok"] or not os.path.exists(stored) or open(stored, 'rb').read() != content:
+        print(f"[FAIL] Upload answered {r}")
+        return False
+    too_large = upload(client, user_id, b"\0" * (MAX_SIZE_MP3 + 1))
+    wrong_type = upload(client, user_id, b"text", "notes.txt", "text/plain")
+    if too_large["error_key"] != "files.too_large" or wrong_type["error_key"] != "files.invalid_type":
+        print(f"[FAIL] Rejections answered {too_large} / {wrong_type}")
+        return False
+    leftovers = [name for name in os.listdir(STORAGE_DIR) if name.endswith('.part')]
+    if leftovers or pool_in_use():
+        print(f"[FAIL] Left staged files {leftovers} or connections in use")
+        return False
+    print("[PASS] Stored under its SHA-256, oversize and wrong types rejected, nothing left behind\n")
+    return True
+
+def test_upload_rollback(client) -> bool:
+    import io
+    from files.core import STORAGE_DIR, blob_storage_path, stage_asset_upload, register_asset_upload_core
+    print("Test: a rolled-back upload leaves no blob file, staged file or row behind")
+    user_id = make_member("upload-rollback@example.com")
+    staged = stage_asset_upload(io.BytesIO(os.urandom(64 * 1024)), "audio/mpeg")["data"]
+    stored = os.path.join(STORAGE_DIR, blob_storage_path(staged["checksum"]))
+    try:
+        with db.UnitOfWork():
+            result = register_asset_upload_core(user_id, "rollback.mp3", "audio/mpeg", staged)
+            placed = os.path.exists(stored)
+            raise RuntimeError("request failed after the upload")
+    except RuntimeError:
+        pass
+    with db.get_db_connection() as conn:
+        rows = conn.execute("SELECT count(*) FROM asset_blobs WHERE checksum = ?", (staged["checksum"],)).fetchone()[0]
+    if not result["ok"] or not placed or os.path.exists(stored) or os.path.exists(staged["temp_path"]) or rows:
+        print(f"[FAIL] result={result} placed before commit={placed} file={os.path.exists(stored)} rows={rows}")
+        return False
+    print("[PASS] Blob placed before the commit, removed with its staged file on rollback\n")
+    return True
+
+def test_upload_placement_failure(client) -> bool:
+    import io
+    import files.core as files_core
+    print("Test: an upload whose blob cannot be placed leaves no row behind")
+    user_id = make_member("upload-place-fail@example.com")
+    staged = files_core.stage_asset_upload(io.BytesIO(os.urandom(16 * 1024)), "audio/mpeg")["data"]
+    original = files_core.place_staged_blob
+
+    def fail(temp_path, full_path):
+        raise OSError("disk full")
+
+    files_core.place_staged_blob = fail
+    try:
+        with db.UnitOfWork():
+            result = files_core.register_asset_upload_core(user_id, "full.mp3", "audio/mpeg", staged)
+    finally:
+        files_core.place_staged_blob = original
+    with db.get_db_connection() as conn:
+        rows = conn.execute("SELECT count(*) FROM asset_blobs WHERE checksum = ?", (staged["checksum"],)).fetchone()[0]
+        assets = conn.execute("SELECT count(*) FROM assets WHERE checksum = ?", (staged["checksum"],)).fetchone()[0]
+    if result["error_key"] != "files.upload_failed" or rows or assets or os.path.exists(staged["temp_path"]):
+        print(f"[FAIL] result={result} blob rows={rows} asset rows={assets}")
+        return False
+    print("[PASS] Upload failed cleanly: no blob row, no asset row, no staged file\n")
+    return True
+
+def test_signed_download_audit_off_loop(client) -> bool:
+    import threading
+    import app.routers.worship_files as worship_files
+    print("Test: signed downloads audit off the event loop")
+    user_id = make_member("signed-audit@example.com")
+    asset_id = upload(client, user_id, os.urandom(32 * 1024))["data"]["asset_id"]
+    link = client.get(f"/worship/files/{asset_id}/link", headers=auth_headers(user_id)).json()
+    threads = []
+    original = worship_files.log_asset_download
+    worship_files.log_asset_download = lambda *args: threads.append(threading.current_thread().name)
+    try:
+        r = client.get(link["data"]["download_url"])
+    finally:
+        worship_files.log_asset_download = original
+    if r.status_code != 200 or len(threads) != 1 or not threads[0].startswith("AnyIO worker"):
+        print(f"[FAIL] Download answered {r.status_code}, audit ran on {threads}")
+        return False
+    print("[PASS] Download audited once, on a worker thread\n")
+    return True
+
+def test_file_range_response_paths(client) -> bool:
+    import asyncio
+    from app.core.file_response import FileRangeResponse
+    print("Test: FileRangeResponse uses pathsend/zerocopy when offered, mmap slices otherwise")
+    content = os.urandom(600 * 1024)
+    path = os.path.join(tempfile.mkdtemp(prefix='church_smoke_file_'), 'song.mp3')
+    with open(path, 'wb') as f:
+        f.write(content)
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    def run(extensions, start=0, end=len(content) - 1, status=200):
+        messages = []
+
+        async def send(message):
+            if message["type"] == "http.response.zerocopy":
+                message = {**message, "closed_during_send": message["file"].closed}
+            messages.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/", "headers": [], "extensions": extensions}
+        asyncio.run(FileRangeResponse(path, start, end, status_code=status)(scope, receive, send))
+        return messages
+
+    pathsend = run({"http.response.pathsend": {}})
+    zerocopy = run({"http.response.zerocopy": {}}, 100, 4195, 206)
+    plain = run({}, 100, 300 * 1024, 206)
+    body = b"".join(m.get("body", b"") for m in plain if m["type"] == "http.response.body")
+    if pathsend[-1] != {"type": "http.response.pathsend", "path": os.path.abspath(path)}:
+        print(f"[FAIL] pathsend answered {pathsend[-1]}")
+        return False
+    sent = zerocopy[-1]
+    if (sent["type"] != "http.response.zerocopy" or sent["offset"] != 100 or sent["count"] != 4096
+            or sent["closed_during_send"] or not sent["file"].closed):
+        print(f"[FAIL] zerocopy answered {sent}")
+        return False
+    if body != content[100:300 * 1024 + 1] or plain[-1].get("more_body"):
+        print(f"[FAIL] Plain range body has {len(body)} bytes")
+        return False
+    print("[PASS] Whole file by path, range as an open file, plain servers get the exact slice\n")
+    return True
+
+def test_unit_of_work(client) -> bool:
+    print("Test: UnitOfWork commits once on success and rolls everything back on error")
+    user_id = make_member("uow@example.com")
+    events = []
+
+    def rename(name):
+        with db.get_db_connection() as conn:
+            conn.execute("UPDATE member_profiles SET full_name = ? WHERE user_id = ?", (name, user_id))
+            conn.commit()
+
+    with db.UnitOfWork():
+        rename("Committed Member")
+        db.after_commit(lambda: events.append("commit"))
+        db.after_rollback(lambda: events.append("rollback"))
+    try:
+        with db.UnitOfWork():
+            rename("Rolled Back Member")
+            db.after_commit(lambda: events.append("late commit"))
+            db.after_rollback(lambda: events.append("late rollback"))
+            raise RuntimeError("request failed after the write")
+    except RuntimeError:
+        pass
+    with db.get_db_connection() as conn:
+        name = conn.execute("SELECT full_name FROM member_profiles WHERE user_id = ?", (user_id,)).fetchone()[0]
+    if name != "Committed Member" or events != ["commit", "late rollback"] or pool_in_use():
+        print(f"[FAIL] name={name!r} callbacks={events} pool={db.pool_stats()}")
+        return False
+    print("[PASS] Committed write kept, failed request undone, callbacks matched the outcome\n")
+    return True
+
+def test_directory_search(client) -> bool:
+    print("Test: /members/directory finds accented names from unaccented prefixes")
+    viewer_id = make_member("jose@example.com", full_name="José Núñez")
+    make_member("joao@example.com", full_name="João Gonçalves")
+    headers = auth_headers(viewer_id)
+    for search, expected in (("jose", "José Núñez"), ("NUNEZ", "José Núñez"), ("goncal", "João Gonçalves")):
+        r = client.get("/members/directory", params={"search": search}, headers=headers)
+        results = r.json()["data"]["results"]
+        if [member["full_name"] for member in results] != [expected]:
+            print(f"[FAIL] Search {search!r} returned {results}")
+            return False
+    print("[PASS] Accent-insensitive prefix search over names\n")
+    return True
+
+def test_directory_paging(client) -> bool:
+    print("Test: /members/directory cursor pages match one full page")
+    viewer_id = make_member("directory-paging@example.com", full_name="Paging Viewer")
+    headers = auth_headers(viewer_id)
+    everyone = client.get("/members/directory", params={"limit": 100}, headers=headers).json()["data"]["results"]
+    walked, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/members/directory", params=params, headers=headers).json()["data"]
+        walked += page["results"]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    if [member["id"] for member in walked] != [member["id"] for member in everyone] or len(everyone) < 4:
+        print(f"[FAIL] Cursor walk returned {len(walked)} members, one page {len(everyone)}")
+        return False
+    print(f"[PASS] Cursor walk of 3-member pages matches one page of {len(everyone)}\n")
+    return True
+
+def test_blob_refcount_gc(client) -> bool:
+    import hashlib
+    from files.core import STORAGE_DIR, blob_storage_path, delete_asset_core, collect_garbage_core
+    print("Test: identical uploads share one blob, collected once the last asset is deleted")
+    user_id = make_member("blob-gc@example.com")
+    content = os.urandom(48 * 1024)
+    checksum = hashlib.sha256(content).hexdigest()
+    stored = os.path.join(STORAGE_DIR, blob_storage_path(checksum))
+    first, second = (upload(client, user_id, content, name)["data"]["asset_id"] for name in ("a.mp3", "b.mp3"))
+
+    def ref_count():
+        with db.get_db_connection() as conn:
+            row = conn.execute("SELECT ref_count FROM asset_blobs WHERE checksum = ?", (checksum,)).fetchone()
+        return row[0] if row else None
+
+    shared = ref_count()
+    delete_asset_core(user_id, first)
+    kept = collect_garbage_core(0)["data"]["blobs_removed"], ref_count(), os.path.exists(stored)
+    delete_asset_core(user_id, second)
+    removed = collect_garbage_core(0)["data"]["blobs_removed"], ref_count(), os.path.exists(stored)
+    if shared != 2 or kept != (0, 1, True) or removed != (1, None, False):
+        print(f"[FAIL] shared={shared} after first delete={kept} after second delete={removed}")
+        return False
+    print("[PASS] Blob shared by two assets, kept while referenced, removed with its file after\n")
+    return True
+
+def test_blob_gc_rollback(client) -> bool:
+    import hashlib
+    from files.core import STORAGE_DIR, blob_storage_path, delete_asset_core, collect_garbage_core
+    print("Test: a rolled-back GC pass keeps its blob rows and files")
+    user_id = make_member("blob-gc-rollback@example.com")
+    content = os.urandom(24 * 1024)
+    checksum = hashlib.sha256(content).hexdigest()
+    stored = os.path.join(STORAGE_DIR, blob_storage_path(checksum))
+    asset_id = upload(client, user_id, content)["data"]["asset_id"]
+    delete_asset_core(user_id, asset_id)
+    try:
+        with db.UnitOfWork():
+            removed = collect_garbage_core(0)["data"]["blobs_removed"]
+            set_aside = not os.path.exists(stored)
+            raise RuntimeError("request failed after the GC pass")
+    except RuntimeError:
+        pass
+    with db.get_db_connection() as conn:
+        rows = conn.execute("SELECT count(*) FROM asset_blobs WHERE checksum = ?", (checksum,)).fetchone()[0]
+    kept = rows == 1 and os.path.exists(stored) and open(stored, 'rb').read() == content
+    leftovers = [name for name in os.listdir(STORAGE_DIR) if name.startswith('.gc-')]
+    if removed != 1 or not set_aside or not kept or leftovers:
+        print(f"[FAIL] removed={removed} set aside={set_aside} kept={kept} leftovers={leftovers}")
+        return False
+    print("[PASS] File set aside during the pass, row and file back after the rollback\n")
+    return True
+
+def test_download_range_etag(client) -> bool:
+    print("Test: /worship/files/{id}/download answers Range (206/416) and If-None-Match (304)")
+    user_id = make_member("download@example.com")
+    content = os.urandom(100 * 1024)
+    asset_id = upload(client, user_id, content)["data"]["asset_id"]
+    url, headers = f"/worship/files/{asset_id}/download", auth_headers(user_id)
+    full = client.get(url, headers=headers)
+    etag = full.headers.get("etag")
+    if full.status_code != 200 or full.content != content or not etag:
+        print(f"[FAIL] Full download answered {full.status_code} with {len(full.content)} bytes, ETag {etag}")
+        return False
+    partial = client.get(url, headers={**headers, "Range": "bytes=1000-1999"})
+    suffix = client.get(url, headers={**headers, "Range": "bytes=-10"})
+    if (partial.status_code != 206 or partial.content != content[1000:2000]
+            or partial.headers.get("content-range") != f"bytes 1000-1999/{len(content)}"
+            or suffix.status_code != 206 or suffix.content != content[-10:]):
+        print(f"[FAIL] Ranges answered {partial.status_code} / {suffix.status_code}, "
+              f"Content-Range {partial.headers.get('content-range')}")
+        return False
+    cached = client.get(url, headers={**headers, "If-None-Match": etag})
+    beyond = client.get(url, headers={**headers, "Range": f"bytes={len(content)}-"})
+    if cached.status_code != 304 or cached.content or beyond.status_code != 416:
+        print(f"[FAIL] If-None-Match answered {cached.status_code}, out-of-range answered {beyond.status_code}")
+        return False
+    print("[PASS] 200 with ETag, 206 slices, 304 on a matching ETag, 416 past the end\n")
+    return True
+
+def test_signed_url_expiry(client) -> bool:
+    from files.core import get_asset_path_core
+    from files.signed_urls import sign_asset_token
+    from auth.tokens import SECRET_KEY
+    print("Test: signed download URLs are refused once expired, tampered with or signed with the JWT key")
+    user_id = make_member("signed-expiry@example.com")
+    content = os.urandom(16 * 1024)
+    asset_id = upload(client, user_id, content)["data"]["asset_id"]
+    asset = get_asset_path_core(user_id, asset_id, log_download=False)["data"]
+    valid, _ = sign_asset_token(asset, user_id)
+    expired, _ = sign_asset_token(asset, user_id, ttl=-1)
+    payload, _, signature = valid.partition('.')
+    tampered = f"{payload}.{'A' if signature[0] != 'A' else 'B'}{signature[1:]}"
+    jwt_key_digest = hmac.new(SECRET_KEY.encode('utf-8'), payload.encode('utf-8'), hashlib.sha256).digest()
+    jwt_keyed = f"{payload}.{base64.urlsafe_b64encode(jwt_key_digest).decode('ascii').rstrip('=')}"
+    ok = client.get(f"/worship/files/signed/{valid}")
+    if ok.status_code != 200 or ok.content != content:
+        print(f"[FAIL] Valid link answered {ok.status_code}")
+        return False
+    for token, expected in ((expired, "files.link_expired"), (tampered, "files.invalid_link"),
+                            (jwt_keyed, "files.invalid_link"), ("not-a-token", "files.invalid_link")):
+        r = client.get(f"/worship/files/signed/{token}")
+        if r.headers.get("content-type", "").startswith("audio/") or r.json().get("error_key") != expected:
+            print(f"[FAIL] Link expected {expected}, answered {r.status_code} ({r.headers.get('content-type')})")
+            return False
+    print("[PASS] Valid link served; expired, tampered, JWT-keyed and malformed links refused\n")
+    return True
+
+def test_rate_limiter_restore(client) -> bool:
+    from infra.rate_limiter import SlidingWindowLimiter
+    print("Test: restored limiter hits merge in time order and each key keeps at most `limit`")
+    limiter = SlidingWindowLimiter("smoke_restore", 3, 60, shards=1)
+    limiter.hit("ip:a", now=1000.0)
+    limiter.restore([("ip:a", 950.0), ("ip:a", 990.0), ("ip:a", 900.0)], now=1000.0)
+    merged = [hit_at for _, hit_at in limiter.snapshot(now=1000.0)]
+    # 950 leaves the window at 1010; appended behind the live 1000 it would never be pruned
+    still_blocked = limiter.count("ip:a", now=1005.0)
+    after = limiter.count("ip:a", now=1012.0)
+    for i in range(100):
+        limiter.hit("ip:b", now=2000.0 + i)
+    kept = [hit_at for key, hit_at in limiter.snapshot(now=2100.0) if key == "ip:b"]
+    if merged != [950.0, 990.0, 1000.0] or still_blocked != 3 or after != 2 or kept != [2097.0, 2098.0, 2099.0]:
+        print(f"[FAIL] merged={merged} count@1005={still_blocked} count@1012={after} kept={kept}")
+        return False
+    print("[PASS] Snapshot and live hits merged in order, per-key hits capped at the limit\n")
+    return True
+
+CHECKS = [test_startup, test_unit_of_work, test_login_lockout, test_login_ip_lockout, test_rate_limiter_restore,
+          test_summary_utc_days, test_directory_search, test_directory_paging, test_rsvp_stream_releases_connection,
+          test_rsvp_delete_routes, test_feed_paging, test_feed_cache_sees_other_writers, test_upload,
+          test_upload_rollback, test_upload_placement_failure, test_blob_refcount_gc, test_blob_gc_rollback,
+          test_download_range_etag, test_signed_url_expiry, test_signed_download_audit_off_loop,
+          test_file_range_response_paths]
+
+def run_checks() -> bool:
+    print("=== API Smoke Test ===\n")
+    use_temp_database()
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        for check in CHECKS:
+            if not check(client):
+                return False
+
+    print("=== All Tests PASSED ===")
+    return True
+
+if __name__ == "__main__":
+    success = run_checks()
+    sys.exit(0 if success else 1)
@@ -9,8 +9,82 @@ import sqlite3
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from db import get_db_connection
+from db import get_db_connection, after_commit
 from infra.audit_logger import log_audit_event
+from infra.query_registry import register_query
+from infra.cursors import encode_cursor, decode_cursor
+from announcements.feed_cache import FEED_CACHE_ENABLED, get_feed_cache, expiry_epoch
+from announcements.fanout import enqueue_fanout, feed_mode
+
+# Ministry ids are bound as one JSON array so the statement text never depends on how many there are
+FEED_FILTERS = [
+    ("organization_id", "organization_id = ?"),
+    ("audience", "( (target_type = 'Global') OR (target_type = 'Role' AND target_id = ?)"
+                 " OR (target_type = 'Ministry' AND target_id IN (SELECT value FROM json_each(?))) )"),
+]
+FEED_BASE = """
+    SELECT id, is_pinned, created_at, expires_at FROM announcements
+    WHERE deleted_at IS NULL
+    AND (expires_at IS NULL OR expires_at > ?)
+"""
+
+# Pinned first, newest first; covered by idx_announcements_feed (LIMIT -1 = whole feed, for the cache)
+FEED_QUERY = register_query(
+    "announcements.feed",
+    FEED_BASE,
+    FEED_FILTERS + [("after", "(is_pinned, created_at, id) < (?, ?, ?)")],
+    suffix=" ORDER BY is_pinned DESC, created_at DESC, id DESC LIMIT ? OFFSET ?",
+)
+
+# Incremental mode: announcements newer than the client's since cursor, oldest first
+FEED_SINCE_QUERY = register_query(
+    "announcements.feed_since",
+    FEED_BASE,
+    FEED_FILTERS + [("since", "id > ?")],
+    suffix=" ORDER BY id LIMIT ?",
+)
+
+# One page of a (possibly cached) feed, by primary key
+FEED_PAGE_QUERY = register_query(
+    "announcements.feed_page",
+    """
+    SELECT id, title, body, target_type, is_pinned, created_at FROM announcements
+    WHERE id IN (SELECT value FROM json_each(?))
+    AND deleted_at IS NULL
+    """,
+)
+
+INBOX_BASE = """
+    SELECT a.id, a.title, a.body, a.target_type, a.is_pinned, a.created_at
+    FROM announcement_inbox i JOIN announcements a ON a.id = i.announcement_id
+    WHERE i.user_id = ?
+    AND (i.expires_at IS NULL OR i.expires_at > ?)
+    AND a.deleted_at IS NULL
+"""
+
+# Fan-out-on-write organizations: the viewer's page straight off idx_inbox_feed
+INBOX_FEED_QUERY = register_query(
+    "announcements.inbox_feed",
+    INBOX_BASE,
+    [("after", "(i.is_pinned, i.created_at, i.announcement_id) < (?, ?, ?)")],
+    suffix=" ORDER BY i.is_pinned DESC, i.created_at DESC, i.announcement_id DESC LIMIT ? OFFSET ?",
+)
+
+INBOX_SINCE_QUERY = register_query(
+    "announcements.inbox_feed_since",
+    INBOX_BASE,
+    [("since", "i.announcement_id > ?")],
+    suffix=" ORDER BY i.announcement_id LIMIT ?",
+)
+
+def feed_version(conn) -> int:
+    """announcement_feed_version: bumped by trigger on every write to announcements, from any process."""
+    row = conn.execute("SELECT version FROM announcement_feed_version WHERE id = 1").fetchone()
+    return row[0] if row else 0
+
+def _invalidate_feeds(organization_id, target_type: str, target_id):
+    # After commit, so a feed rebuilt concurrently cannot re-cache the old list
+    after_commit(lambda: get_feed_cache().invalidate(organization_id, target_type, target_id))
 
 def post_announcement_core(actor_id: int, actor_role: str, title: str, body: str = None, 
                           target_type: str = 'Global', target_id: str = None, 
@@ -64,6 +138,8 @@ def post_announcement_core(actor_id: int, actor_role: str, title: str, body: str
             
             announcement_id = cursor.lastrowid
             conn.commit()
+            _invalidate_feeds(organization_id, target_type, target_id)
+            enqueue_fanout("announcement", announcement_id)
             
             log_audit_event(actor_id, 'ANNOUNCEMENT_CREATE', 'announcement', announcement_id, {'title': title})
             
@@ -72,60 +148,156 @@ def post_announcement_core(actor_id: int, actor_role: str, title: str, body: str
     except Exception as e:
         return {"ok": False, "data": None, "error_key": "internal_error"}
 
-def get_feed_core(user_id: int, user_role: str, limit: int = 50, offset: int = 0, organization_id: int = None) -> dict:
+def delete_announcement_core(actor_id: int, actor_role: str, announcement_id: int, organization_id: int = None) -> dict:
     """
-    Core announcement feed logic.
+    Soft-delete an announcement (Admin/Staff, or its author).
     Returns: {"ok": bool, "data": dict|None, "error_key": str|None}
     """
     with get_db_connection() as conn:
-        conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
+        cursor.execute("""
+            SELECT created_by, target_type, target_id, organization_id FROM announcements
+            WHERE id = ? AND deleted_at IS NULL
+        """, (announcement_id,))
+        row = cursor.fetchone()
+        if not row or (organization_id is not None and row[3] != organization_id):
+            return {"ok": False, "data": None, "error_key": "announcement.not_found"}
+        if actor_role not in ('Admin', 'Staff') and row[0] != actor_id:
+            return {"ok": False, "data": None, "error_key": "auth.forbidden"}
+
+        cursor.execute("UPDATE announcements SET deleted_at = CURRENT_TIMESTAMP WHERE id = ?", (announcement_id,))
+        cursor.execute("DELETE FROM announcement_inbox WHERE announcement_id = ?", (announcement_id,))
+        conn.commit()
+        _invalidate_feeds(row[3], row[1], row[2])
+
+    log_audit_event(actor_id, 'ANNOUNCEMENT_DELETE', 'announcement', announcement_id)
+    return {"ok": True, "data": {"message": "announcement.deleted_success"}, "error_key": None}
+
+def _feed_item(row) -> dict:
+    return {
+        "id": row['id'],
+        "title": row['title'],
+        "body": row['body'],
+        "target_type": row['target_type'],
+        "is_pinned": bool(row['is_pinned']),
+        "created_at": row['created_at']
+    }
+
+def _feed_key(row) -> tuple:
+    return (int(row['is_pinned']), row['created_at'], row['id'])
+
+def _page_after(keys: list, after, limit: int, offset: int = 0) -> list:
+    """The `limit` + 1 keys following the cursor key (or `offset` keys in) in a feed sorted by _feed_key, descending."""
+    lo, hi = 0, len(keys)
+    if after is not None:
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if tuple(keys[mid]) < after:
+                hi = mid
+            else:
+                lo = mid + 1
+    lo += offset
+    return keys[lo:lo + limit + 1]
+
+def _decode_after(cursor: str):
+    values = decode_cursor(cursor, 3)
+    if values is None or not isinstance(values[1], str):
+        return None
+    try:
+        return (int(values[0]), values[1], int(values[2]))
+    except (TypeError, ValueError):
+        return None
+
+def get_feed_core(user_id: int, user_role: str, limit: int = 50, cursor: str = None,
+                  organization_id: int = None, since: str = None, offset: int = None) -> dict:
+    """
+    Core announcement feed logic (pinned first, newest first, keyset-paginated).
+    Pass data.next_cursor back as `cursor` for the next page (None on the last page).
+    `offset` is the deprecated way to page (rows are skipped, not seeked); ignored with a cursor.
+    Every full-feed response carries a since_cursor; pass it as `since` later to get
+    only the announcements posted after it (oldest first, data.since_cursor advances).
+    Organizations in fan-out-on-write mode read the viewer's announcement_inbox rows.
+    Otherwise the ordered keys of the viewer's audience come from the feed cache
+    when possible, and only the requested page is read from announcements.
+    Returns: {"ok": bool, "data": dict|None, "error_key": str|None}
+    """
+    after = None
+    if cursor:
+        after = _decode_after(cursor)
+        if after is None:
+            return {"ok": False, "data": None, "error_key": "announcement.invalid_cursor"}
+    since_id = None
+    if since:
+        values = decode_cursor(since, 1)
+        if values is None or not isinstance(values[0], int):
+            return {"ok": False, "data": None, "error_key": "announcement.invalid_cursor"}
+        since_id = values[0]
+    if after is not None or offset is None:
+        offset = 0
+    
+    with get_db_connection() as conn:
+        conn.row_factory = sqlite3.Row
+        now_str = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        # High-water mark read before the feed: anything posted later has a larger id
+        high_water = conn.execute("SELECT max(id) FROM announcements").fetchone()[0] or 0
         
-        # Get user's ministries
-        cursor.execute("SELECT ministry_id FROM ministry_assignments WHERE user_id = ? AND deleted_at IS NULL", (user_id,))
-        ministry_ids = [str(r[0]) for r in cursor.fetchall()]
+        if feed_mode(conn, organization_id) == 'write':
+            if since_id is not None:
+                rows = INBOX_SINCE_QUERY.execute(conn, {"since": since_id}, head=[user_id, now_str], tail=[limit + 1]).fetchall()
+                return _since_page(rows, limit, since_id)
+            rows = INBOX_FEED_QUERY.execute(conn, {"after": after}, head=[user_id, now_str], tail=[limit + 1, offset]).fetchall()
+            return _feed_page(rows, limit, high_water)
         
-        now_str = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        # Get user's ministries
+        rows = conn.execute("SELECT ministry_id FROM ministry_assignments WHERE user_id = ? AND deleted_at IS NULL", (user_id,))
+        ministry_ids = [str(r[0]) for r in rows.fetchall()]
+        filters = {
+            "organization_id": organization_id,
+            "audience": (user_role, json.dumps(ministry_ids)),
+        }
         
-        # Build query
-        if ministry_ids:
-            min_placeholders = ",".join(["?"] * len(ministry_ids))
-            ministry_clause = f"(target_type = 'Ministry' AND target_id IN ({min_placeholders}))"
-            params = ministry_ids
+        if since_id is not None:
+            rows = FEED_SINCE_QUERY.execute(conn, {**filters, "since": since_id}, head=[now_str], tail=[limit + 1]).fetchall()
+            page_ids = [row['id'] for row in rows]
+        elif not FEED_CACHE_ENABLED:
+            rows = FEED_QUERY.execute(conn, {**filters, "after": after}, head=[now_str], tail=[limit + 1, offset]).fetchall()
+            page_ids = [row['id'] for row in rows]
         else:
-            ministry_clause = "0"
-            params = []
+            cache = get_feed_cache()
+            key = cache.key(organization_id, user_role, ministry_ids)
+            # Read before the feed: a post committed in between leaves the stored entry one version behind
+            version = feed_version(conn)
+            keys, generation = cache.get(key, version)
+            if keys is None:
+                rows = FEED_QUERY.execute(conn, filters, head=[now_str], tail=[-1, 0]).fetchall()
+                keys = [_feed_key(row) for row in rows]
+                cache.put(key, ministry_ids, keys, [expiry_epoch(row['expires_at']) for row in rows], generation,
+                          version)
+            page_ids = [key[2] for key in _page_after(keys, after, limit, offset)]
         
-        query = f"""
-            SELECT * FROM announcements
-            WHERE deleted_at IS NULL
-            AND (expires_at IS NULL OR expires_at > ?)
-        """
-        params = [now_str]
-
-        if organization_id is not None:
-            query += " AND organization_id = ?"
-            params.append(organization_id)
-
-        query += f" AND ( (target_type = 'Global') OR (target_type = 'Role' AND target_id = ?) OR {ministry_clause} )"
+        rows = FEED_PAGE_QUERY.execute(conn, head=[json.dumps(page_ids)]).fetchall() if page_ids else []
+        by_id = {row['id']: row for row in rows}
+        rows = [by_id[announcement_id] for announcement_id in page_ids if announcement_id in by_id]
         
-        final_params = params + [user_role] + params[1:] if params and len(params) > 1 else [now_str, user_role]
-        # The above manipulation keeps compatibility when ministry params exist
-        final_params = [now_str, user_role] + ( [p for p in params[1:]] if len(params) > 1 else [] )
-        final_params += [limit, offset]
+        if since_id is not None:
+            return _since_page(rows, limit, since_id)
+        return _feed_page(rows, limit, high_water)
 
-        cursor.execute(query, final_params)
-        rows = cursor.fetchall()
-        
-        results = []
-        for row in rows:
-            results.append({
-                "id": row['id'],
-                "title": row['title'],
-                "body": row['body'],
-                "target_type": row['target_type'],
-                "is_pinned": bool(row['is_pinned']),
-                "created_at": row['created_at']
-            })
-        
-        return {"ok": True, "data": {"results": results, "limit": limit, "offset": offset}, "error_key": None}
+def _feed_page(rows: list, limit: int, high_water: int) -> dict:
+    next_cursor = encode_cursor(_feed_key(rows[limit - 1])) if len(rows) > limit else None
+    return {"ok": True, "data": {
+        "results": [_feed_item(row) for row in rows[:limit]],
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "since_cursor": encode_cursor([high_water]),
+    }, "error_key": None}
+
+def _since_page(rows: list, limit: int, since_id: int) -> dict:
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {"ok": True, "data": {
+        "results": [_feed_item(row) for row in rows],
+        "limit": limit,
+        "has_more": has_more,
+        "since_cursor": encode_cursor([rows[-1]['id'] if rows else since_id]),
+    }, "error_key": None}
@@ -0,0 +1,267 @@
+"""
+Fan-out-on-write announcement inbox.
+Organizations with feed_fanout = 'write' get one announcement_inbox row per
+recipient, so their feed is a single range scan of idx_inbox_feed instead of the
+read-time Global/Role/Ministry OR. Rows are materialized by a background worker:
+core functions enqueue jobs once their transaction has committed, and the worker
+runs each job as set-based INSERT ... SELECT statements (one per target type).
+Organizations in 'read' mode (the default) get no inbox rows.
+"""
+import os
+import json
+import time
+import atexit
+import logging
+import datetime
+import threading
+from collections import deque
+
+from db import get_db_connection, after_commit
+
+logger = logging.getLogger(__name__)
+
+FEED_FANOUT_MODES = ('read', 'write')
+FEED_FANOUT_BATCH = int(os.environ.get('FEED_FANOUT_BATCH', '200'))  # members per transaction in org rebuilds
+FEED_FANOUT_PRUNE_INTERVAL = int(os.environ.get('FEED_FANOUT_PRUNE_INTERVAL', '3600'))  # seconds
+
+# One recipient join per target type (`u` is the recipient, `a` the announcement)
+AUDIENCES = {
+    "Global": "FROM announcements a JOIN users u ON u.organization_id = a.organization_id"
+              " WHERE a.target_type = 'Global'",
+    "Role": "FROM announcements a JOIN users u ON u.organization_id = a.organization_id AND u.role = a.target_id"
+            " WHERE a.target_type = 'Role'",
+    "Ministry": "FROM announcements a"
+                " JOIN ministry_assignments m ON m.ministry_id = a.target_id AND m.deleted_at IS NULL"
+                " JOIN users u ON u.id = m.user_id AND u.organization_id = a.organization_id"
+                " WHERE a.target_type = 'Ministry'",
+}
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+def _deliver(conn, where: str, params, audiences=tuple(AUDIENCES)):
+    """Insert the inbox rows of live announcements matching `where`, for fan-out-on-write organizations."""
+    for audience in audiences:
+        conn.execute(f"""
+            INSERT OR IGNORE INTO announcement_inbox (user_id, announcement_id, is_pinned, created_at, expires_at)
+            SELECT u.id, a.id, a.is_pinned, a.created_at, a.expires_at
+            {AUDIENCES[audience]}
+            AND a.deleted_at IS NULL AND (a.expires_at IS NULL OR a.expires_at > ?) AND u.deleted_at IS NULL
+            AND a.organization_id IN (SELECT id FROM organizations WHERE feed_fanout IN ('write', 'building'))
+            AND {where}
+        """, [_now(), *params])
+
+def fanout_announcement(conn, announcement_id: int):
+    """Deliver one announcement to every current recipient."""
+    _deliver(conn, "a.id = ?", (announcement_id,))
+
+def backfill_ministry(conn, user_id: int, ministry_id: int):
+    """Deliver a ministry's live announcements to a member who just joined it."""
+    _deliver(conn, "u.id = ? AND a.target_id = ?", (user_id, str(ministry_id)), ("Ministry",))
+
+def remove_ministry(conn, user_id: int, ministry_id: int):
+    """Take back a ministry's announcements from a member who left it (unless still assigned)."""
+    conn.execute("""
+        DELETE FROM announcement_inbox
+        WHERE user_id = ? AND announcement_id IN (
+            SELECT id FROM announcements WHERE target_type = 'Ministry' AND target_id = ?)
+        AND NOT EXISTS (
+            SELECT 1 FROM ministry_assignments
+            WHERE user_id = ? AND ministry_id = ? AND deleted_at IS NULL)
+    """, (user_id, str(ministry_id), user_id, ministry_id))
+
+def rebuild_user(conn, user_id: int):
+    """Recompute one member's inbox (e.g. after a role change)."""
+    conn.execute("DELETE FROM announcement_inbox WHERE user_id = ?", (user_id,))
+    _deliver(conn, "u.id = ?", (user_id,))
+
+def rebuild_organization(conn, organization_id: int):
+    """
+    Recompute the inbox of every member of an organization (only deletes in 'read' mode),
+    FEED_FANOUT_BATCH members per transaction so other writers are not locked out, then
+    start serving it.
+    """
+    user_ids = [row[0] for row in conn.execute(
+        "SELECT id FROM users WHERE organization_id = ? ORDER BY id", (organization_id,))]
+    for i in range(0, len(user_ids), FEED_FANOUT_BATCH):
+        batch = json.dumps(user_ids[i:i + FEED_FANOUT_BATCH])
+        conn.execute("DELETE FROM announcement_inbox WHERE user_id IN (SELECT value FROM json_each(?))", (batch,))
+        _deliver(conn, "u.id IN (SELECT value FROM json_each(?))", (batch,))
+        conn.commit()
+    conn.execute("UPDATE organizations SET feed_fanout = 'write' WHERE id = ? AND feed_fanout = 'building'",
+                 (organization_id,))
+
+def prune_expired(conn):
+    conn.execute("""
+        DELETE FROM announcement_inbox
+        WHERE announcement_id IN (SELECT id FROM announcements WHERE expires_at <= ?)
+    """, (_now(),))
+
+JOBS = {
+    "announcement": fanout_announcement,
+    "ministry_backfill": backfill_ministry,
+    "ministry_remove": remove_ministry,
+    "user": rebuild_user,
+    "organization": rebuild_organization,
+}
+
+class FanoutWorker:
+    """Single background thread draining fan-out jobs; identical pending jobs are coalesced."""
+
+    def __init__(self, prune_interval: int = FEED_FANOUT_PRUNE_INTERVAL):
+        self.prune_interval = prune_interval
+        self._queue = deque()
+        self._pending = set()
+        self._cond = threading.Condition()
+        self._active = 0
+        self._thread = None
+        self._stopping = False
+        self._atexit_registered = False
+        self._last_prune = time.monotonic()
+        self._metrics = {"enqueued": 0, "coalesced": 0, "done": 0, "errors": 0, "last_job_ms": 0.0, "max_job_ms": 0.0}
+
+    def start(self):
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="feed-fanout", daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+
+    def submit(self, job: tuple):
+        if job[0] not in JOBS:
+            raise ValueError(f"Unknown fan-out job: {job[0]}")
+        if self._thread is None:
+            self.start()
+        with self._cond:
+            if job in self._pending:
+                self._metrics["coalesced"] += 1
+                return
+            self._pending.add(job)
+            self._queue.append(job)
+            self._metrics["enqueued"] += 1
+            self._cond.notify()
+
+    def run_job(self, job: tuple):
+        started = time.monotonic()
+        with get_db_connection() as conn:
+            JOBS[job[0]](conn, *job[1:])
+            conn.commit()
+        elapsed_ms = (time.monotonic() - started) * 1000
+        with self._cond:
+            self._metrics["done"] += 1
+            self._metrics["last_job_ms"] = elapsed_ms
+            self._metrics["max_job_ms"] = max(self._metrics["max_job_ms"], elapsed_ms)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._queue and not self._stopping:
+                    self._cond.wait(self.prune_interval)
+                if self._stopping and not self._queue:
+                    return
+                job = self._queue.popleft() if self._queue else None
+                if job is not None:
+                    self._pending.discard(job)
+                    self._active += 1
+
+            try:
+                if job is not None:
+                    self.run_job(job)
+                if time.monotonic() - self._last_prune >= self.prune_interval:
+                    self._last_prune = time.monotonic()
+                    with get_db_connection() as conn:
+                        prune_expired(conn)
+                        conn.commit()
+            except Exception:
+                logger.exception("Feed fan-out error (%s)", job)
+                with self._cond:
+                    self._metrics["errors"] += 1
+            finally:
+                if job is not None:
+                    with self._cond:
+                        self._active -= 1
+                        self._cond.notify_all()
+
+    def drain(self, timeout: float = 10.0) -> bool:
+        """Wait until every queued job has run. Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._active:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self, timeout: float = 10.0):
+        """Run the jobs still queued and stop the worker thread."""
+        with self._cond:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stopping = True
+            self._cond.notify_all()
+        thread.join(timeout)
+        with self._cond:
+            self._thread = None
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"queue_depth": len(self._queue), "running": self._active, **self._metrics}
+
+_worker = None
+_worker_lock = threading.Lock()
+
+def get_fanout_worker() -> FanoutWorker:
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = FanoutWorker()
+    return _worker
+
+def enqueue_fanout(kind: str, *args):
+    """Queue a fan-out job once the current transaction (if any) has committed."""
+    job = (kind,) + args
+    after_commit(lambda: get_fanout_worker().submit(job))
+
+def feed_mode(conn, organization_id) -> str:
+    """'write' when the organization's feed is served from announcement_inbox, else 'read'."""
+    if organization_id is None:
+        return 'read'
+    row = conn.execute("SELECT feed_fanout FROM organizations WHERE id = ?", (organization_id,)).fetchone()
+    return 'write' if row and row[0] == 'write' else 'read'
+
+def set_feed_mode_core(organization_id: int, mode: str) -> dict:
+    """
+    Switch an organization between read-time and write-time fan-out.
+    Switching to 'write' rebuilds its inboxes in the background; until that job has
+    run the feed keeps being served read-time. Switching to 'read' takes effect at
+    once and the same job drops the inbox rows.
+    Returns: {"ok": bool, "data": dict|None, "error_key": str|None}
+    """
+    if mode not in FEED_FANOUT_MODES:
+        return {"ok": False, "data": None, "error_key": "announcement.invalid_feed_mode"}
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        # 'building' keeps reads on the read-time path until the rebuild job flips it to 'write'
+        cursor.execute("UPDATE organizations SET feed_fanout = ? WHERE id = ?",
+                       ('building' if mode == 'write' else 'read', organization_id))
+        if cursor.rowcount == 0:
+            return {"ok": False, "data": None, "error_key": "organization.not_found"}
+        conn.commit()
+    enqueue_fanout("organization", organization_id)
+    return {"ok": True, "data": {"organization_id": organization_id, "feed_fanout": mode}, "error_key": None}
+
+def fanout_stats() -> dict:
+    """Queue depth and job latency of the fan-out worker."""
+    return get_fanout_worker().stats()
+
+def shutdown_fanout():
+    """Finish queued fan-out jobs (call on application shutdown)."""
+    if _worker is not None:
+        _worker.stop()
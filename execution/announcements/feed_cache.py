@@ -0,0 +1,138 @@
+"""
+In-process cache of announcement feeds.
+Members with the same organization, role and ministry set see the same feed, so its
+ordered sort keys (is_pinned, created_at, id) are cached per (organization, role,
+ministry-set hash) and pages are cut from them with the keyset cursor.
+An entry lives for FEED_CACHE_TTL seconds at most, and never past the earliest
+`expires_at` among its announcements. Posting or deleting an announcement drops
+only the entries whose audience it targets. Writes made elsewhere (CLI scripts,
+other workers) are caught by the announcement_feed_version counter (migration 21):
+an entry built at an older version is a miss.
+"""
+import os
+import time
+import hashlib
+import datetime
+import threading
+from collections import OrderedDict
+
+FEED_CACHE_ENABLED = os.environ.get('FEED_CACHE_ENABLED', 'true').lower() == 'true'
+FEED_CACHE_TTL = float(os.environ.get('FEED_CACHE_TTL', '300'))  # seconds
+FEED_CACHE_SIZE = int(os.environ.get('FEED_CACHE_SIZE', '1024'))  # audiences
+
+def ministry_set_hash(ministry_ids) -> str:
+    return hashlib.sha1(",".join(sorted(set(ministry_ids))).encode('utf-8')).hexdigest()[:16]
+
+def expiry_epoch(value):
+    """Epoch seconds of an `expires_at` value (naive timestamps are UTC), or None when unparseable."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.timestamp()
+
+class FeedCache:
+    """
+    LRU of audience -> (ordered feed keys, expiry).
+    An invalidation that races a miss wins: keys computed before it are not stored.
+    """
+
+    def __init__(self, size: int = FEED_CACHE_SIZE, ttl: float = FEED_CACHE_TTL):
+        self.size = size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "stale": 0, "stores": 0, "invalidations": 0,
+                       "invalidated": 0, "evicted": 0}
+
+    def key(self, organization_id, role: str, ministry_ids) -> tuple:
+        return (organization_id, role, ministry_set_hash(ministry_ids))
+
+    def get(self, key: tuple, version: int = None):
+        """
+        Return (keys or None, generation); pass the generation back to put().
+        `version` is the current announcement_feed_version: an entry built at another one is dropped.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry["version"] != version:
+                    del self._entries[key]
+                    self._stats["stale"] += 1
+                elif entry["expires"] > now:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return entry["keys"], self._generation
+                else:
+                    del self._entries[key]
+                    self._stats["expired"] += 1
+            self._stats["misses"] += 1
+            return None, self._generation
+
+    def put(self, key: tuple, ministry_ids, keys: list, expiries, generation: int, version: int = None):
+        """
+        Store the key list; `expiries` are the epoch expiry times of the listed announcements and
+        `version` the announcement_feed_version read before they were queried.
+        """
+        now = time.time()
+        expires = min([now + self.ttl] + [e for e in expiries if e is not None])
+        with self._lock:
+            if generation != self._generation or expires <= now:
+                return
+            self._entries[key] = {"keys": list(keys), "ministries": frozenset(ministry_ids), "expires": expires,
+                                  "version": version}
+            self._entries.move_to_end(key)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+                self._stats["evicted"] += 1
+
+    def invalidate(self, organization_id, target_type: str, target_id=None) -> int:
+        """Drop the entries of every audience an announcement with this targeting reaches."""
+        target = None if target_id is None else str(target_id)
+        with self._lock:
+            self._generation += 1
+            dropped = [
+                key for key, entry in self._entries.items()
+                if (key[0] is None or key[0] == organization_id)
+                and (target_type == 'Global'
+                     or (target_type == 'Role' and key[1] == target)
+                     or (target_type == 'Ministry' and target in entry["ministries"]))
+            ]
+            for key in dropped:
+                del self._entries[key]
+            self._stats["invalidations"] += 1
+            self._stats["invalidated"] += len(dropped)
+            return len(dropped)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "enabled": FEED_CACHE_ENABLED,
+                "size": len(self._entries),
+                "max_size": self.size,
+                "ttl_s": self.ttl,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                **self._stats,
+            }
+
+_cache = FeedCache()
+
+def get_feed_cache() -> FeedCache:
+    return _cache
+
+def feed_cache_stats() -> dict:
+    """Hit/miss counters and size of the announcement feed cache."""
+    return _cache.stats()
@@ -77,11 +77,15 @@ def post_message(token, title, body, target_type='Global', target_id=None, expir
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
+            # The author's organization (default org 1, as in post_announcement_core); feeds are scoped by it
+            cursor.execute("SELECT organization_id FROM users WHERE id = ?", (actor_id,))
+            res = cursor.fetchone()
+            organization_id = (res[0] if res else None) or 1
             cursor.execute("""
                 INSERT INTO announcements (
-                    title, body, target_type, target_id, is_pinned, expires_at, created_by
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (title, body, target_type, target_id, 1 if is_pinned else 0, expires_at, actor_id))
+                    title, body, target_type, target_id, is_pinned, expires_at, created_by, organization_id
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (title, body, target_type, target_id, 1 if is_pinned else 0, expires_at, actor_id, organization_id))
             
             announcement_id = cursor.lastrowid
             conn.commit()
@@ -0,0 +1,20 @@
+import sys
+import os
+import argparse
+import json
+
+# Add execution directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from announcements.fanout import set_feed_mode_core, get_fanout_worker
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve an organization's feed read-time or from the fan-out inbox")
+    parser.add_argument("--org", type=int, required=True)
+    parser.add_argument("--mode", choices=["read", "write"], required=True)
+
+    args = parser.parse_args()
+    result = set_feed_mode_core(args.org, args.mode)
+    if result["ok"] and args.mode == "write":
+        get_fanout_worker().drain(timeout=600)  # the inbox rebuild runs before this process exits
+    print(json.dumps(result))
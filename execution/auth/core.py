@@ -8,9 +8,10 @@ import datetime
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from db import get_db_connection
-from auth.utils import hash_password, verify_password, validate_password_strength, create_access_token
-from auth.utils import ERR_PASSWORD_WEAK, ERR_INVALID_CREDENTIALS, ERR_ACCOUNT_PENDING, ERR_ACCOUNT_BANNED
+from auth.utils import hash_password, verify_and_rehash, validate_password_strength, create_access_token, check_rate_limit, record_login_failure, HashingBusy
+from auth.utils import ERR_AUTH_BUSY, ERR_PASSWORD_WEAK, ERR_INVALID_CREDENTIALS, ERR_TOO_MANY_ATTEMPTS, ERR_ACCOUNT_PENDING, ERR_ACCOUNT_BANNED
 from infra.audit_logger import log_audit_event
+from announcements.fanout import enqueue_fanout
 
 def register_user_core(email: str, password: str, full_name: str, organization_slug: str = None) -> dict:
     """
@@ -20,7 +21,10 @@ def register_user_core(email: str, password: str, full_name: str, organization_s
     if not validate_password_strength(password):
         return {"ok": False, "data": None, "error_key": ERR_PASSWORD_WEAK}
     
-    pwd_hash = hash_password(password)
+    try:
+        pwd_hash = hash_password(password)
+    except HashingBusy:
+        return {"ok": False, "data": None, "error_key": ERR_AUTH_BUSY}
     
     try:
         with get_db_connection() as conn:
@@ -70,7 +74,12 @@ def login_user_core(email: str, password: str) -> dict:
     Core login logic.
     Returns: {"ok": bool, "data": dict|None, "error_key": str|None}
     """
-def login_user_core(email: str, password: str, organization_slug: str = None) -> dict:
+def login_user_core(email: str, password: str, organization_slug: str = None, ip_address: str = None) -> dict:
+    if not check_rate_limit(ip_address, email):
+        record_login_failure(ip_address, email)
+        log_audit_event(None, 'AUTH_LOGIN_FAIL', metadata={'email': email, 'reason': 'rate_limit'})
+        return {"ok": False, "data": None, "error_key": ERR_TOO_MANY_ATTEMPTS}
+
     with get_db_connection() as conn:
         cursor = conn.cursor()
         org_id = None
@@ -86,7 +95,13 @@ def login_user_core(email: str, password: str, organization_slug: str = None) ->
             cursor.execute("SELECT id, password_hash, role, status FROM users WHERE email = ?", (email,))
         user = cursor.fetchone()
         
-        if not user or not verify_password(user['password_hash'], password):
+        try:
+            ok, new_hash = verify_and_rehash(user['password_hash'], password) if user else (False, None)
+        except HashingBusy:
+            return {"ok": False, "data": None, "error_key": ERR_AUTH_BUSY}
+
+        if not ok:
+            record_login_failure(ip_address, email)
             log_audit_event(None, 'AUTH_LOGIN_FAIL', metadata={'email': email})
             return {"ok": False, "data": None, "error_key": ERR_INVALID_CREDENTIALS}
         
@@ -95,10 +110,15 @@ def login_user_core(email: str, password: str, organization_slug: str = None) ->
         
         if user['status'] == 'Banned':
             return {"ok": False, "data": None, "error_key": ERR_ACCOUNT_BANNED}
+
+        if new_hash:
+            # Stored hash used outdated Argon2 parameters
+            cursor.execute("UPDATE users SET password_hash = ? WHERE id = ?", (new_hash, user['id']))
+            conn.commit()
         
         # Create token (include organization id for tenant scoping)
         org_id = user.get('organization_id') if 'organization_id' in user else None
-        token_data = {"sub": user['id'], "role": user['role'], "org": org_id}
+        token_data = {"sub": str(user['id']), "role": user['role'], "org": org_id}
         token = create_access_token(token_data, datetime.timedelta(minutes=60*24))
         
         log_audit_event(user['id'], 'AUTH_LOGIN_SUCCESS', resource_type='user', resource_id=user['id'])
@@ -130,5 +150,6 @@ def approve_user_core(admin_id: int, email: str) -> dict:
         conn.commit()
         
         log_audit_event(admin_id, 'AUTH_APPROVE', resource_type='user', resource_id=user['id'])
+        enqueue_fanout("user", user['id'])  # now a Member: deliver what that role can see
         
         return {"ok": True, "data": {"message": "auth.user_approved"}, "error_key": None}
@@ -0,0 +1,156 @@
+"""
+Password hashing service.
+Argon2 runs on a dedicated thread pool (argon2-cffi releases the GIL while hashing)
+with at most PASSWORD_HASH_CONCURRENCY hashes in flight; callers wait up to
+PASSWORD_HASH_QUEUE_TIMEOUT seconds for a slot before HashingBusy is raised.
+Hash/verify/queue-wait latencies are recorded in fixed-bucket histograms.
+"""
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError, InvalidHashError
+
+PASSWORD_HASH_CONCURRENCY = int(os.environ.get('PASSWORD_HASH_CONCURRENCY', str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_QUEUE_TIMEOUT = float(os.environ.get('PASSWORD_HASH_QUEUE_TIMEOUT', '5'))
+
+# Argon2 parameters; changing them makes existing hashes get rehashed on the next login
+_ARGON2_PARAMS = {
+    name: int(os.environ[env])
+    for name, env in (("time_cost", "ARGON2_TIME_COST"), ("memory_cost", "ARGON2_MEMORY_COST"), ("parallelism", "ARGON2_PARALLELISM"))
+    if os.environ.get(env)
+}
+ph = PasswordHasher(**_ARGON2_PARAMS)
+
+HISTOGRAM_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+class HashingBusy(Exception):
+    """No hashing slot freed up within PASSWORD_HASH_QUEUE_TIMEOUT."""
+
+class LatencyHistogram:
+    """Cumulative-style latency histogram (counts per upper bound in ms, plus +Inf)."""
+
+    def __init__(self, buckets=HISTOGRAM_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.n = 0
+
+    def observe(self, ms: float):
+        for i, bound in enumerate(self.buckets):
+            if ms <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.n += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def snapshot(self) -> dict:
+        labels = [f"le_{bound}" for bound in self.buckets] + ["le_inf"]
+        return {
+            "count": self.n,
+            "avg_ms": round(self.total_ms / self.n, 2) if self.n else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+class PasswordHashPool:
+    def __init__(self, concurrency: int = PASSWORD_HASH_CONCURRENCY, queue_timeout: float = PASSWORD_HASH_QUEUE_TIMEOUT):
+        self.concurrency = max(1, concurrency)
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="argon2")
+        self._lock = threading.Lock()
+        self._histograms = {"hash": LatencyHistogram(), "verify": LatencyHistogram(), "queue_wait": LatencyHistogram()}
+        self._counters = {"busy_rejections": 0, "rehashed": 0, "in_flight": 0}
+
+    def _observe(self, name: str, ms: float):
+        with self._lock:
+            self._histograms[name].observe(ms)
+
+    def run(self, kind: str, fn, *args):
+        """Run fn(*args) on the hashing pool, timing it under the `kind` histogram."""
+        waited = time.perf_counter()
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self._counters["busy_rejections"] += 1
+            raise HashingBusy()
+        self._observe("queue_wait", (time.perf_counter() - waited) * 1000)
+        with self._lock:
+            self._counters["in_flight"] += 1
+        try:
+            started = time.perf_counter()
+            result = self._executor.submit(fn, *args).result()
+            self._observe(kind, (time.perf_counter() - started) * 1000)
+            return result
+        finally:
+            with self._lock:
+                self._counters["in_flight"] -= 1
+            self._slots.release()
+
+    def count_rehash(self):
+        with self._lock:
+            self._counters["rehashed"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "concurrency": self.concurrency,
+                "queue_timeout_s": self.queue_timeout,
+                **self._counters,
+                "histograms_ms": {name: h.snapshot() for name, h in self._histograms.items()},
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_hash_pool() -> PasswordHashPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PasswordHashPool()
+    return _pool
+
+def _verify(hash: str, password: str) -> bool:
+    try:
+        return ph.verify(hash, password)
+    except (VerifyMismatchError, InvalidHashError):
+        return False
+
+def hash_password(password: str) -> str:
+    return get_hash_pool().run("hash", ph.hash, password)
+
+def verify_password(hash: str, password: str) -> bool:
+    return get_hash_pool().run("verify", _verify, hash, password)
+
+def verify_and_rehash(hash: str, password: str):
+    """
+    Verify a password; when it matches but the stored hash uses outdated Argon2
+    parameters, also return a fresh hash to store. Returns (ok, new_hash or None).
+    """
+    if not verify_password(hash, password):
+        return False, None
+    if not ph.check_needs_rehash(hash):
+        return True, None
+    get_hash_pool().count_rehash()
+    return True, hash_password(password)
+
+def hash_pool_stats() -> dict:
+    """Concurrency, rejections and hash/verify/queue-wait latency histograms."""
+    return get_hash_pool().stats()
+
+def shutdown_hash_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
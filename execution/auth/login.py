@@ -7,12 +7,13 @@ import json
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from db import get_db_connection
-from auth.utils import ERR_INVALID_CREDENTIALS, ERR_ACCOUNT_PENDING, ERR_ACCOUNT_BANNED, ERR_TOO_MANY_ATTEMPTS, check_rate_limit, verify_password, create_access_token
+from auth.utils import ERR_INVALID_CREDENTIALS, ERR_ACCOUNT_PENDING, ERR_ACCOUNT_BANNED, ERR_TOO_MANY_ATTEMPTS, check_rate_limit, record_login_failure, verify_and_rehash, create_access_token
 from infra.audit_logger import log_audit_event
 
 def login_user(email, password, ip_address='127.0.0.1'):
     # 1. Rate Limiting
     if not check_rate_limit(ip_address, email):
+        record_login_failure(ip_address, email)
         log_audit_event(None, 'AUTH_LOGIN_FAIL', 'user', email, metadata={'reason': 'rate_limit'}, ip_address=ip_address)
         print(json.dumps({"error": ERR_TOO_MANY_ATTEMPTS}))
         return False
@@ -26,6 +27,7 @@ def login_user(email, password, ip_address='127.0.0.1'):
         
         if not user:
             # Generic error to avoid enumeration, but log the attempt
+            record_login_failure(ip_address, email)
             log_audit_event(None, 'AUTH_LOGIN_FAIL', 'user', email, metadata={'reason': 'user_not_found'}, ip_address=ip_address)
             print(json.dumps({"error": ERR_INVALID_CREDENTIALS}))
             return False
@@ -33,22 +35,31 @@ def login_user(email, password, ip_address='127.0.0.1'):
         user_id, password_hash, status, role = user
         
         # 3. Verify Password
-        if not verify_password(password_hash, password):
+        ok, new_hash = verify_and_rehash(password_hash, password)
+        if not ok:
+            record_login_failure(ip_address, email)
             log_audit_event(user_id, 'AUTH_LOGIN_FAIL', 'user', user_id, metadata={'reason': 'invalid_password'}, ip_address=ip_address)
             print(json.dumps({"error": ERR_INVALID_CREDENTIALS}))
             return False
             
         # 4. Status Check
         if status == 'Banned':
+            record_login_failure(ip_address, email)
             log_audit_event(user_id, 'AUTH_LOGIN_FAIL', 'user', user_id, metadata={'reason': 'banned'}, ip_address=ip_address)
             print(json.dumps({"error": ERR_ACCOUNT_BANNED}))
             return False
             
         if status == 'Pending':
+            record_login_failure(ip_address, email)
             log_audit_event(user_id, 'AUTH_LOGIN_FAIL', 'user', user_id, metadata={'reason': 'pending'}, ip_address=ip_address)
             print(json.dumps({"error": ERR_ACCOUNT_PENDING}))
             return False
             
+        if new_hash:
+            # Stored hash used outdated Argon2 parameters
+            cursor.execute("UPDATE users SET password_hash = ? WHERE id = ?", (new_hash, user_id))
+            conn.commit()
+
         # 5. Success - Generate Token
         access_token = create_access_token(data={"sub": str(user_id), "role": role})
         
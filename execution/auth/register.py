@@ -24,18 +24,21 @@ def register_user(email, password, full_name):
         with get_db_connection() as conn:
             cursor = conn.cursor()
             
+            # Default organization (org 1), as in register_user_core
+            org_id = 1
+
             # Insert User
             cursor.execute("""
-                INSERT INTO users (email, password_hash, role, status)
-                VALUES (?, ?, 'Pending', 'Pending')
-            """, (email, pwd_hash))
+                INSERT INTO users (email, password_hash, role, status, organization_id)
+                VALUES (?, ?, 'Pending', 'Pending', ?)
+            """, (email, pwd_hash, org_id))
             user_id = cursor.lastrowid
             
             # Create Profile (Basic)
             cursor.execute("""
-                INSERT INTO member_profiles (user_id, full_name)
-                VALUES (?, ?)
-            """, (user_id, full_name))
+                INSERT INTO member_profiles (user_id, full_name, organization_id)
+                VALUES (?, ?, ?)
+            """, (user_id, full_name, org_id))
             
             conn.commit()
             
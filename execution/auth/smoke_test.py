@@ -123,17 +123,29 @@ def test_auth_flow():
     # IP is always 127.0.0.1 in the script default.
     # There are already some failures above maybe? No, mostly successes.
     # Let's try 6 failures.
+    # Every login.py run is a new process, so the failures must add up in SQLite (login_attempts)
+    locked = False
     for i in range(1, 7):
         print(f"  Attempt {i}...", end=" ")
         res = run_script("login.py", ["--email", email, "--password", "badpass"])
         data = parse_output(res.stdout)
         if data and data.get("error") == "auth.too_many_attempts":
             print("PASS: Rate limit hit.")
+            locked = True
             break
         elif data and data.get("error") == "auth.invalid_credentials":
             print("Invalid Creds (OK)")
         else:
             print(f"Unexpected: {res.stdout}")
+    if not locked:
+        print("FAIL: 6 failed logins in separate processes never locked the account")
+    else:
+        res = run_script("login.py", ["--email", email, "--password", new_password])
+        data = parse_output(res.stdout)
+        if data and data.get("error") == "auth.too_many_attempts":
+            print("PASS: Locked out even with the right password")
+        else:
+            print(f"FAIL: Lockout did not hold. Output: {res.stdout}")
             
     print("\n=== SMOKE TEST COMPLETE ===")
 
@@ -0,0 +1,74 @@
+"""
+Single JWT signing/verification path for the CLI scripts and the API.
+Verified tokens are kept in a bounded LRU (keyed by SHA-256 of the token) until
+their `exp`, so repeat requests with the same bearer token skip the signature check.
+"""
+import os
+import time
+import hashlib
+import threading
+import datetime
+from collections import OrderedDict
+
+import jwt
+
+# Load Secret Key (In prod, use env var)
+SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-me')
+ALGORITHM = 'HS256'
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', '4096'))
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "rejected": 0, "expired": 0, "evicted": 0}
+
+def create_token(data: dict, expires_delta: datetime.timedelta) -> str:
+    to_encode = data.copy()
+    to_encode.update({"exp": datetime.datetime.now(datetime.timezone.utc) + expires_delta})
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+def verify_token(token: str):
+    """Return a copy of the token's claims, or None when it is invalid or expired."""
+    if not token:
+        return None
+    key = hashlib.sha256(token.encode('utf-8')).digest()
+    now = time.time()
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            claims, exp = entry
+            if exp is None or exp > now:
+                _cache.move_to_end(key)
+                _stats["hits"] += 1
+                return dict(claims)
+            del _cache[key]
+            _stats["expired"] += 1
+        _stats["misses"] += 1
+
+    try:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.InvalidTokenError:
+        with _cache_lock:
+            _stats["rejected"] += 1
+        return None
+
+    with _cache_lock:
+        _cache[key] = (claims, claims.get("exp"))
+        _cache.move_to_end(key)
+        while len(_cache) > TOKEN_CACHE_SIZE:
+            _cache.popitem(last=False)
+            _stats["evicted"] += 1
+    return dict(claims)
+
+def clear_token_cache():
+    with _cache_lock:
+        _cache.clear()
+
+def token_cache_stats() -> dict:
+    with _cache_lock:
+        lookups = _stats["hits"] + _stats["misses"]
+        return {
+            "size": len(_cache),
+            "max_size": TOKEN_CACHE_SIZE,
+            "hit_rate": round(_stats["hits"] / lookups, 4) if lookups else 0.0,
+            **_stats,
+        }
@@ -1,19 +1,30 @@
 import os
-import jwt
 import datetime
 import json
 import re
-from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError
+import threading
 from db import get_db_connection
+from infra.rate_limiter import get_limiter, snapshot_loaded
+from auth.tokens import SECRET_KEY, ALGORITHM, create_token, verify_token
+# Argon2 runs on the bounded hashing pool (auth/hashing.py)
+from auth.hashing import ph, hash_password, verify_password, verify_and_rehash, HashingBusy
 
-# Load Secret Key (In prod, use env var)
-SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-me')
-ALGORITHM = 'HS256'
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 # 24 hours for MVP
 RESET_TOKEN_EXPIRE_MINUTES = 30
 
-ph = PasswordHasher()
+# Login rate limiting
+# sqlite: login_attempts table (migration 010), shared by every process (API workers, CLI scripts)
+# memory: sharded in-process sliding window (infra.rate_limiter); only taken by a process that has
+#         loaded the persisted snapshot (the API with RATE_LIMIT_PERSIST=true), sqlite everywhere else
+LOGIN_RATE_LIMIT_BACKEND = os.environ.get('LOGIN_RATE_LIMIT_BACKEND', 'sqlite')
+LOGIN_MAX_FAILURES = int(os.environ.get('LOGIN_MAX_FAILURES', '5'))
+LOGIN_WINDOW_MINUTES = int(os.environ.get('LOGIN_WINDOW_MINUTES', '15'))
+# Rows older than the TTL are pruned; it never drops below the window.
+LOGIN_ATTEMPT_TTL_MINUTES = max(LOGIN_WINDOW_MINUTES, int(os.environ.get('LOGIN_ATTEMPT_TTL_MINUTES', '60')))
+LOGIN_PRUNE_INTERVAL_SECONDS = int(os.environ.get('LOGIN_PRUNE_INTERVAL_SECONDS', '60'))
+
+_prune_lock = threading.Lock()
+_last_prune = 0.0
 
 # Error Messages (i18n Keys)
 ERR_INVALID_CREDENTIALS = "auth.invalid_credentials"
@@ -24,34 +35,13 @@ ERR_RESET_SENT = "auth.reset_sent"
 ERR_RESET_INVALID = "auth.reset_invalid_or_expired"
 ERR_INVALID_EMAIL = "auth.invalid_email_format"
 ERR_PASSWORD_WEAK = "auth.password_too_weak" 
-
-def hash_password(password: str) -> str:
-    return ph.hash(password)
-
-def verify_password(hash: str, password: str) -> bool:
-    try:
-        return ph.verify(hash, password)
-    except VerifyMismatchError:
-        return False
+ERR_AUTH_BUSY = "auth.busy_try_again"
 
 def create_access_token(data: dict, expires_delta: datetime.timedelta = None):
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.datetime.now(datetime.timezone.utc) + expires_delta
-    else:
-        expire = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(minutes=15)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    return create_token(data, expires_delta or datetime.timedelta(minutes=15))
 
 def decode_access_token(token: str):
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except jwt.ExpiredSignatureError:
-        return None
-    except jwt.InvalidTokenError:
-        return None
+    return verify_token(token)
 
 def validate_password_strength(password: str) -> bool:
     """
@@ -69,38 +59,102 @@ def validate_password_strength(password: str) -> bool:
         return False
     return True
 
+def normalize_email(email: str):
+    return email.strip().lower() if email else None
+
+def _utc_timestamp(delta_minutes: int = 0) -> str:
+    """Same 'YYYY-MM-DD HH:MM:SS' UTC format as CURRENT_TIMESTAMP, so string comparison is chronological."""
+    moment = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(minutes=delta_minutes)
+    return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+def _failure_keys(ip_address: str, email: str):
+    return (f"ip:{ip_address}" if ip_address else None,
+            f"email:{email}" if email else None)
+
+def _memory_backend() -> bool:
+    # A process without the snapshot (e.g. a login.py run) would start from an empty limiter every time
+    return LOGIN_RATE_LIMIT_BACKEND == 'memory' and snapshot_loaded()
+
+def login_failure_limiter():
+    return get_limiter("login_failures", LOGIN_MAX_FAILURES, LOGIN_WINDOW_MINUTES * 60)
+
 def check_rate_limit(ip_address: str, email: str = None) -> bool:
     """
     Check if IP or Account has exceeded login failures.
-    Limit: 5 failures in 15 minutes.
+    Limit: LOGIN_MAX_FAILURES failures in LOGIN_WINDOW_MINUTES (default 5 in 15 minutes).
+    The sqlite backend (default) does a range scan on a (key, attempted_at) index, independent
+    of audit_logs size; the memory backend, where enabled, answers without touching SQLite.
     """
-    limit_window = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(minutes=15)
-    
+    email = normalize_email(email)
+    if _memory_backend():
+        return login_failure_limiter().check(*_failure_keys(ip_address, email))
+
+    limit_window = _utc_timestamp(LOGIN_WINDOW_MINUTES)
+
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        
+
         # Check IP Limit
-        cursor.execute("""
-            SELECT count(*) FROM audit_logs 
-            WHERE action_type = 'AUTH_LOGIN_FAIL' 
-            AND ip_address = ? 
-            AND timestamp > ?
-        """, (ip_address, limit_window))
-        ip_count = cursor.fetchone()[0]
-        
-        if ip_count >= 5:
-            return False
+        if ip_address:
+            cursor.execute("""
+                SELECT count(*) FROM login_attempts
+                WHERE ip_address = ? AND attempted_at > ?
+            """, (ip_address, limit_window))
+            if cursor.fetchone()[0] >= LOGIN_MAX_FAILURES:
+                return False
 
         # Check Account Limit (if email provided)
         if email:
             cursor.execute("""
-                SELECT count(*) FROM audit_logs 
-                WHERE action_type = 'AUTH_LOGIN_FAIL' 
-                AND metadata LIKE ? 
-                AND timestamp > ?
-            """, (f'%{email}%', limit_window))
-            account_count = cursor.fetchone()[0]
-            if account_count >= 5:
+                SELECT count(*) FROM login_attempts
+                WHERE email = ? AND attempted_at > ?
+            """, (email, limit_window))
+            if cursor.fetchone()[0] >= LOGIN_MAX_FAILURES:
                 return False
-                
+
     return True
+
+def record_login_failure(ip_address: str = None, email: str = None):
+    """Record a failed login for the limiter (sqlite backend: also prune expired attempts, at most once per interval)."""
+    if _memory_backend():
+        login_failure_limiter().hit(*_failure_keys(ip_address, normalize_email(email)))
+        return
+
+    with get_db_connection() as conn:
+        conn.execute(
+            "INSERT INTO login_attempts (ip_address, email, attempted_at) VALUES (?, ?, ?)",
+            (ip_address, normalize_email(email), _utc_timestamp())
+        )
+        _maybe_prune(conn)
+        conn.commit()
+
+def _maybe_prune(conn):
+    global _last_prune
+    now = datetime.datetime.now().timestamp()
+    with _prune_lock:
+        if now - _last_prune < LOGIN_PRUNE_INTERVAL_SECONDS:
+            return
+        _last_prune = now
+    conn.execute("DELETE FROM login_attempts WHERE attempted_at < ?", (_utc_timestamp(LOGIN_ATTEMPT_TTL_MINUTES),))
+
+def clear_login_failures(email: str = None, ip_address: str = None) -> int:
+    """Forget recorded failures for an account and/or IP (all of them when neither is given)."""
+    if _memory_backend():
+        keys = [key for key in _failure_keys(ip_address, normalize_email(email)) if key]
+        limiter = login_failure_limiter()
+        cleared = sum(limiter.count(key) for key in keys) if keys else limiter.stats()["keys"]
+        limiter.reset(*keys)
+        return cleared
+
+    clauses, params = [], []
+    if email:
+        clauses.append("email = ?")
+        params.append(normalize_email(email))
+    if ip_address:
+        clauses.append("ip_address = ?")
+        params.append(ip_address)
+    where = (" WHERE " + " OR ".join(clauses)) if clauses else ""
+    with get_db_connection() as conn:
+        cursor = conn.execute("DELETE FROM login_attempts" + where, params)
+        conn.commit()
+        return cursor.rowcount
@@ -1,17 +1,407 @@
 import sqlite3
 import os
+import threading
+import time
+import contextvars
 from contextlib import contextmanager
 
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'church_app.db')
 
+# Pool configuration (override via env vars)
+POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '8'))
+POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', '30'))
+BUSY_TIMEOUT_MS = int(os.environ.get('DB_BUSY_TIMEOUT_MS', '5000'))
+CACHE_SIZE_KB = int(os.environ.get('DB_CACHE_SIZE_KB', '16384'))  # 16MB page cache per connection
+MMAP_SIZE = int(os.environ.get('DB_MMAP_SIZE', str(128 * 1024 * 1024)))  # 128MB
+STATEMENT_CACHE_SIZE = int(os.environ.get('DB_STATEMENT_CACHE_SIZE', '256'))  # prepared statements per connection
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection becomes free within the pool timeout."""
+
+class PooledConnection(sqlite3.Connection):
+    """Connection whose commit() is deferred while it is enlisted in a UnitOfWork."""
+    uow = None
+    statement_lru = None
+
+    def commit(self):
+        if self.uow is not None:
+            self.uow._commit_requested()
+            return
+        super().commit()
+
+class ConnectionPool:
+    """
+    Bounded pool of warm SQLite connections.
+    - At most `size` connections are open at once; extra callers wait up to `timeout` seconds.
+    - Nested checkouts on the same thread reuse the connection already held by that thread.
+    - A thread gets back the connection it used last when it is still idle (warm page cache).
+    """
+
+    def __init__(self, db_path: str, size: int = POOL_SIZE, timeout: float = POOL_TIMEOUT):
+        self.db_path = db_path
+        self.size = max(1, size)
+        self.timeout = timeout
+        self._idle = []
+        self._open = 0
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._closed = False
+        self._stats = {
+            "created": 0,
+            "checkouts": 0,
+            "reentrant": 0,
+            "thread_hits": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "wait_ms_total": 0.0,
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False,
+                               factory=PooledConnection, cached_statements=STATEMENT_CACHE_SIZE)
+        # Connection-scoped PRAGMAs: applied once when the connection is opened and kept for its lifetime
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        preferred = getattr(self._local, 'last', None)
+        deadline = None
+        with self._cond:
+            self._stats["checkouts"] += 1
+            while True:
+                if self._idle:
+                    if preferred is not None and preferred in self._idle:
+                        self._idle.remove(preferred)
+                        self._stats["thread_hits"] += 1
+                        return preferred
+                    return self._idle.pop()
+                if self._open < self.size:
+                    self._open += 1
+                    break
+                if deadline is None:
+                    deadline = time.monotonic() + self.timeout
+                    self._stats["waits"] += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeout(f"No database connection available after {self.timeout}s")
+                started = time.monotonic()
+                self._cond.wait(remaining)
+                self._stats["wait_ms_total"] += (time.monotonic() - started) * 1000
+
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats["created"] += 1
+        return conn
+
+    def checkout(self) -> sqlite3.Connection:
+        local = self._local
+        if getattr(local, 'depth', 0):
+            local.depth += 1
+            self._stats["reentrant"] += 1
+            return local.conn
+
+        conn = self.acquire()
+        # Reset per-checkout state left behind by the previous borrower
+        conn.row_factory = sqlite3.Row
+        local.conn = conn
+        local.depth = 1
+        return conn
+
+    def checkin(self, conn: sqlite3.Connection):
+        local = self._local
+        local.depth -= 1
+        if local.depth:
+            return
+
+        local.conn = None
+        self.release(conn)
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection obtained with acquire() (or a finished checkout) to the pool."""
+        try:
+            # Same semantics as closing a plain connection: uncommitted work is discarded
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.close()
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            return
+
+        self._local.last = conn
+        with self._cond:
+            if self._closed:
+                conn.close()
+                self._open -= 1
+                return
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def close_all(self):
+        """Close idle connections. Connections currently checked out are closed on their next checkin."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._idle.pop().close()
+                self._open -= 1
+
+    def stats(self) -> dict:
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                "size": self.size,
+                "open": self._open,
+                "idle": idle,
+                "in_use": self._open - idle,
+                **self._stats,
+            }
+
+_pool = None
+_pool_lock = threading.Lock()
+_current_uow = contextvars.ContextVar('current_uow', default=None)
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_PATH)
+    return _pool
+
+class UnitOfWork:
+    """
+    Request-scoped transaction shared by every get_db_connection() call made while it is active.
+    - Core functions and the audit logger enlist automatically; their conn.commit() calls are deferred.
+    - Reads run in autocommit until the first write, which opens the transaction (BEGIN IMMEDIATE).
+    - Each enlisted `with get_db_connection()` block runs inside a SAVEPOINT: a block that raises,
+      or exits without asking to commit, is rolled back on its own, exactly like a plain connection.
+    - Work buffered with defer() (e.g. audit rows) is written just before that single commit.
+    - Callbacks registered with after_commit() (e.g. cache invalidation) run once it has succeeded;
+      those registered with after_rollback() (e.g. removing a placed file) run if it does not,
+      just before the transaction is rolled back.
+    - The whole request is committed once on exit (or rolled back if the request raised).
+    """
+
+    def __init__(self, pool: ConnectionPool = None):
+        self.pool = pool
+        self.conn = None
+        self._scopes = []
+        self._deferred = {}
+        self._after_commit = []
+        self._after_rollback = []
+        self._lock = threading.RLock()
+        self._previous = None
+
+    def __enter__(self):
+        return self.bind()
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.finish(exc_type is None)
+        finally:
+            self.unbind()
+        return False
+
+    def bind(self):
+        """Make this the active unit of work for the current context."""
+        self._previous = _current_uow.get()
+        _current_uow.set(self)
+        return self
+
+    def unbind(self):
+        _current_uow.set(self._previous)
+
+    def finish(self, success: bool = True):
+        """Commit (or roll back) and hand the connection back to the pool."""
+        try:
+            if success:
+                self.commit()
+            else:
+                self.rollback()
+        except BaseException:
+            self.rollback()  # a failed commit: run the after_rollback callbacks
+            raise
+        finally:
+            self.close()
+
+    def _commit_requested(self):
+        # A commit inside a block commits everything before it, including enclosing blocks
+        for scope in self._scopes:
+            scope["commit"] = True
+
+    def _connection(self) -> sqlite3.Connection:
+        if self.conn is None:
+            self.pool = self.pool or get_pool()
+            self.conn = self.pool.acquire()
+            self.conn.uow = self
+            # Reads run in autocommit; the first INSERT/UPDATE/DELETE opens the request transaction
+            # with BEGIN IMMEDIATE. A deferred BEGIN would pin a read snapshot at the first SELECT,
+            # and a later write would fail with SQLITE_BUSY_SNAPSHOT (not retried by busy_timeout)
+            # whenever another request committed in between.
+            self.conn.isolation_level = "IMMEDIATE"
+        return self.conn
+
+    def defer(self, name: str, item, flush):
+        """Buffer `item` under `name`; flush(conn, items) writes each bucket once, right before the commit."""
+        with self._lock:
+            self._deferred.setdefault(name, (flush, []))[1].append(item)
+
+    def after_commit(self, fn):
+        """Call fn() once this unit of work has committed (dropped on rollback)."""
+        with self._lock:
+            self._after_commit.append(fn)
+
+    def after_rollback(self, fn):
+        """Call fn() if this unit of work rolls back instead of committing (dropped on commit)."""
+        with self._lock:
+            self._after_rollback.append(fn)
+
+    @contextmanager
+    def enlist(self):
+        with self._lock:
+            conn = self._connection()
+            name = f"uow_{len(self._scopes)}"
+            scope = {"commit": False}
+            previous_factory = conn.row_factory
+            conn.row_factory = sqlite3.Row
+            # Without an open transaction there is nothing to mark: any transaction open when
+            # the block ends was started by one of its writes, so undoing the block undoes it all
+            savepoint = conn.in_transaction
+            if savepoint:
+                conn.execute(f"SAVEPOINT {name}")
+            self._scopes.append(scope)
+            try:
+                yield conn
+            except BaseException:
+                self._scopes.pop()
+                self._undo(conn, name, savepoint)
+                raise
+            else:
+                self._scopes.pop()
+                if not scope["commit"]:
+                    self._undo(conn, name, savepoint)
+                elif savepoint:
+                    conn.execute(f"RELEASE {name}")
+            finally:
+                conn.row_factory = previous_factory
+
+    @staticmethod
+    def _undo(conn, name: str, savepoint: bool):
+        if not conn.in_transaction:
+            return
+        if savepoint:
+            conn.execute(f"ROLLBACK TO {name}")
+            conn.execute(f"RELEASE {name}")
+        else:
+            sqlite3.Connection.rollback(conn)
+
+    def commit(self):
+        with self._lock:
+            if self._deferred:
+                conn = self._connection()
+                for flush, items in self._deferred.values():
+                    flush(conn, items)
+                self._deferred.clear()
+            if self.conn is not None and self.conn.in_transaction:
+                sqlite3.Connection.commit(self.conn)
+            callbacks, self._after_commit = self._after_commit, []
+            self._after_rollback.clear()
+        for fn in callbacks:
+            fn()
+
+    def rollback(self):
+        with self._lock:
+            self._deferred.clear()
+            self._after_commit.clear()
+            callbacks, self._after_rollback = self._after_rollback, []
+            try:
+                # Still holding the write lock: no other writer sees the state before the undo
+                for fn in callbacks:
+                    fn()
+            finally:
+                if self.conn is not None and self.conn.in_transaction:
+                    self.conn.rollback()
+
+    def close(self):
+        with self._lock:
+            if self.conn is not None:
+                self.conn.uow = None
+                self.conn.isolation_level = ""
+                self.pool.release(self.conn)
+                self.conn = None
+
+def current_unit_of_work():
+    """The UnitOfWork active in this context, or None."""
+    return _current_uow.get()
+
+def after_commit(fn):
+    """Run fn() after the active UnitOfWork commits, or right away when there is none."""
+    uow = _current_uow.get()
+    if uow is None:
+        fn()
+    else:
+        uow.after_commit(fn)
+
+def after_rollback(fn):
+    """Run fn() if the active UnitOfWork rolls back. Without one there is nothing left to undo."""
+    uow = _current_uow.get()
+    if uow is not None:
+        uow.after_rollback(fn)
+
 @contextmanager
 def get_db_connection():
-    conn = sqlite3.connect(DB_PATH)
+    uow = _current_uow.get()
+    if uow is not None:
+        with uow.enlist() as conn:
+            yield conn
+        return
+
+    pool = get_pool()
+    conn = pool.checkout()
+    try:
+        yield conn
+    finally:
+        pool.checkin(conn)
+
+@contextmanager
+def read_connection():
+    """
+    A pooled connection that never enlists in the active UnitOfWork. For reads that
+    outlive the request transaction, e.g. a response streamed after the request committed.
+    Taken with acquire()/release(), which keep no per-thread state: a streamed body is
+    resumed on whichever threadpool thread is free, so it may be closed on another thread.
+    """
+    pool = get_pool()
+    conn = pool.acquire()
     conn.row_factory = sqlite3.Row
     try:
         yield conn
     finally:
-        conn.close()
+        pool.release(conn)
+
+def pool_stats() -> dict:
+    """Snapshot of connection pool counters."""
+    return get_pool().stats()
+
+def close_pool():
+    """Close all idle pooled connections (call on application shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+            _pool = None
 
 def init_db_file():
     if not os.path.exists(DB_PATH):
@@ -11,6 +11,128 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from db import get_db_connection
 from infra.audit_logger import log_audit_event
+from infra.query_registry import register_query
+from infra.cursors import encode_cursor, decode_cursor
+
+EVENTS_PAGE_SIZE = int(os.environ.get('EVENTS_PAGE_SIZE', '100'))
+EVENTS_MAX_PAGE_SIZE = int(os.environ.get('EVENTS_MAX_PAGE_SIZE', '500'))
+
+# Internal (non-public) events are visible to Active members when they have no target
+# ministries, or when the viewer belongs to one of them (event_targets, migration 012).
+MEMBER_VISIBILITY = """(is_public = 1
+    OR NOT EXISTS (SELECT 1 FROM event_targets t WHERE t.event_id = events.id)
+    OR EXISTS (SELECT 1 FROM event_targets t
+               JOIN ministry_assignments ma ON ma.ministry_id = t.ministry_id
+               WHERE t.event_id = events.id AND ma.user_id = ? AND ma.deleted_at IS NULL))"""
+
+# Attendance badges come from the materialized event_rsvp_counts row (migration 013), O(1) per event
+EVENT_SELECT = """SELECT events.*, c.going AS rsvp_going, c.maybe AS rsvp_maybe,
+    c.not_going AS rsvp_not_going, c.guests AS rsvp_guests
+    FROM events LEFT JOIN event_rsvp_counts c ON c.event_id = events.id"""
+
+LIST_EVENTS_QUERY = register_query(
+    "events.list",
+    EVENT_SELECT + " WHERE events.deleted_at IS NULL",
+    [
+        ("organization_id", "organization_id = ?"),
+        ("public_only", "is_public = 1"),
+        ("member_visibility", MEMBER_VISIBILITY),
+        ("from_date", "start_at >= ?"),
+        ("to_date", "start_at <= ?"),
+        ("until", "start_at < ?"),
+        ("after", "(start_at, id) > (?, ?)"),
+    ],
+    " ORDER BY start_at ASC, id ASC LIMIT ?",
+)
+
+# Per-day counts for the calendar's summary view. date() applies a stored UTC offset
+# ("...T23:00:00-03:00" counts on the next UTC day); timestamps without one are taken as UTC.
+DAY_COUNTS_QUERY = register_query(
+    "events.day_counts",
+    "SELECT date(start_at) AS day, count(*) AS n FROM events WHERE deleted_at IS NULL",
+    [
+        ("organization_id", "organization_id = ?"),
+        ("public_only", "is_public = 1"),
+        ("member_visibility", MEMBER_VISIBILITY),
+        ("from_date", "start_at >= ?"),
+        ("to_date", "start_at <= ?"),
+        ("until", "start_at < ?"),
+    ],
+    " GROUP BY day ORDER BY day",
+)
+
+RSVP_STATUSES = ('going', 'maybe', 'not_going')
+RSVP_BULK_MAX_ITEMS = int(os.environ.get('RSVP_BULK_MAX_ITEMS', '500'))
+
+EVENT_FIELDS = ("id", "title", "description", "start", "end", "location", "public", "rsvp_required", "rsvp_counts")
+SUMMARY_WINDOWS = ("week", "month")
+
+GET_EVENT_QUERY = register_query(
+    "events.get",
+    EVENT_SELECT + " WHERE events.deleted_at IS NULL AND events.id = ?",
+    [
+        ("public_only", "is_public = 1"),
+        ("member_visibility", MEMBER_VISIBILITY),
+    ],
+)
+
+def normalize_target_ids(target_ministry_ids) -> list:
+    return sorted({int(m) for m in (target_ministry_ids or []) if str(m).strip().isdigit() and int(m) > 0})
+
+def sync_event_targets(cursor, event_id: int, ministry_ids: list):
+    """Replace an event's event_targets rows (events.target_ministry_ids is kept as a JSON copy for older readers)."""
+    cursor.execute("DELETE FROM event_targets WHERE event_id = ?", (event_id,))
+    cursor.executemany("INSERT INTO event_targets (event_id, ministry_id) VALUES (?, ?)", [(event_id, m) for m in ministry_ids])
+
+def _viewer_status(cursor, viewer_id) -> str:
+    if not viewer_id:
+        return 'Public'
+    cursor.execute("SELECT status FROM users WHERE id = ?", (viewer_id,))
+    row = cursor.fetchone()
+    return row['status'] if row else 'Public'
+
+def _visibility_filters(viewer_id, viewer_status) -> dict:
+    if viewer_status != 'Active':
+        return {"public_only": True}
+    return {"member_visibility": (viewer_id,)}
+
+def parse_fields(fields):
+    """`fields=` projection (list or comma-separated string) -> tuple of result keys, or None if invalid. id is always kept."""
+    if not fields:
+        return EVENT_FIELDS
+    names = [f.strip() for f in (fields.split(',') if isinstance(fields, str) else fields) if f.strip()]
+    if not names or any(name not in EVENT_FIELDS for name in names):
+        return None
+    return tuple(name for name in EVENT_FIELDS if name == "id" or name in names)
+
+def window_bounds(window: str, anchor: str):
+    """[start, end) dates of the week (Monday-based) or month containing `anchor` (default: today, UTC)."""
+    day = datetime.date.fromisoformat(anchor[:10]) if anchor else datetime.datetime.now(datetime.timezone.utc).date()
+    if window == "week":
+        start = day - datetime.timedelta(days=day.weekday())
+        end = start + datetime.timedelta(days=7)
+    else:
+        start = day.replace(day=1)
+        end = (start + datetime.timedelta(days=32)).replace(day=1)
+    return start.isoformat(), end.isoformat()
+
+def _event_result(event) -> dict:
+    return {
+        "id": event['id'],
+        "title": event['title'],
+        "description": event['description'],
+        "start": event['start_at'],
+        "end": event['end_at'],
+        "location": event['location'],
+        "public": bool(event['is_public']),
+        "rsvp_required": bool(event['rsvp_required']),
+        "rsvp_counts": {
+            "going": event['rsvp_going'] or 0,
+            "maybe": event['rsvp_maybe'] or 0,
+            "not_going": event['rsvp_not_going'] or 0,
+            "guests": event['rsvp_guests'] or 0,
+        }
+    }
 
 def create_event_core(admin_id: int, title: str, start_at: str, end_at: str, description: str = None, 
                      location: str = None, is_public: bool = False, target_ministry_ids: list = None, organization_id: int = 1) -> dict:
@@ -28,8 +150,7 @@ def create_event_core(admin_id: int, title: str, start_at: str, end_at: str, des
     except:
         return {"ok": False, "data": None, "error_key": "event.invalid_date_format"}
     
-    # Convert target_ministry_ids to JSON
-    targets_json = json.dumps(target_ministry_ids if target_ministry_ids else [])
+    target_ids = normalize_target_ids(target_ministry_ids)
     
     try:
         with get_db_connection() as conn:
@@ -38,9 +159,10 @@ def create_event_core(admin_id: int, title: str, start_at: str, end_at: str, des
             cursor.execute("""
                 INSERT INTO events (title, description, start_at, end_at, location, is_public, target_ministry_ids, created_by, organization_id)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (title, description, start_at, end_at, location, 1 if is_public else 0, targets_json, admin_id, organization_id))
+            """, (title, description, start_at, end_at, location, 1 if is_public else 0, json.dumps(target_ids), admin_id, organization_id))
             
             event_id = cursor.lastrowid
+            sync_event_targets(cursor, event_id, target_ids)
             conn.commit()
             
             log_audit_event(admin_id, 'EVENT_CREATE', 'event', event_id, {'title': title})
@@ -50,86 +172,187 @@ def create_event_core(admin_id: int, title: str, start_at: str, end_at: str, des
     except Exception as e:
         return {"ok": False, "data": None, "error_key": "internal_error"}
 
-def list_events_core(viewer_id: int = None, from_date: str = None, to_date: str = None, organization_id: int = None) -> dict:
+def list_events_core(viewer_id: int = None, from_date: str = None, to_date: str = None, organization_id: int = None,
+                     limit: int = None, cursor: str = None, fields=None) -> dict:
     """
     Core event listing logic.
+    Visibility is resolved in SQL (event_targets join); pages are keyset-ordered by (start_at, id).
+    Pass data.next_cursor back as `cursor` to get the next page (None on the last page).
+    `fields` limits each result to the given keys (see EVENT_FIELDS).
     Returns: {"ok": bool, "data": dict|None, "error_key": str|None}
     """
-    viewer_status = 'Public'
-    viewer_ministries = set()
+    projection = parse_fields(fields)
+    if projection is None:
+        return {"ok": False, "data": None, "error_key": "event.invalid_fields"}
+    limit = min(max(1, limit or EVENTS_PAGE_SIZE), EVENTS_MAX_PAGE_SIZE)
+    after = None
+    if cursor:
+        after = decode_cursor(cursor, 2)
+        if after is None:
+            return {"ok": False, "data": None, "error_key": "event.invalid_cursor"}
     
-    if viewer_id:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT status FROM users WHERE id = ?", (viewer_id,))
-            row = cursor.fetchone()
-            if row:
-                viewer_status = row['status']
-                
-                if viewer_status == 'Active':
-                    cursor.execute("SELECT ministry_id FROM ministry_assignments WHERE user_id = ? AND deleted_at IS NULL", (viewer_id,))
-                    viewer_ministries = {str(r[0]) for r in cursor.fetchall()}
-    
-    query = "SELECT * FROM events WHERE deleted_at IS NULL"
-    params = []
-    
-    if organization_id is not None:
-        query += " AND organization_id = ?"
-        params.append(organization_id)
+    with get_db_connection() as conn:
+        viewer_status = _viewer_status(conn.cursor(), viewer_id)
+        
+        rows = LIST_EVENTS_QUERY.execute(conn, {
+            "organization_id": organization_id,
+            **_visibility_filters(viewer_id, viewer_status),
+            "from_date": from_date or None,
+            "to_date": to_date or None,
+            "after": after,
+        }, tail=[limit + 1]).fetchall()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([rows[-1]['start_at'], rows[-1]['id']])
+        
+        results = [_event_result(row) for row in rows]
+        if projection != EVENT_FIELDS:
+            results = [{name: result[name] for name in projection} for result in results]
+        return {"ok": True, "data": {"results": results, "next_cursor": next_cursor}, "error_key": None}
 
-    if viewer_status != 'Active':
-        query += " AND is_public = 1"
-    
-    if from_date:
-        query += " AND start_at >= ?"
-        params.append(from_date)
-    
-    if to_date:
-        query += " AND start_at <= ?"
-        params.append(to_date)
+def summarize_events_core(viewer_id: int = None, from_date: str = None, to_date: str = None, organization_id: int = None,
+                          window: str = None) -> dict:
+    """
+    Calendar summary: visible events counted per UTC day, in SQL.
+    With `window` ('week' or 'month') the range is the week/month containing `from_date` (default today).
+    Returns: {"ok": bool, "data": dict|None, "error_key": str|None}
+    """
+    until = None
+    if window:
+        if window not in SUMMARY_WINDOWS:
+            return {"ok": False, "data": None, "error_key": "event.invalid_window"}
+        try:
+            from_date, until = window_bounds(window, from_date)
+        except ValueError:
+            return {"ok": False, "data": None, "error_key": "event.invalid_date_format"}
+        to_date = None
     
-    query += " ORDER BY start_at ASC"
+    with get_db_connection() as conn:
+        viewer_status = _viewer_status(conn.cursor(), viewer_id)
+        rows = DAY_COUNTS_QUERY.execute(conn, {
+            "organization_id": organization_id,
+            **_visibility_filters(viewer_id, viewer_status),
+            "from_date": from_date or None,
+            "to_date": to_date or None,
+            "until": until,
+        }).fetchall()
     
+    days = [{"date": row['day'], "count": row['n']} for row in rows]
+    return {
+        "ok": True,
+        "data": {"from": from_date, "to": until or to_date, "days": days, "total": sum(d["count"] for d in days)},
+        "error_key": None
+    }
+
+def get_event_by_id_core(event_id: int, viewer_id: int = None) -> dict:
+    """
+    Single event, subject to the same visibility rules as the calendar.
+    Returns: {"ok": bool, "data": dict|None, "error_key": str|None}
+    """
     with get_db_connection() as conn:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        
-        results = []
-        for row in rows:
-            event = dict(row)
-            is_public = bool(event['is_public'])
+        viewer_status = _viewer_status(conn.cursor(), viewer_id)
+        row = GET_EVENT_QUERY.execute(conn, _visibility_filters(viewer_id, viewer_status), head=[event_id]).fetchone()
+        if not row:
+            return {"ok": False, "data": None, "error_key": "event.not_found"}
+        return {"ok": True, "data": _event_result(row), "error_key": None}
+
+# API field names (app/schemas/events.py) -> events columns
+_UPDATE_FIELDS = {
+    "title": "title",
+    "description": "description",
+    "location": "location",
+    "start_time": "start_at",
+    "start_at": "start_at",
+    "end_time": "end_at",
+    "end_at": "end_at",
+    "is_public": "is_public",
+    "rsvp_required": "rsvp_required",
+}
+
+def update_event_core(event_id: int, admin_id: int, fields: dict) -> dict:
+    """
+    Partial event update; `target_ministry_ids` re-syncs event_targets.
+    Returns: {"ok": bool, "data": dict|None, "error_key": str|None}
+    """
+    updates = {}
+    for name, value in (fields or {}).items():
+        column = _UPDATE_FIELDS.get(name)
+        if column is None:
+            continue
+        if isinstance(value, datetime.datetime):
+            value = value.isoformat()
+        if column in ('is_public', 'rsvp_required'):
+            value = 1 if value else 0
+        updates[column] = value
+    
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT start_at, end_at FROM events WHERE id = ? AND deleted_at IS NULL", (event_id,))
+            current = cursor.fetchone()
+            if not current:
+                return {"ok": False, "data": None, "error_key": "event.not_found"}
             
-            # Internal event visibility check
-            if not is_public and viewer_status == 'Active':
+            if 'start_at' in updates or 'end_at' in updates:
                 try:
-                    targets = json.loads(event['target_ministry_ids'])
-                except:
-                    targets = []
-                
-                if targets and not set(targets).intersection(viewer_ministries):
-                    continue
-            
-            results.append({
-                "id": event['id'],
-                "title": event['title'],
-                "description": event['description'],
-                "start": event['start_at'],
-                "end": event['end_at'],
-                "location": event['location'],
-                "public": is_public
-            })
-        
-        return {"ok": True, "data": {"results": results}, "error_key": None}
+                    start_dt = datetime.datetime.fromisoformat(str(updates.get('start_at', current['start_at'])).replace('Z', '+00:00'))
+                    end_dt = datetime.datetime.fromisoformat(str(updates.get('end_at', current['end_at'])).replace('Z', '+00:00'))
+                except ValueError:
+                    return {"ok": False, "data": None, "error_key": "event.invalid_date_format"}
+                if end_dt <= start_dt:
+                    return {"ok": False, "data": None, "error_key": "event.invalid_dates"}
+            
+            if 'target_ministry_ids' in (fields or {}):
+                target_ids = normalize_target_ids(fields['target_ministry_ids'])
+                sync_event_targets(cursor, event_id, target_ids)
+                updates['target_ministry_ids'] = json.dumps(target_ids)
+            
+            if updates:
+                assignments = ", ".join(f"{column} = ?" for column in updates)
+                cursor.execute(f"UPDATE events SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                               (*updates.values(), event_id))
+            conn.commit()
+            
+            log_audit_event(admin_id, 'EVENT_UPDATE', 'event', event_id, {'fields': sorted(updates)})
+            
+            return {"ok": True, "data": {"event_id": event_id, "message": "event.updated_success"}, "error_key": None}
+    
+    except Exception as e:
+        return {"ok": False, "data": None, "error_key": "internal_error"}
 
-def rsvp_event_core(user_id: int, event_id: int, status: str) -> dict:
+def delete_event_core(event_id: int, admin_id: int) -> dict:
+    """
+    Soft delete; the event's event_targets rows are removed with it.
+    Returns: {"ok": bool, "data": dict|None, "error_key": str|None}
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE events SET deleted_at = CURRENT_TIMESTAMP WHERE id = ? AND deleted_at IS NULL", (event_id,))
+            if cursor.rowcount == 0:
+                return {"ok": False, "data": None, "error_key": "event.not_found"}
+            cursor.execute("DELETE FROM event_targets WHERE event_id = ?", (event_id,))
+            conn.commit()
+            
+            log_audit_event(admin_id, 'EVENT_DELETE', 'event', event_id)
+            
+            return {"ok": True, "data": {"event_id": event_id, "message": "event.deleted_success"}, "error_key": None}
+    
+    except Exception as e:
+        return {"ok": False, "data": None, "error_key": "internal_error"}
+
+def rsvp_event_core(user_id: int, event_id: int, status: str, guests: int = 0, notes: str = None) -> dict:
     """
     Core RSVP logic.
+    event_rsvp_counts is kept in step by triggers on event_rsvps, inside this same transaction.
     Returns: {"ok": bool, "data": dict|None, "error_key": str|None}
     """
     if status not in ('going', 'maybe', 'not_going'):
         return {"ok": False, "data": None, "error_key": "event.invalid_rsvp_status"}
+    if not isinstance(guests, int) or guests < 0:
+        return {"ok": False, "data": None, "error_key": "event.invalid_rsvp_guests"}
     
     try:
         with get_db_connection() as conn:
@@ -149,12 +372,14 @@ def rsvp_event_core(user_id: int, event_id: int, status: str) -> dict:
             
             # Upsert RSVP
             cursor.execute("""
-                INSERT INTO event_rsvps (event_id, user_id, status)
-                VALUES (?, ?, ?)
+                INSERT INTO event_rsvps (event_id, user_id, status, guests, notes, created_at)
+                VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
                 ON CONFLICT(event_id, user_id) DO UPDATE SET
                     status = excluded.status,
+                    guests = excluded.guests,
+                    notes = excluded.notes,
                     updated_at = CURRENT_TIMESTAMP
-            """, (event_id, user_id, status))
+            """, (event_id, user_id, status, guests, notes))
             
             conn.commit()
             
@@ -164,3 +389,90 @@ def rsvp_event_core(user_id: int, event_id: int, status: str) -> dict:
     
     except Exception as e:
         return {"ok": False, "data": None, "error_key": "internal_error"}
+
+def bulk_rsvp_core(actor_id: int, items: list) -> dict:
+    """
+    Batch RSVP for families and groups: items are {"user_id", "event_id", "status", "guests"?}.
+    Admin/Staff may answer for any member of the event's organization, everyone else only for themselves.
+    Events and users are validated with one set-based query each, accepted rows are upserted with a
+    single executemany and one aggregated RSVP_BULK audit row is written.
+    Returns: {"ok": bool, "data": dict|None, "error_key": str|None}; data.results has one entry per item.
+    """
+    if not items:
+        return {"ok": False, "data": None, "error_key": "event.rsvp_bulk_empty"}
+    if len(items) > RSVP_BULK_MAX_ITEMS:
+        return {"ok": False, "data": None, "error_key": "event.rsvp_bulk_too_large"}
+    
+    def _int(value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    
+    parsed = []
+    for item in items:
+        guests = item.get('guests', 0)
+        parsed.append((_int(item.get('user_id')), _int(item.get('event_id')), item.get('status'), guests))
+    
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            user_ids = json.dumps(sorted({u for u, _, _, _ in parsed if u is not None} | {_int(actor_id)}))
+            event_ids = json.dumps(sorted({e for _, e, _, _ in parsed if e is not None}))
+            
+            cursor.execute("SELECT id, organization_id, role FROM users WHERE id IN (SELECT value FROM json_each(?))", (user_ids,))
+            users = {row['id']: row for row in cursor.fetchall()}
+            cursor.execute("SELECT id, organization_id FROM events WHERE deleted_at IS NULL AND id IN (SELECT value FROM json_each(?))", (event_ids,))
+            events = {row['id']: row['organization_id'] for row in cursor.fetchall()}
+            
+            actor = users.get(_int(actor_id))
+            actor_is_staff = bool(actor) and actor['role'] in ('Admin', 'Staff')
+            
+            results = []
+            accepted = {}
+            for index, (user_id, event_id, status, guests) in enumerate(parsed):
+                error_key = None
+                if status not in RSVP_STATUSES:
+                    error_key = "event.invalid_rsvp_status"
+                elif not isinstance(guests, int) or guests < 0:
+                    error_key = "event.invalid_rsvp_guests"
+                elif event_id not in events:
+                    error_key = "event.not_found"
+                elif user_id not in users:
+                    error_key = "user.not_found"
+                elif users[user_id]['organization_id'] != events[event_id]:
+                    error_key = "auth.forbidden"
+                elif user_id != _int(actor_id) and not (actor_is_staff and actor['organization_id'] == events[event_id]):
+                    error_key = "auth.forbidden"
+                
+                results.append({"index": index, "user_id": user_id, "event_id": event_id,
+                                "ok": error_key is None, "error_key": error_key})
+                if error_key is None:
+                    # Last answer wins when the same (event, user) appears twice
+                    accepted[(event_id, user_id)] = (event_id, user_id, status, guests)
+            
+            if accepted:
+                cursor.executemany("""
+                    INSERT INTO event_rsvps (event_id, user_id, status, guests, created_at)
+                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(event_id, user_id) DO UPDATE SET
+                        status = excluded.status,
+                        guests = excluded.guests,
+                        updated_at = CURRENT_TIMESTAMP
+                """, list(accepted.values()))
+                conn.commit()
+                
+                log_audit_event(actor_id, 'RSVP_BULK', 'event', None, {
+                    'saved': len(accepted),
+                    'rejected': sum(1 for r in results if not r['ok']),
+                    'event_ids': sorted({e for e, _ in accepted}),
+                })
+            
+            return {
+                "ok": True,
+                "data": {"saved": len(accepted), "rejected": sum(1 for r in results if not r['ok']), "results": results},
+                "error_key": None
+            }
+    
+    except Exception as e:
+        return {"ok": False, "data": None, "error_key": "internal_error"}
@@ -11,6 +11,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from db import get_db_connection
 from auth.utils import decode_access_token
 from infra.audit_logger import log_audit_event
+from events.core import normalize_target_ids, sync_event_targets
 
 def get_current_user(token):
     payload = decode_access_token(token)
@@ -79,6 +80,8 @@ def create_event(token, title, start_at, end_at, description=None, location=None
             ))
             
             event_id = cursor.lastrowid
+            targets = json.loads(target_ministry_ids)
+            sync_event_targets(cursor, event_id, normalize_target_ids(targets if isinstance(targets, list) else []))
             conn.commit()
             
             # Audit
@@ -44,8 +44,8 @@ def rsvp_action(token, event_id, status):
         # Sqlite UPSERT syntax: INSERT INTO ... ON CONFLICT(pk) DO UPDATE SET ...
         try:
             cursor.execute("""
-                INSERT INTO event_rsvps (event_id, user_id, status)
-                VALUES (?, ?, ?)
+                INSERT INTO event_rsvps (event_id, user_id, status, created_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
                 ON CONFLICT(event_id, user_id) DO UPDATE SET
                     status = excluded.status,
                     updated_at = CURRENT_TIMESTAMP
@@ -0,0 +1,137 @@
+"""
+RSVP engine shared by POST /events/{id}/rsvp and the /rsvp router.
+Storage is event_rsvps only (event_rsvp_counts follows it via triggers); rows are
+mapped straight from sqlite3 tuples to response dicts, with no ORM hydration.
+A user has at most one RSVP per event, so an RSVP's public id is its event_id.
+"""
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import get_db_connection, read_connection
+from events.core import rsvp_event_core
+from infra.audit_logger import log_audit_event
+
+RSVP_STREAM_BATCH = int(os.environ.get('RSVP_STREAM_BATCH', '500'))
+
+# Accepted request statuses (web client vocabulary + app/schemas/rsvp.RSVPStatus) -> stored status
+STATUS_ALIASES = {
+    'going': 'going', 'confirmed': 'going',
+    'maybe': 'maybe',
+    'not_going': 'not_going', 'declined': 'not_going',
+}
+# Stored status -> RSVPStatus in responses
+API_STATUS = {'going': 'confirmed', 'maybe': 'maybe', 'not_going': 'declined'}
+
+RSVP_COLUMNS = "event_id, user_id, status, guests, notes, COALESCE(created_at, updated_at), updated_at"
+
+def rsvp_to_dict(row) -> dict:
+    """(RSVP_COLUMNS tuple) -> RSVPInDB-shaped dict; guests_count counts the member plus guests."""
+    event_id, user_id, status, guests, notes, created_at, updated_at = row
+    return {
+        "id": event_id,
+        "event_id": event_id,
+        "user_id": user_id,
+        "status": API_STATUS[status],
+        "guests_count": (guests or 0) + 1,
+        "notes": notes,
+        "created_at": created_at,
+        "updated_at": updated_at,
+    }
+
+def _tuple_cursor(conn):
+    cursor = conn.cursor()
+    cursor.row_factory = None  # plain tuples, mapped by rsvp_to_dict
+    return cursor
+
+def _fetch_one(conn, event_id: int, user_id: int):
+    return _tuple_cursor(conn).execute(
+        f"SELECT {RSVP_COLUMNS} FROM event_rsvps WHERE event_id = ? AND user_id = ?", (event_id, user_id)
+    ).fetchone()
+
+def save_rsvp_core(user_id: int, event_id: int, status: str, guests_count: int = 1, notes: str = None) -> dict:
+    """
+    Create or update the caller's RSVP (status in either vocabulary, see STATUS_ALIASES).
+    Returns: {"ok": bool, "data": dict|None, "error_key": str|None}
+    """
+    stored = STATUS_ALIASES.get(str(status).lower()) if status is not None else None
+    if stored is None:
+        return {"ok": False, "data": None, "error_key": "event.invalid_rsvp_status"}
+    result = rsvp_event_core(user_id, event_id, stored, max(0, (guests_count or 1) - 1), notes)
+    if not result["ok"]:
+        return result
+    with get_db_connection() as conn:
+        row = _fetch_one(conn, event_id, user_id)
+    return {"ok": True, "data": {**rsvp_to_dict(row), "message": "event.rsvp_saved"}, "error_key": None}
+
+def get_user_event_rsvp_core(user_id: int, event_id: int) -> dict:
+    with get_db_connection() as conn:
+        row = _fetch_one(conn, event_id, user_id)
+    if not row:
+        return {"ok": False, "data": None, "error_key": "event.rsvp_not_found"}
+    return {"ok": True, "data": rsvp_to_dict(row), "error_key": None}
+
+def list_user_rsvps_core(user_id: int) -> dict:
+    with get_db_connection() as conn:
+        rows = _tuple_cursor(conn).execute(
+            f"SELECT {RSVP_COLUMNS} FROM event_rsvps WHERE user_id = ? ORDER BY updated_at DESC", (user_id,)
+        ).fetchall()
+    return {"ok": True, "data": [rsvp_to_dict(row) for row in rows], "error_key": None}
+
+def list_event_rsvps_core(event_id: int) -> dict:
+    with get_db_connection() as conn:
+        rows = _tuple_cursor(conn).execute(
+            f"SELECT {RSVP_COLUMNS} FROM event_rsvps WHERE event_id = ? ORDER BY user_id", (event_id,)
+        ).fetchall()
+    return {"ok": True, "data": [rsvp_to_dict(row) for row in rows], "error_key": None}
+
+def iter_event_rsvps_json(event_id: int, batch_size: int = RSVP_STREAM_BATCH):
+    """
+    Yield an event's attendee list as JSON array chunks, RSVP_STREAM_BATCH rows at a time,
+    so large lists are never materialized. Uses its own connection: streaming runs after
+    the request's UnitOfWork has committed.
+    """
+    with read_connection() as conn:
+        cursor = _tuple_cursor(conn).execute(
+            f"SELECT {RSVP_COLUMNS} FROM event_rsvps WHERE event_id = ? ORDER BY user_id", (event_id,)
+        )
+        try:
+            yield "["
+            first = True
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                chunk = ",".join(json.dumps(rsvp_to_dict(row)) for row in rows)
+                yield chunk if first else "," + chunk
+                first = False
+            yield "]"
+        finally:
+            # A client that disconnects mid-list leaves the statement open; end its read first
+            cursor.close()
+
+def delete_rsvp_core(user_id: int, event_id: int) -> dict:
+    """Withdraw the caller's RSVP for an event (the counters are decremented by trigger)."""
+    with get_db_connection() as conn:
+        cursor = conn.execute("DELETE FROM event_rsvps WHERE event_id = ? AND user_id = ?", (event_id, user_id))
+        conn.commit()
+        if cursor.rowcount == 0:
+            return {"ok": False, "data": None, "error_key": "event.rsvp_not_found"}
+    log_audit_event(user_id, 'RSVP_DELETE', 'event', event_id)
+    return {"ok": True, "data": {"message": "event.rsvp_deleted"}, "error_key": None}
+
+def delete_rsvp_by_id_core(user_id: int, rsvp_id: int) -> dict:
+    """
+    Legacy DELETE /rsvp/{rsvp_id}: `rsvp_id` is the id of one of the caller's ORM-era `rsvps`
+    rows, resolved only through event_rsvps.legacy_rsvp_id (migration 20). RSVPs made since
+    have no such id and are cancelled by event (delete_rsvp_core).
+    """
+    with get_db_connection() as conn:
+        row = conn.execute(
+            "SELECT event_id FROM event_rsvps WHERE legacy_rsvp_id = ? AND user_id = ?", (rsvp_id, user_id)
+        ).fetchone()
+    if not row:
+        return {"ok": False, "data": None, "error_key": "event.rsvp_not_found"}
+    return delete_rsvp_core(user_id, row[0])
@@ -1,22 +1,34 @@
 """
 Core logic for file/audio asset management.
 Handles upload, deletion, and access control for MP3/PDF files.
+Files are stored content-addressed (one blob per SHA-256, shared by duplicate uploads)
+and reference-counted in asset_blobs; collect_garbage_core reclaims unreferenced blobs.
 """
 import os
+import io
+import time
 import hashlib
-import secrets
-from datetime import datetime
+import logging
+import tempfile
+from datetime import datetime, timezone
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from db import get_db_connection
+from db import get_db_connection, after_commit, after_rollback
 from audit import log_audit_event
+from files.signed_urls import sign_asset_token, ASSET_URL_TTL
+
+logger = logging.getLogger(__name__)
 
 # Storage configuration
-STORAGE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "storage", "assets")
+STORAGE_DIR = os.environ.get('ASSET_STORAGE_DIR',
+                             os.path.join(os.path.dirname(os.path.dirname(__file__)), "storage", "assets"))
 MAX_SIZE_MP3 = 20 * 1024 * 1024  # 20MB
 MAX_SIZE_PDF = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_SIZE = int(os.environ.get('UPLOAD_CHUNK_SIZE', str(1024 * 1024)))  # bytes per read
+ASSET_GC_GRACE_DAYS = int(os.environ.get('ASSET_GC_GRACE_DAYS', '30'))  # unreferenced blobs kept this long
+ASSET_STAGED_TTL_HOURS = int(os.environ.get('ASSET_STAGED_TTL_HOURS', '24'))  # staged uploads that never committed
 ALLOWED_MIMES = {
     'audio/mpeg': ('.mp3', MAX_SIZE_MP3),
     'application/pdf': ('.pdf', MAX_SIZE_PDF),
@@ -38,54 +50,145 @@ def calculate_checksum(file_content: bytes) -> str:
     """Calculate SHA256 checksum of file content."""
     return hashlib.sha256(file_content).hexdigest()
 
-def generate_storage_path(extension: str) -> str:
-    """Generate randomized storage path."""
-    random_name = secrets.token_urlsafe(32)
-    return f"{random_name}{extension}"
+def blob_storage_path(checksum: str) -> str:
+    """Content-addressed storage path of a blob: ab/cd/<sha256>."""
+    return f"{checksum[:2]}/{checksum[2:4]}/{checksum}"
 
-def upload_asset_core(uploader_id: int, filename: str, file_content: bytes, mime_type: str) -> dict:
+def receive_stream(stream, max_size: int):
     """
-    Upload a file asset.
-    Returns: {ok, data: {asset_id, message}, error_key}
+    Copy a binary stream into a temp file inside STORAGE_DIR, UPLOAD_CHUNK_SIZE bytes at a
+    time, hashing as it goes; memory use does not depend on the file size.
+    Returns (temp_path, size_bytes, sha256 hex), or None (temp file removed) once the
+    stream passes `max_size`.
+    """
+    ensure_storage_dir()
+    fd, temp_path = tempfile.mkstemp(dir=STORAGE_DIR, prefix=".upload-", suffix=".part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = stream.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+            out.flush()
+            os.fsync(out.fileno())
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    if size > max_size:
+        os.remove(temp_path)
+        return None
+    return temp_path, size, digest.hexdigest()
+
+def stage_asset_upload(stream, mime_type: str) -> dict:
+    """
+    First half of an upload, file I/O only (no DB): check the mime type, then copy, hash
+    and fsync the stream into a temp file (receive_stream) within the type's size limit.
+    Returns: {ok, data: {temp_path, size_bytes, checksum}, error_key}
     """
-    # Validate mime type
     if mime_type not in ALLOWED_MIMES:
         return {"ok": False, "data": None, "error_key": ERR_INVALID_FILE_TYPE}
     
-    extension, max_size = ALLOWED_MIMES[mime_type]
-    
-    # Validate size
-    if len(file_content) > max_size:
+    try:
+        received = receive_stream(stream, ALLOWED_MIMES[mime_type][1])
+    except Exception:
+        logger.exception("Upload staging error")
+        return {"ok": False, "data": None, "error_key": ERR_UPLOAD_FAILED}
+    if received is None:
         return {"ok": False, "data": None, "error_key": ERR_FILE_TOO_LARGE}
-    
-    # Ensure storage directory exists
-    ensure_storage_dir()
-    
-    # Generate storage path and checksum
-    storage_path = generate_storage_path(extension)
-    checksum = calculate_checksum(file_content)
+    temp_path, size_bytes, checksum = received
+    return {"ok": True, "data": {"temp_path": temp_path, "size_bytes": size_bytes, "checksum": checksum},
+            "error_key": None}
+
+def place_staged_blob(temp_path: str, full_path: str) -> bool:
+    """
+    Rename a staged upload into place. Returns False (staged file dropped) when the blob
+    file is already stored.
+    """
+    if os.path.exists(full_path):
+        os.remove(temp_path)
+        return False
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    os.replace(temp_path, full_path)
+    return True
+
+def discard_file(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+
+def gc_trash_path(storage_path: str) -> str:
+    """Where a collected blob file waits (in STORAGE_DIR) for its rows' deletion to commit."""
+    return os.path.join(STORAGE_DIR, f".gc-{os.path.basename(storage_path)}.part")
+
+def restore_blob_files(trashed: list):
+    """Move blob files set aside by a GC pass back into place (its transaction rolled back)."""
+    for trash_path, full_path in trashed:
+        try:
+            os.replace(trash_path, full_path)
+        except OSError:
+            logger.exception("Asset GC restore error (%s)", full_path)
+
+def remove_blob_files(trashed: list):
+    """Unlink blob files set aside by a GC pass, once its transaction has committed."""
+    for trash_path, _ in trashed:
+        try:
+            discard_file(trash_path)
+        except OSError:
+            logger.exception("Asset GC unlink error (%s)", trash_path)  # swept as a stale file later
+
+def register_asset_upload_core(uploader_id: int, filename: str, mime_type: str, staged: dict) -> dict:
+    """
+    Second half of an upload: reference the blob and insert the asset row for a file
+    staged by stage_asset_upload. The file is renamed into STORAGE_DIR before the rows are
+    committed, while the transaction holds the write lock, so a committed row always has its
+    file and a failed rename leaves no row; a blob file this upload placed is removed again
+    if the transaction rolls back.
+    Returns: {ok, data: {asset_id, message}, error_key}
+    """
+    temp_path, size_bytes, checksum = staged['temp_path'], staged['size_bytes'], staged['checksum']
+    storage_path = blob_storage_path(checksum)
+    full_path = os.path.join(STORAGE_DIR, storage_path)
     
     try:
-        # Write file to storage
-        full_path = os.path.join(STORAGE_DIR, storage_path)
-        with open(full_path, 'wb') as f:
-            f.write(file_content)
-        
-        # Insert into database
         with get_db_connection() as conn:
             cursor = conn.cursor()
+            # Once committed, the reference keeps the GC pass away from the blob file; a pass
+            # that removed it earlier also removed its row, which this upsert recreates
+            cursor.execute("""
+                INSERT INTO asset_blobs (checksum, storage_path, size_bytes, ref_count)
+                VALUES (?, ?, ?, 1)
+                ON CONFLICT(checksum) DO UPDATE SET ref_count = ref_count + 1, orphaned_at = NULL
+            """, (checksum, storage_path, size_bytes))
+            
             cursor.execute("""
                 INSERT INTO assets (filename, storage_path, size_bytes, mime_type, checksum, uploaded_by)
                 VALUES (?, ?, ?, ?, ?, ?)
-            """, (filename, storage_path, len(file_content), mime_type, checksum, uploader_id))
+            """, (filename, storage_path, size_bytes, mime_type, checksum, uploader_id))
             asset_id = cursor.lastrowid
-            conn.commit()
+            
+            # The write lock keeps a GC pass from removing the file between here and the commit
+            if place_staged_blob(temp_path, full_path):
+                # Inside a request UnitOfWork the rows commit with the request: undo the placement if it rolls back
+                after_rollback(lambda: discard_file(full_path))
+                try:
+                    conn.commit()
+                except BaseException:
+                    discard_file(full_path)
+                    raise
+            else:
+                conn.commit()
         
         # Audit log
         log_audit_event(
             actor_id=uploader_id,
             action_type="ASSET_UPLOAD",
-            metadata=f"Uploaded {filename} ({mime_type}, {len(file_content)} bytes)"
+            metadata=f"Uploaded {filename} ({mime_type}, {size_bytes} bytes)"
         )
         
         return {
@@ -94,10 +197,29 @@ def upload_asset_core(uploader_id: int, filename: str, file_content: bytes, mime
             "error_key": None
         }
     
-    except Exception as e:
-        print(f"Upload error: {e}")
+    except Exception:
+        logger.exception("Upload error")
+        discard_file(temp_path)
         return {"ok": False, "data": None, "error_key": ERR_UPLOAD_FAILED}
 
+def upload_asset_stream_core(uploader_id: int, filename: str, stream, mime_type: str) -> dict:
+    """
+    Upload a file asset read from a binary stream (anything with .read(n)):
+    stage_asset_upload, then register_asset_upload_core.
+    Returns: {ok, data: {asset_id, message}, error_key}
+    """
+    staged = stage_asset_upload(stream, mime_type)
+    if not staged['ok']:
+        return staged
+    return register_asset_upload_core(uploader_id, filename, mime_type, staged['data'])
+
+def upload_asset_core(uploader_id: int, filename: str, file_content: bytes, mime_type: str) -> dict:
+    """
+    Upload a file asset held in memory (see upload_asset_stream_core).
+    Returns: {ok, data: {asset_id, message}, error_key}
+    """
+    return upload_asset_stream_core(uploader_id, filename, io.BytesIO(file_content), mime_type)
+
 def delete_asset_core(deleter_id: int, asset_id: int) -> dict:
     """
     Soft-delete an asset.
@@ -108,7 +230,7 @@ def delete_asset_core(deleter_id: int, asset_id: int) -> dict:
             cursor = conn.cursor()
             
             # Check if asset exists
-            cursor.execute("SELECT id, filename, deleted_at FROM assets WHERE id = ?", (asset_id,))
+            cursor.execute("SELECT id, filename, storage_path, checksum, deleted_at FROM assets WHERE id = ?", (asset_id,))
             asset = cursor.fetchone()
             
             if not asset:
@@ -121,6 +243,13 @@ def delete_asset_core(deleter_id: int, asset_id: int) -> dict:
             cursor.execute("""
                 UPDATE assets SET deleted_at = CURRENT_TIMESTAMP WHERE id = ?
             """, (asset_id,))
+            # Drop its blob reference; the last one starts the blob's GC grace period
+            cursor.execute("""
+                UPDATE asset_blobs
+                SET ref_count = ref_count - 1,
+                    orphaned_at = CASE WHEN ref_count = 1 THEN CURRENT_TIMESTAMP END
+                WHERE checksum = ? AND storage_path = ? AND ref_count > 0
+            """, (asset['checksum'], asset['storage_path']))
             conn.commit()
         
         # Audit log
@@ -136,21 +265,33 @@ def delete_asset_core(deleter_id: int, asset_id: int) -> dict:
             "error_key": None
         }
     
-    except Exception as e:
-        print(f"Delete error: {e}")
+    except Exception:
+        logger.exception("Delete error")
         return {"ok": False, "data": None, "error_key": ERR_DELETE_FAILED}
 
-def get_asset_path_core(viewer_id: int, asset_id: int) -> dict:
+def log_asset_download(viewer_id: int, asset_id: int, filename: str):
+    """
+    Audit a download. Queued on the batching audit sink even inside a request UnitOfWork:
+    a download changes nothing, so it should not turn the request into a write transaction.
+    """
+    log_audit_event(
+        actor_id=viewer_id,
+        action_type="ASSET_DOWNLOAD",
+        metadata=f"Downloaded asset {asset_id} ({filename})",
+        in_transaction=False
+    )
+
+def get_asset_path_core(viewer_id: int, asset_id: int, log_download: bool = True) -> dict:
     """
     Get file path for asset (for controlled access).
-    Returns: {ok, data: {storage_path, filename, mime_type}, error_key}
+    Returns: {ok, data: {asset_id, storage_path, filename, mime_type, size_bytes, checksum, created_at}, error_key}
     """
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
-                SELECT storage_path, filename, mime_type, deleted_at
+                SELECT storage_path, filename, mime_type, size_bytes, checksum, created_at, deleted_at
                 FROM assets WHERE id = ?
             """, (asset_id,))
             asset = cursor.fetchone()
@@ -158,23 +299,101 @@ def get_asset_path_core(viewer_id: int, asset_id: int) -> dict:
             if not asset or asset['deleted_at']:
                 return {"ok": False, "data": None, "error_key": ERR_NOT_FOUND}
             
-            # Audit log download
-            log_audit_event(
-                actor_id=viewer_id,
-                action_type="ASSET_DOWNLOAD",
-                metadata=f"Downloaded asset {asset_id} ({asset['filename']})"
-            )
+            if log_download:
+                log_asset_download(viewer_id, asset_id, asset['filename'])
             
             return {
                 "ok": True,
                 "data": {
+                    "asset_id": asset_id,
                     "storage_path": asset['storage_path'],
                     "filename": asset['filename'],
-                    "mime_type": asset['mime_type']
+                    "mime_type": asset['mime_type'],
+                    "size_bytes": asset['size_bytes'],
+                    "checksum": asset['checksum'],
+                    "created_at": asset['created_at']
                 },
                 "error_key": None
             }
     
-    except Exception as e:
-        print(f"Get asset error: {e}")
+    except Exception:
+        logger.exception("Get asset error")
+        return {"ok": False, "data": None, "error_key": "internal_error"}
+
+def sign_asset_url_core(viewer_id: int, asset_id: int, ttl: int = ASSET_URL_TTL) -> dict:
+    """
+    Issue a time-limited signed download token for an asset (see files.signed_urls);
+    the download it authorizes needs no DB lookup.
+    Returns: {ok, data: {token, filename, mime_type, expires_at}, error_key}
+    """
+    result = get_asset_path_core(viewer_id, asset_id, log_download=False)
+    if not result['ok']:
+        return result
+    token, expires = sign_asset_token(result['data'], viewer_id, ttl)
+    return {
+        "ok": True,
+        "data": {
+            "token": token,
+            "filename": result['data']['filename'],
+            "mime_type": result['data']['mime_type'],
+            "expires_at": datetime.fromtimestamp(expires, timezone.utc).isoformat()
+        },
+        "error_key": None
+    }
+
+def collect_garbage_core(grace_days: int = ASSET_GC_GRACE_DAYS) -> dict:
+    """
+    Remove the blobs whose last asset reference was soft-deleted more than `grace_days` ago.
+    Their files are moved aside (gc_trash_path) while the transaction deleting the rows holds
+    the write lock, and only unlinked once it has committed; a rollback moves them back. A
+    concurrent upload of the same content either revives the blob before this pass or, not
+    finding the file, stores it anew after it.
+    Also removes staged upload and set-aside GC files older than ASSET_STAGED_TTL_HOURS (a
+    process that died between staging an upload, or a GC pass, and its commit or rollback).
+    Returns: {ok, data: {blobs_removed, bytes_reclaimed, staged_removed}, error_key}
+    """
+    try:
+        trashed = []
+        try:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    DELETE FROM asset_blobs
+                    WHERE ref_count = 0 AND orphaned_at <= datetime('now', ?)
+                    RETURNING storage_path, size_bytes
+                """, (f"-{grace_days} days",))
+                blobs = cursor.fetchall()
+                for blob in blobs:
+                    full_path = os.path.join(STORAGE_DIR, blob['storage_path'])
+                    if os.path.exists(full_path):
+                        trash_path = gc_trash_path(blob['storage_path'])
+                        os.replace(full_path, trash_path)
+                        os.utime(trash_path)  # the stale-file sweep goes by mtime
+                        trashed.append((trash_path, full_path))
+                conn.commit()
+        except BaseException:
+            restore_blob_files(trashed)
+            raise
+        
+        # Inside a request UnitOfWork these wait for the request's outcome (without one the rows are committed)
+        after_rollback(lambda: restore_blob_files(trashed))
+        after_commit(lambda: remove_blob_files(trashed))
+        
+        staged_removed = 0
+        cutoff = time.time() - ASSET_STAGED_TTL_HOURS * 3600
+        for entry in (os.scandir(STORAGE_DIR) if os.path.isdir(STORAGE_DIR) else ()):
+            if (entry.name.startswith(('.upload-', '.gc-')) and entry.name.endswith('.part')
+                    and entry.stat().st_mtime < cutoff):
+                os.remove(entry.path)
+                staged_removed += 1
+        
+        return {
+            "ok": True,
+            "data": {"blobs_removed": len(blobs), "bytes_reclaimed": sum(blob['size_bytes'] for blob in blobs),
+                     "staged_removed": staged_removed},
+            "error_key": None
+        }
+    
+    except Exception:
+        logger.exception("Asset GC error")
         return {"ok": False, "data": None, "error_key": "internal_error"}
@@ -0,0 +1,143 @@
+"""
+HTTP delivery helpers for stored assets: byte ranges (206), conditional requests (304)
+and cache headers. Framework-agnostic: the router maps the results onto responses.
+Stored content never changes (blobs are addressed by their SHA-256), so the checksum is
+a strong ETag and content-addressed assets are cacheable as immutable.
+"""
+import os
+import mmap
+import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from urllib.parse import quote
+
+DOWNLOAD_CHUNK_SIZE = int(os.environ.get('DOWNLOAD_CHUNK_SIZE', str(256 * 1024)))  # bytes per read
+ASSET_CACHE_MAX_AGE = int(os.environ.get('ASSET_CACHE_MAX_AGE', str(365 * 24 * 3600)))  # seconds
+# How bodies are sent: 'mmap' (memory-map slices; handed to the server instead when it offers the
+# ASGI pathsend/zerocopy extension, which uvicorn does not), 'stream' (chunked read() calls) or
+# 'accel' (the reverse proxy sends the file: the zero-copy option behind uvicorn)
+ASSET_SERVE_MODE = os.environ.get('ASSET_SERVE_MODE', 'mmap')
+if ASSET_SERVE_MODE == 'sendfile':
+    ASSET_SERVE_MODE = 'mmap'  # this mode's former name, still accepted
+ASSET_SERVE_MODES = ('mmap', 'stream', 'accel')
+# 'accel' mode: nginx X-Accel-Redirect (or e.g. X-Sendfile) pointing at an internal location mapped to STORAGE_DIR
+ASSET_ACCEL_HEADER = os.environ.get('ASSET_ACCEL_HEADER', 'X-Accel-Redirect')
+ASSET_ACCEL_PREFIX = os.environ.get('ASSET_ACCEL_PREFIX', '/protected-assets/')
+
+UNSATISFIABLE = "unsatisfiable"
+
+def etag_for(checksum):
+    """Strong ETag of an asset, or None for legacy rows without a checksum."""
+    return f'"{checksum}"' if checksum else None
+
+def http_date(value) -> str:
+    """IMF-fixdate of a SQLite timestamp (UTC)."""
+    parsed = datetime.datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return format_datetime(parsed.astimezone(datetime.timezone.utc), usegmt=True)
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison against an If-None-Match list ("*" matches anything)."""
+    candidates = [tag.strip() for tag in header.split(',')]
+    return '*' in candidates or any(tag.removeprefix('W/') == etag for tag in candidates)
+
+def is_not_modified(headers, etag, last_modified) -> bool:
+    """
+    True when the client's copy is current (answer 304). If-None-Match takes precedence
+    over If-Modified-Since, as in RFC 9110.
+    """
+    if_none_match = headers.get('if-none-match')
+    if if_none_match is not None:
+        return etag is not None and _etag_matches(if_none_match, etag)
+    if_modified_since = headers.get('if-modified-since')
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+            modified = parsedate_to_datetime(last_modified)
+        except (TypeError, ValueError):
+            return False
+        return since is not None and modified <= since
+    return False
+
+def parse_range(header, size: int, if_range=None, etag=None, last_modified=None):
+    """
+    Resolve a `Range: bytes=...` header against a file of `size` bytes.
+    Returns (start, end) inclusive, None to send the whole file (no/ignored Range, a
+    stale If-Range, or several ranges) or UNSATISFIABLE (answer 416).
+    """
+    if not header or not header.startswith('bytes='):
+        return None
+    if size <= 0:
+        return UNSATISFIABLE
+    if if_range is not None and if_range != etag and if_range != last_modified:
+        return None
+    spec = header[len('bytes='):].strip()
+    if ',' in spec:
+        return None  # multipart/byteranges is not supported; the full body is a valid answer
+    first, sep, last = spec.partition('-')
+    if not sep:
+        return None
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix <= 0:
+                return UNSATISFIABLE
+            return max(0, size - suffix), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        return UNSATISFIABLE
+    if start < 0 or end < start:
+        return None
+    return start, min(end, size - 1)
+
+def iter_file_range(path: str, start: int = 0, end: int = None, chunk_size: int = DOWNLOAD_CHUNK_SIZE):
+    """Yield bytes start..end (inclusive, default: to EOF) of a file, chunk_size at a time."""
+    with open(path, 'rb') as f:
+        if end is None:
+            end = os.fstat(f.fileno()).st_size - 1
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+def iter_mmap_range(path: str, start: int = 0, end: int = None, chunk_size: int = DOWNLOAD_CHUNK_SIZE):
+    """
+    Like iter_file_range, but slices a read-only memory map of the file: each chunk is copied
+    once, straight from the page cache, with no read() call per chunk.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if end is None:
+            end = size - 1
+        if size == 0 or end < start:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, 'madvise'):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            for offset in range(start, end + 1, chunk_size):
+                yield mapped[offset:min(offset + chunk_size, end + 1)]
+
+def accel_headers(asset: dict) -> dict:
+    """Header telling the reverse proxy to send the stored file itself (ranges included)."""
+    return {ASSET_ACCEL_HEADER: f"{ASSET_ACCEL_PREFIX}{quote(asset['storage_path'])}"}
+
+def asset_headers(asset: dict) -> dict:
+    """Validator, caching and disposition headers shared by 200/206/304 answers."""
+    headers = {"Accept-Ranges": "bytes"}
+    etag = etag_for(asset.get('checksum'))
+    if etag:
+        headers["ETag"] = etag
+        headers["Cache-Control"] = f"private, max-age={ASSET_CACHE_MAX_AGE}, immutable"
+    else:
+        headers["Cache-Control"] = "private, no-cache"
+    if asset.get('created_at'):
+        headers["Last-Modified"] = http_date(asset['created_at'])
+    headers["Content-Disposition"] = f"attachment; filename*=utf-8''{quote(asset['filename'])}"
+    return headers
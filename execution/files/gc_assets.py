@@ -0,0 +1,19 @@
+"""
+Reclaim asset blobs no live asset references anymore (run periodically, e.g. from cron).
+Usage: python gc_assets.py [--grace-days 30]
+"""
+import sys
+import os
+import argparse
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from files.core import collect_garbage_core, ASSET_GC_GRACE_DAYS
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Remove unreferenced asset blobs past their grace period")
+    parser.add_argument("--grace-days", type=int, default=ASSET_GC_GRACE_DAYS)
+
+    args = parser.parse_args()
+    print(json.dumps(collect_garbage_core(args.grace_days)))
@@ -0,0 +1,47 @@
+"""
+Time-limited signed download URLs for assets.
+A token carries everything needed to serve the file (asset id, storage path, mime type,
+size, checksum, filename, upload time), the viewer it was issued to and its expiry,
+HMAC-SHA256 signed with ASSET_URL_SECRET. Verifying it is stateless: no DB lookup.
+"""
+import os
+import hmac
+import time
+import base64
+import hashlib
+
+from auth.tokens import SECRET_KEY
+from infra.cursors import encode_cursor, decode_cursor
+
+# Without its own env var the key is derived from SECRET_KEY, never the JWT key itself, so a
+# download link can't be replayed as (or forged from) anything the JWT key signs
+ASSET_URL_SECRET = (os.environ.get('ASSET_URL_SECRET')
+                    or hmac.new(SECRET_KEY.encode('utf-8'), b'asset-url', hashlib.sha256).hexdigest())
+ASSET_URL_TTL = int(os.environ.get('ASSET_URL_TTL', '3600'))  # seconds
+
+TOKEN_FIELDS = ("asset_id", "storage_path", "mime_type", "size_bytes", "checksum", "filename", "created_at",
+                "viewer_id", "expires")
+
+def _signature(payload: str) -> str:
+    digest = hmac.new(ASSET_URL_SECRET.encode('utf-8'), payload.encode('utf-8'), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).decode('ascii').rstrip('=')
+
+def sign_asset_token(asset: dict, viewer_id: int, ttl: int = ASSET_URL_TTL) -> tuple:
+    """Return (token, expires epoch) for an asset row from get_asset_path_core."""
+    expires = int(time.time()) + ttl
+    claims = {**asset, "viewer_id": viewer_id, "expires": expires}
+    payload = encode_cursor([claims[field] for field in TOKEN_FIELDS])
+    return f"{payload}.{_signature(payload)}", expires
+
+def verify_asset_token(token: str):
+    """Return (claims, None), or (None, error_key) when the token is forged, malformed or expired."""
+    payload, _, signature = (token or "").partition('.')
+    if not payload or not hmac.compare_digest(signature.encode('utf-8'), _signature(payload).encode('ascii')):
+        return None, "files.invalid_link"
+    values = decode_cursor(payload, len(TOKEN_FIELDS))
+    if values is None:
+        return None, "files.invalid_link"
+    claims = dict(zip(TOKEN_FIELDS, values))
+    if claims["expires"] <= time.time():
+        return None, "files.link_expired"
+    return claims, None
@@ -7,7 +7,7 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from files.core import upload_asset_core
+from files.core import upload_asset_stream_core
 from auth.utils import get_user_by_email
 from db import get_db_connection
 
@@ -28,14 +28,6 @@ def main():
         print("Error: User not found")
         sys.exit(1)
     
-    # Read file
-    try:
-        with open(file_path, 'rb') as f:
-            file_content = f.read()
-    except Exception as e:
-        print(f"Error reading file: {e}")
-        sys.exit(1)
-    
     # Determine MIME type from extension
     ext = os.path.splitext(filename)[1].lower()
     mime_map = {
@@ -48,8 +40,13 @@ def main():
         print(f"Error: Unsupported file type {ext}")
         sys.exit(1)
     
-    # Upload
-    result = upload_asset_core(user['id'], filename, file_content, mime_type)
+    # Upload (streamed from disk)
+    try:
+        with open(file_path, 'rb') as f:
+            result = upload_asset_stream_core(user['id'], filename, f, mime_type)
+    except OSError as e:
+        print(f"Error reading file: {e}")
+        sys.exit(1)
     
     if result['ok']:
         print(f"Success: Asset uploaded with ID {result['data']['asset_id']}")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Index advisor.
+Replays every canonical read query registered by the core modules (all filter
+combinations) plus the hand-written lookups below under EXPLAIN QUERY PLAN and
+flags full table scans and temp B-tree sorts.
+
+Usage: python execution/index_advisor.py [--strict]
+  --strict  exit with status 1 when any full table scan is found
+"""
+import sys
+import os
+import json
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from db import get_db_connection
+from infra.query_registry import registered_queries
+
+# Importing the core modules registers their canonical queries
+import events.core
+import announcements.core
+import members.core
+import music_repertoire.core
+
+# Hot lookups issued directly by core modules (not built through the query registry)
+ADVISOR_PROBES = [
+    ("auth.rate_limit_ip", "SELECT count(*) FROM login_attempts WHERE ip_address = ? AND attempted_at > ?"),
+    ("auth.rate_limit_email", "SELECT count(*) FROM login_attempts WHERE email = ? AND attempted_at > ?"),
+    ("auth.prune_attempts", "DELETE FROM login_attempts WHERE attempted_at < ?"),
+    ("auth.login_by_email", "SELECT id, password_hash, role, status FROM users WHERE email = ?"),
+    ("members.viewer", "SELECT role, status FROM users WHERE id = ?"),
+    ("members.ministries", "SELECT ministry_id FROM ministry_assignments WHERE user_id = ? AND deleted_at IS NULL"),
+    ("events.rsvp_event", "SELECT id, organization_id FROM events WHERE id = ?"),
+    ("events.rsvp_list", "SELECT event_id, user_id, status FROM event_rsvps WHERE event_id = ?"),
+    ("files.asset", "SELECT storage_path, filename, mime_type, size_bytes, checksum, created_at, deleted_at FROM assets WHERE id = ?"),
+]
+
+def classify(plan_details: list) -> list:
+    """Return the findings for one query plan."""
+    findings = []
+    for detail in plan_details:
+        if detail.startswith("SCAN ") and "USING" not in detail and "VIRTUAL TABLE" not in detail:
+            findings.append({"kind": "full_scan", "detail": detail})
+        elif detail.startswith("USE TEMP B-TREE"):
+            findings.append({"kind": "temp_sort", "detail": detail})
+    return findings
+
+def explain(conn, sql: str) -> list:
+    rows = conn.execute("EXPLAIN QUERY PLAN " + sql, [None] * sql.count('?')).fetchall()
+    return [row[-1] for row in rows]
+
+def advise() -> list:
+    """One entry per replayed statement: its plan and any findings."""
+    report = []
+    with get_db_connection() as conn:
+        statements = []
+        for query in registered_queries():
+            for key in query.variants():
+                statements.append((f"{query.name}[{','.join(key) or '-'}]", query.sql(key)))
+        statements.extend(ADVISOR_PROBES)
+
+        for name, sql in statements:
+            try:
+                plan = explain(conn, sql)
+            except Exception as e:
+                report.append({"query": name, "sql": sql, "error": str(e), "findings": []})
+                continue
+            report.append({"query": name, "sql": sql, "plan": plan, "findings": classify(plan)})
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Flag full table scans in core queries")
+    parser.add_argument("--strict", action="store_true", help="Exit 1 when a full table scan is found")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args()
+
+    report = advise()
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for entry in report:
+            status = "ERROR" if entry.get("error") else ("WARN " if entry["findings"] else "OK   ")
+            print(f"{status} {entry['query']}")
+            for finding in entry["findings"]:
+                print(f"      {finding['kind']}: {finding['detail']}")
+            if entry.get("error"):
+                print(f"      {entry['error']}")
+
+    full_scans = sum(1 for e in report for f in e["findings"] if f["kind"] == "full_scan")
+    if args.strict and full_scans:
+        sys.exit(1)
@@ -1,23 +1,33 @@
-from db import get_db_connection
+from db import get_db_connection, current_unit_of_work
+from infra.audit_sink import get_audit_sink, write_audit_rows
 import json
-from datetime import datetime
+import logging
+from datetime import datetime, timezone
 
-def log_audit_event(actor_id, action_type, resource_type=None, resource_id=None, metadata=None, ip_address='0.0.0.0'):
+logger = logging.getLogger(__name__)
+
+def log_audit_event(actor_id, action_type, resource_type=None, resource_id=None, metadata=None, ip_address='0.0.0.0',
+                    in_transaction=True):
     """
     Logs a system event to the audit_logs table.
+    Inside a request UnitOfWork the row is written in the same transaction as the domain change;
+    otherwise (or with in_transaction=False, for read-only events) it is queued on the background
+    audit sink and written in batches.
     """
     if isinstance(metadata, dict):
         metadata = json.dumps(metadata)
-        
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO audit_logs (actor_id, action_type, resource_type, resource_id, metadata, ip_address)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (actor_id, action_type, resource_type, str(resource_id) if resource_id else None, metadata, ip_address))
-        conn.commit()
-    
-    print(f"[AUDIT] {action_type} by User {actor_id}")
+
+    # Capture the event time now: the row may be written a few ms later
+    timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    row = (timestamp, actor_id, action_type, resource_type, str(resource_id) if resource_id else None, metadata, ip_address)
+
+    uow = current_unit_of_work()
+    if uow is not None and in_transaction:
+        uow.defer('audit_logs', row, write_audit_rows)
+    else:
+        get_audit_sink().submit(row)
+
+    logger.debug("[AUDIT] %s by User %s", action_type, actor_id)
 
 if __name__ == '__main__':
     # Test logger
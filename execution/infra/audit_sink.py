@@ -0,0 +1,231 @@
+"""
+Background audit sink.
+Collects audit rows in a bounded in-memory queue and writes them to audit_logs
+with executemany, every AUDIT_FLUSH_INTERVAL_MS or every AUDIT_BATCH_SIZE rows.
+"""
+import os
+import json
+import time
+import logging
+import atexit
+import threading
+from collections import deque
+
+from db import get_db_connection, DB_PATH
+
+logger = logging.getLogger(__name__)
+
+# Sink configuration (override via env vars)
+AUDIT_QUEUE_SIZE = int(os.environ.get('AUDIT_QUEUE_SIZE', '10000'))
+AUDIT_BATCH_SIZE = int(os.environ.get('AUDIT_BATCH_SIZE', '200'))
+AUDIT_FLUSH_INTERVAL_MS = int(os.environ.get('AUDIT_FLUSH_INTERVAL_MS', '250'))
+AUDIT_BACKPRESSURE = os.environ.get('AUDIT_BACKPRESSURE', 'block')  # block | drop_oldest | spill
+AUDIT_SPILL_PATH = os.environ.get('AUDIT_SPILL_PATH', DB_PATH + '.audit-spill.jsonl')
+
+BACKPRESSURE_POLICIES = ('block', 'drop_oldest', 'spill')
+
+INSERT_SQL = """
+    INSERT INTO audit_logs (timestamp, actor_id, action_type, resource_type, resource_id, metadata, ip_address)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+def write_audit_rows(conn, rows):
+    """Insert audit row tuples (in INSERT_SQL column order) on an open connection."""
+    conn.executemany(INSERT_SQL, rows)
+
+class AuditSink:
+    """
+    Bounded queue + flusher thread for audit rows.
+    When the queue is full the back-pressure policy decides what happens:
+    - block: the caller waits until the flusher frees space
+    - drop_oldest: the oldest queued row is discarded
+    - spill: the row is appended to a JSONL spill file and replayed after the next successful flush
+    """
+
+    def __init__(self, max_size: int = AUDIT_QUEUE_SIZE, batch_size: int = AUDIT_BATCH_SIZE,
+                 flush_interval_ms: int = AUDIT_FLUSH_INTERVAL_MS, policy: str = AUDIT_BACKPRESSURE,
+                 spill_path: str = AUDIT_SPILL_PATH):
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown audit back-pressure policy: {policy}")
+        self.max_size = max(1, max_size)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval_ms / 1000
+        self.policy = policy
+        self.spill_path = spill_path
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._spill_lock = threading.Lock()
+        self._thread = None
+        self._stopping = False
+        self._atexit_registered = False
+        self._metrics = {
+            "enqueued": 0,
+            "flushed": 0,
+            "dropped": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "blocked": 0,
+            "batches": 0,
+            "flush_errors": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+        }
+
+    def start(self):
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+
+    def submit(self, row: tuple):
+        """Queue one audit row, applying the back-pressure policy when the queue is full."""
+        if self._thread is None:
+            self.start()
+        with self._cond:
+            if len(self._queue) >= self.max_size:
+                if self.policy == 'block':
+                    self._metrics["blocked"] += 1
+                    while len(self._queue) >= self.max_size and not self._stopping:
+                        self._cond.wait()
+                elif self.policy == 'drop_oldest':
+                    self._queue.popleft()
+                    self._metrics["dropped"] += 1
+                else:
+                    self._spill([row])
+                    return
+            self._queue.append(row)
+            self._metrics["enqueued"] += 1
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            deadline = time.monotonic() + self.flush_interval
+            with self._cond:
+                while len(self._queue) < self.batch_size and not self._stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = [self._queue.popleft() for _ in range(min(len(self._queue), self.batch_size))]
+                stopping = self._stopping
+                # Wake producers blocked on a full queue
+                self._cond.notify_all()
+
+            flushed = self._flush(batch) if batch else True
+            if flushed:
+                self._replay_spill()
+
+            if stopping:
+                with self._cond:
+                    if flushed and self._queue:
+                        continue
+                    if self._queue:
+                        # Database unavailable at shutdown: keep the rows on disk for the next run
+                        self._spill(list(self._queue))
+                        self._queue.clear()
+                    return
+
+    def _flush(self, batch: list) -> bool:
+        started = time.monotonic()
+        try:
+            with get_db_connection() as conn:
+                write_audit_rows(conn, batch)
+                conn.commit()
+        except Exception:
+            logger.exception("Audit flush error (%d rows)", len(batch))
+            with self._cond:
+                self._metrics["flush_errors"] += 1
+                if self.policy == 'spill':
+                    self._spill(batch)
+                else:
+                    # Keep the rows and retry them on the next tick
+                    self._queue.extendleft(reversed(batch))
+            if not self._stopping:
+                time.sleep(self.flush_interval)
+            return False
+
+        elapsed_ms = (time.monotonic() - started) * 1000
+        with self._cond:
+            self._metrics["flushed"] += len(batch)
+            self._metrics["batches"] += 1
+            self._metrics["last_flush_ms"] = elapsed_ms
+            self._metrics["total_flush_ms"] += elapsed_ms
+            self._metrics["max_flush_ms"] = max(self._metrics["max_flush_ms"], elapsed_ms)
+        return True
+
+    def _spill(self, rows: list):
+        with self._spill_lock:
+            with open(self.spill_path, 'a', encoding='utf-8') as f:
+                for row in rows:
+                    f.write(json.dumps(row) + "\n")
+        self._metrics["spilled"] += len(rows)
+
+    def _replay_spill(self):
+        replay_path = self.spill_path + '.replay'
+        with self._spill_lock:
+            if not os.path.exists(replay_path):
+                if not os.path.exists(self.spill_path):
+                    return
+                os.replace(self.spill_path, replay_path)
+        with open(replay_path, encoding='utf-8') as f:
+            rows = [tuple(json.loads(line)) for line in f if line.strip()]
+        try:
+            with get_db_connection() as conn:
+                write_audit_rows(conn, rows)
+                conn.commit()
+        except Exception:
+            logger.exception("Audit spill replay error (%d rows)", len(rows))
+            return
+        os.remove(replay_path)
+        with self._cond:
+            self._metrics["replayed"] += len(rows)
+
+    def stop(self, timeout: float = 10.0):
+        """Flush everything still queued and stop the flusher thread."""
+        with self._cond:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stopping = True
+            self._cond.notify_all()
+        thread.join(timeout)
+        with self._cond:
+            self._thread = None
+
+    def stats(self) -> dict:
+        with self._cond:
+            batches = self._metrics["batches"]
+            return {
+                "queue_depth": len(self._queue),
+                "max_size": self.max_size,
+                "policy": self.policy,
+                "avg_flush_ms": (self._metrics["total_flush_ms"] / batches) if batches else 0.0,
+                **self._metrics,
+            }
+
+_sink = None
+_sink_lock = threading.Lock()
+
+def get_audit_sink() -> AuditSink:
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                _sink = AuditSink()
+    return _sink
+
+def audit_sink_stats() -> dict:
+    """Queue depth and flush-latency metrics of the background audit sink."""
+    return get_audit_sink().stats()
+
+def shutdown_audit_sink():
+    """Flush pending audit rows (call on application shutdown)."""
+    if _sink is not None:
+        _sink.stop()
@@ -0,0 +1,25 @@
+"""
+Opaque keyset-pagination cursors.
+A cursor is the sort key of the last row on a page (e.g. [start_at, id]),
+JSON-encoded and base64url'd so clients treat it as an opaque token.
+"""
+import json
+import base64
+import binascii
+
+def encode_cursor(values) -> str:
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(token: str, size: int):
+    """Return the cursor's values as a tuple, or None when the token is malformed."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        return None
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    return tuple(values)
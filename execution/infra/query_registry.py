@@ -0,0 +1,140 @@
+"""
+Canonical statements for dynamically filtered read paths.
+Each CanonicalQuery produces exactly one SQL text per combination of optional
+filters, so SQLite's per-connection statement cache (sqlite3 `cached_statements`)
+keeps a small, fixed set of prepared statements hot instead of thrashing on
+ad-hoc string concatenation.
+"""
+import threading
+import itertools
+from collections import OrderedDict
+
+from db import STATEMENT_CACHE_SIZE
+
+_registry = OrderedDict()
+_registry_lock = threading.Lock()
+
+class CanonicalQuery:
+    """
+    A read path whose SQL text depends only on which optional filters are set.
+    - base: SELECT ... WHERE <always-on predicates>
+    - filters: ordered (name, fragment) pairs; a fragment is ANDed in when its filter value is not None.
+      A tuple value binds one item per `?`; any other value is bound to every `?` in the fragment
+      (fragments without `?` are flags: pass True).
+    - suffix: ORDER BY / LIMIT text
+    Placeholders in `base` are bound from `head`, those in `suffix` from `tail`.
+    """
+
+    def __init__(self, name: str, base: str, filters: list = None, suffix: str = ""):
+        self.name = name
+        self.base = base.strip()
+        self.filters = list(filters or [])
+        self.suffix = suffix
+        self._sql = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def key(self, values: dict) -> tuple:
+        return tuple(name for name, _ in self.filters if values.get(name) is not None)
+
+    def sql(self, key: tuple) -> str:
+        sql = self._sql.get(key)
+        if sql is None:
+            active = set(key)
+            parts = [self.base] + [fragment for name, fragment in self.filters if name in active]
+            sql = " AND ".join(parts) + self.suffix
+            self._sql[key] = sql
+        return sql
+
+    def variants(self) -> list:
+        """Every filter combination this query can produce, as variant keys."""
+        names = [name for name, _ in self.filters]
+        return [tuple(name for name, on in zip(names, flags) if on)
+                for flags in itertools.product((False, True), repeat=len(names))]
+
+    def bind(self, values: dict, head=(), tail=()):
+        """Return (variant key, canonical sql, params) for the given filter values."""
+        key = self.key(values)
+        params = list(head)
+        for name, fragment in self.filters:
+            if name in key:
+                value = values[name]
+                if isinstance(value, tuple):
+                    params.extend(value)
+                else:
+                    params.extend([value] * fragment.count('?'))
+        params.extend(tail)
+        return key, self.sql(key), params
+
+    def execute(self, conn, values: dict = None, head=(), tail=()):
+        key, sql, params = self.bind(values or {}, head, tail)
+        hit = _touch_statement_cache(conn, sql)
+        with self._lock:
+            stats = self._stats.setdefault(key, {"executions": 0, "hits": 0})
+            stats["executions"] += 1
+            stats["hits"] += 1 if hit else 0
+        return conn.execute(sql, params)
+
+    def report(self, conn=None) -> list:
+        """Per-variant hit rate, plus EXPLAIN QUERY PLAN when a connection is given."""
+        with self._lock:
+            variants = [(key, dict(stats)) for key, stats in self._stats.items()]
+        rows = []
+        for key, stats in variants:
+            sql = self.sql(key)
+            entry = {
+                "query": self.name,
+                "filters": list(key),
+                "sql": sql,
+                "executions": stats["executions"],
+                "hits": stats["hits"],
+                "hit_rate": round(stats["hits"] / stats["executions"], 4) if stats["executions"] else 0.0,
+            }
+            if conn is not None:
+                try:
+                    plan = conn.execute("EXPLAIN QUERY PLAN " + sql, [None] * sql.count('?')).fetchall()
+                    entry["plan"] = [row[-1] for row in plan]
+                except Exception as e:
+                    entry["plan_error"] = str(e)
+            rows.append(entry)
+        return rows
+
+def _touch_statement_cache(conn, sql: str) -> bool:
+    """
+    Mirror of the connection's statement LRU (same capacity as `cached_statements`).
+    Returns True when the statement was already prepared on this connection.
+    Approximate: statements executed outside the registry also occupy sqlite3's cache.
+    """
+    lru = getattr(conn, 'statement_lru', None)
+    if lru is None:
+        try:
+            lru = conn.statement_lru = OrderedDict()
+        except AttributeError:
+            return False
+    if sql in lru:
+        lru.move_to_end(sql)
+        return True
+    lru[sql] = True
+    if len(lru) > STATEMENT_CACHE_SIZE:
+        lru.popitem(last=False)
+    return False
+
+def register_query(name: str, base: str, filters: list = None, suffix: str = "") -> CanonicalQuery:
+    with _registry_lock:
+        query = _registry.get(name)
+        if query is None:
+            query = _registry[name] = CanonicalQuery(name, base, filters, suffix)
+        return query
+
+def registered_queries() -> list:
+    with _registry_lock:
+        return list(_registry.values())
+
+def query_report(conn=None) -> list:
+    """Hit rate (and optionally query plans) for every canonical statement executed so far."""
+    with _registry_lock:
+        queries = list(_registry.values())
+    report = []
+    for query in queries:
+        report.extend(query.report(conn))
+    return report
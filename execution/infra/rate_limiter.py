@@ -0,0 +1,260 @@
+"""
+In-process sliding-window rate limiter.
+Each limiter keeps, per key, the timestamps of its recent hits. Keys are spread
+over RATE_LIMIT_SHARDS independently locked shards so concurrent checks for
+different IPs/accounts do not contend on one lock. With RATE_LIMIT_PERSIST=true
+the hits are snapshotted to SQLite (rate_limit_hits) so limits survive restarts.
+Only hits that can still change a decision are kept: at most `limit` per key.
+"""
+import os
+import time
+import zlib
+import atexit
+import logging
+import threading
+from collections import deque
+
+from db import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+# Limiter configuration (override via env vars)
+RATE_LIMIT_SHARDS = int(os.environ.get('RATE_LIMIT_SHARDS', '16'))
+RATE_LIMIT_PERSIST = os.environ.get('RATE_LIMIT_PERSIST', 'false').lower() == 'true'
+RATE_LIMIT_SNAPSHOT_INTERVAL = int(os.environ.get('RATE_LIMIT_SNAPSHOT_INTERVAL', '30'))  # seconds
+
+# Expired keys are swept from a shard every this many hits on it
+PRUNE_EVERY = 1024
+
+class _Shard:
+    __slots__ = ("lock", "hits", "ops")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = {}
+        self.ops = 0
+
+class SlidingWindowLimiter:
+    """
+    At most `limit` hits per key within any `window_seconds` span.
+    - check(*keys): True when every key is under its limit (counted as one allowed/blocked decision)
+    - hit(*keys): record a hit (e.g. a failed login) for each key
+    - acquire(key): check + hit atomically for one key (request throttling); returns (allowed, retry_after)
+    """
+
+    def __init__(self, name: str, limit: int, window_seconds: float, shards: int = RATE_LIMIT_SHARDS):
+        self.name = name
+        self.limit = limit
+        self.window = window_seconds
+        self._shards = [_Shard() for _ in range(max(1, shards))]
+        self._counter_lock = threading.Lock()
+        self._counters = {"allowed": 0, "blocked": 0, "hits": 0}
+
+    def _hits(self, shard: _Shard, key: str) -> deque:
+        """The hit deque of `key`, created on first use (caller holds the shard lock)."""
+        hits = shard.hits.get(key)
+        if hits is None:
+            # Hits older than the newest `limit` never change a decision
+            hits = shard.hits[key] = deque(maxlen=max(1, self.limit))
+        return hits
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[zlib.crc32(key.encode('utf-8')) % len(self._shards)]
+
+    def _live(self, shard: _Shard, key: str, now: float):
+        """Hits of `key` inside the window (caller holds the shard lock)."""
+        hits = shard.hits.get(key)
+        if hits is None:
+            return None
+        cutoff = now - self.window
+        while hits and hits[0] <= cutoff:
+            hits.popleft()
+        if not hits:
+            del shard.hits[key]
+            return None
+        return hits
+
+    def _count(self, name: str):
+        with self._counter_lock:
+            self._counters[name] += 1
+
+    def count(self, key: str, now: float = None) -> int:
+        now = time.time() if now is None else now
+        shard = self._shard(key)
+        with shard.lock:
+            hits = self._live(shard, key, now)
+            return len(hits) if hits else 0
+
+    def check(self, *keys, now: float = None) -> bool:
+        now = time.time() if now is None else now
+        allowed = all(self.count(key, now) < self.limit for key in keys if key)
+        self._count("allowed" if allowed else "blocked")
+        return allowed
+
+    def hit(self, *keys, now: float = None):
+        now = time.time() if now is None else now
+        for key in keys:
+            if not key:
+                continue
+            shard = self._shard(key)
+            with shard.lock:
+                self._hits(shard, key).append(now)
+                self._after_hit(shard, now)
+            self._count("hits")
+
+    def acquire(self, key: str, now: float = None):
+        now = time.time() if now is None else now
+        shard = self._shard(key)
+        with shard.lock:
+            hits = self._live(shard, key, now)
+            if hits is not None and len(hits) >= self.limit:
+                retry_after = hits[0] + self.window - now
+                allowed = False
+            else:
+                self._hits(shard, key).append(now)
+                self._after_hit(shard, now)
+                retry_after = 0.0
+                allowed = True
+        self._count("allowed" if allowed else "blocked")
+        return allowed, retry_after
+
+    def _after_hit(self, shard: _Shard, now: float):
+        shard.ops += 1
+        if shard.ops % PRUNE_EVERY == 0:
+            for key in list(shard.hits):
+                self._live(shard, key, now)
+
+    def reset(self, *keys):
+        """Forget the hits of the given keys (all keys when none are given)."""
+        for shard in self._shards:
+            with shard.lock:
+                if not keys:
+                    shard.hits.clear()
+                    continue
+                for key in keys:
+                    shard.hits.pop(key, None)
+
+    def snapshot(self, now: float = None) -> list:
+        """(key, hit_at) pairs still inside the window."""
+        now = time.time() if now is None else now
+        rows = []
+        for shard in self._shards:
+            with shard.lock:
+                for key in list(shard.hits):
+                    hits = self._live(shard, key, now)
+                    if hits:
+                        rows.extend((key, hit_at) for hit_at in hits)
+        return rows
+
+    def restore(self, rows, now: float = None):
+        """Merge persisted (key, hit_at) pairs with the live hits, keeping each key's hits in time order."""
+        now = time.time() if now is None else now
+        cutoff = now - self.window
+        by_key = {}
+        for key, hit_at in rows:
+            if hit_at > cutoff:
+                by_key.setdefault(key, []).append(hit_at)
+        for key, restored in by_key.items():
+            shard = self._shard(key)
+            with shard.lock:
+                hits = self._hits(shard, key)
+                merged = sorted([*hits, *restored])
+                hits.clear()
+                hits.extend(merged)  # maxlen keeps the newest `limit`
+
+    def stats(self) -> dict:
+        keys = 0
+        for shard in self._shards:
+            with shard.lock:
+                keys += len(shard.hits)
+        with self._counter_lock:
+            counters = dict(self._counters)
+        return {"limit": self.limit, "window_seconds": self.window, "shards": len(self._shards), "keys": keys, **counters}
+
+_limiters = {}
+_pending_restore = {}
+_registry_lock = threading.Lock()
+_snapshot_thread = None
+_snapshot_stop = threading.Event()
+_snapshot_loaded = False
+
+def get_limiter(name: str, limit: int, window_seconds: float) -> SlidingWindowLimiter:
+    """Return the named limiter, creating it on first use."""
+    with _registry_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = _limiters[name] = SlidingWindowLimiter(name, limit, window_seconds)
+            rows = _pending_restore.pop(name, None)
+            if rows:
+                limiter.restore(rows)
+        return limiter
+
+def rate_limiter_stats() -> dict:
+    """Allowed/blocked decision counters and live key counts per limiter."""
+    with _registry_lock:
+        limiters = list(_limiters.values())
+    return {
+        "persist": RATE_LIMIT_PERSIST,
+        "limiters": {limiter.name: limiter.stats() for limiter in limiters},
+    }
+
+def save_snapshot():
+    """Replace the persisted hits with the current in-window hits of every limiter."""
+    with _registry_lock:
+        limiters = list(_limiters.values())
+    rows = [(limiter.name, key, hit_at) for limiter in limiters for key, hit_at in limiter.snapshot()]
+    with get_db_connection() as conn:
+        conn.execute("DELETE FROM rate_limit_hits")
+        conn.executemany("INSERT INTO rate_limit_hits (limiter, key, hit_at) VALUES (?, ?, ?)", rows)
+        conn.commit()
+
+def snapshot_loaded() -> bool:
+    """True once this process has restored the persisted hits (load_snapshot with RATE_LIMIT_PERSIST=true)."""
+    return _snapshot_loaded
+
+def load_snapshot():
+    """Restore persisted hits (limiters created later pick theirs up on creation) and start the snapshot thread."""
+    global _snapshot_thread, _snapshot_loaded
+    if not RATE_LIMIT_PERSIST:
+        return
+    with get_db_connection() as conn:
+        rows = conn.execute("SELECT limiter, key, hit_at FROM rate_limit_hits").fetchall()
+    by_name = {}
+    for name, key, hit_at in rows:
+        by_name.setdefault(name, []).append((key, hit_at))
+    with _registry_lock:
+        for name, hits in by_name.items():
+            limiter = _limiters.get(name)
+            if limiter is not None:
+                limiter.restore(hits)
+            else:
+                _pending_restore[name] = hits
+        _snapshot_loaded = True
+        if _snapshot_thread is None:
+            _snapshot_stop.clear()
+            _snapshot_thread = threading.Thread(target=_snapshot_loop, name="rate-limit-snapshot", daemon=True)
+            _snapshot_thread.start()
+            atexit.register(shutdown_rate_limiter)
+
+def _snapshot_loop():
+    while not _snapshot_stop.wait(RATE_LIMIT_SNAPSHOT_INTERVAL):
+        try:
+            save_snapshot()
+        except Exception:
+            logger.exception("Rate limit snapshot error")
+
+def shutdown_rate_limiter():
+    """Stop the snapshot thread and persist a final snapshot (call on application shutdown)."""
+    global _snapshot_thread, _snapshot_loaded
+    with _registry_lock:
+        thread = _snapshot_thread
+        _snapshot_thread = None
+        _snapshot_loaded = False
+    if thread is None:
+        return
+    _snapshot_stop.set()
+    thread.join(5)
+    try:
+        save_snapshot()
+    except Exception:
+        logger.exception("Rate limit snapshot error")
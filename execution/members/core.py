@@ -3,58 +3,140 @@ Core members business logic (importable, no argparse).
 """
 import sys
 import os
+import re
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from db import get_db_connection
 from infra.audit_logger import log_audit_event
+from infra.query_registry import register_query
+from infra.cursors import encode_cursor, decode_cursor
+from announcements.fanout import enqueue_fanout
 
-def get_directory_core(viewer_id: int, page: int = 1, limit: int = 20, search: str = None, offset: int = None) -> dict:
+# Column sets per viewer class, chosen before querying: member viewers never read other
+# members' address, full date of birth or unshared phone (each `?` is the viewer's id).
+DIRECTORY_PROJECTIONS = {
+    "admin": """
+        u.id, u.email, u.role, u.status,
+        p.full_name, p.phone, p.address, p.dob, p.bio, p.profile_pic_url
+    """,
+    "member": """
+        u.id, u.email, p.full_name, p.bio, p.profile_pic_url,
+        CASE WHEN p.share_phone OR u.id = ? THEN p.phone END AS phone,
+        CASE WHEN u.id = ? THEN p.address END AS address,
+        CASE WHEN u.id = ? THEN p.dob WHEN length(p.dob) = 10 THEN substr(p.dob, 6) END AS dob
+    """,
+}
+PROJECTION_PARAMS = {"admin": 0, "member": 3}
+
+# Search weights favour name over email over bio
+MEMBER_RANK = "bm25(member_search, 10.0, 5.0, 1.0)"
+
+def _register_directory(projection: str):
+    columns = DIRECTORY_PROJECTIONS[projection]
+    # Browsing: one organization's profiles in idx_member_profiles_org_name order, keyset on (name, id)
+    browse = register_query(
+        f"members.directory.{projection}",
+        f"""
+        SELECT {columns}, COALESCE(p.full_name, '') AS sort_key
+        FROM member_profiles p
+        JOIN users u ON u.id = p.user_id
+        WHERE p.organization_id = ? AND u.deleted_at IS NULL
+        """,
+        [("after", "(COALESCE(p.full_name, ''), p.user_id) > (?, ?)")],
+        " ORDER BY COALESCE(p.full_name, ''), p.user_id LIMIT ? OFFSET ?",
+    )
+    # Searching: the organization's member_search (FTS5) matches ranked by bm25, keyset on
+    # (score, id). The page is cut inside the FTS subquery so only `limit` rows are joined.
+    search = register_query(
+        f"members.directory_search.{projection}",
+        f"""
+        SELECT {columns}, s.score AS sort_key
+        FROM (
+            SELECT rowid AS id, {MEMBER_RANK} AS score
+            FROM member_search WHERE member_search MATCH ? AND organization_id = ?
+        """,
+        [("after", f"({MEMBER_RANK}, rowid) > (?, ?)")],
+        """ ORDER BY score, id LIMIT ? OFFSET ?
+        ) s
+        JOIN users u ON u.id = s.id
+        LEFT JOIN member_profiles p ON u.id = p.user_id
+        WHERE u.deleted_at IS NULL
+        ORDER BY s.score, s.id""",
+    )
+    return browse, search
+
+DIRECTORY_QUERIES = {projection: _register_directory(projection) for projection in DIRECTORY_PROJECTIONS}
+
+MAX_SEARCH_TERMS = 8
+
+def search_match(search: str):
+    """
+    FTS5 MATCH expression for a search-box string: every word becomes a quoted prefix
+    term, all required ("jo sil" -> "jo"* "sil"*). None when there is nothing to search.
     """
-    Core directory listing logic.
+    terms = re.findall(r"\w+", search or "")[:MAX_SEARCH_TERMS]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+def _decode_after(cursor: str, searching: bool):
+    values = decode_cursor(cursor, 2)
+    if values is None or not isinstance(values[1], int):
+        return None
+    key_type = (int, float) if searching else str
+    if isinstance(values[0], bool) or not isinstance(values[0], key_type):
+        return None
+    return values
+
+def get_directory_core(viewer_id: int, page: int = 1, limit: int = 20, search: str = None, offset: int = None,
+                       cursor: str = None) -> dict:
+    """
+    Core directory listing logic, scoped to the viewer's organization.
+    With `search`, members whose name, email or bio contain words starting with the search
+    terms (accent-insensitive), best bm25 match first; otherwise alphabetical.
+    Pass data.next_cursor back as `cursor` for the next page (offset/page are ignored then).
     Returns: {"ok": bool, "data": dict|None, "error_key": str|None}
     """
+    match = search_match(search)
+    after = None
+    if cursor:
+        after = _decode_after(cursor, match is not None)
+        if after is None:
+            return {"ok": False, "data": None, "error_key": "members.invalid_cursor"}
+    
     with get_db_connection() as conn:
         cursor = conn.cursor()
         
         # Get viewer info
-        cursor.execute("SELECT role, status FROM users WHERE id = ?", (viewer_id,))
+        cursor.execute("SELECT role, status, organization_id FROM users WHERE id = ?", (viewer_id,))
         viewer = cursor.fetchone()
         
         if not viewer or viewer['status'] != 'Active':
             return {"ok": False, "data": None, "error_key": "auth.account_pending"}
         
-        viewer_role = viewer['role']
+        projection = "admin" if viewer['role'] in ('Admin', 'Staff') else "member"
+        browse_query, search_query = DIRECTORY_QUERIES[projection]
+        head = [viewer_id] * PROJECTION_PARAMS[projection]
         
         # Calculate offset
-        if offset is None:
+        if after is not None:
+            offset = 0
+        elif offset is None:
             offset = (page - 1) * limit
         
-        # Query members
-        query = """
-            SELECT u.id, u.email, u.role, u.status,
-                   p.full_name, p.phone, p.address, p.dob, p.bio, p.share_phone, p.profile_pic_url
-            FROM users u
-            LEFT JOIN member_profiles p ON u.id = p.user_id
-            WHERE u.deleted_at IS NULL
-        """
-        params = []
-        
-        if search:
-            query += " AND (p.full_name LIKE ? OR u.email LIKE ?)"
-            params.extend([f"%{search}%", f"%{search}%"])
-        
-        query += " ORDER BY p.full_name ASC LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
-        
-        cursor.execute(query, params)
+        # Query members (one extra row tells whether there is a next page)
+        if match is not None:
+            cursor = search_query.execute(conn, {"after": after}, head=head + [match, viewer['organization_id']],
+                                          tail=[limit + 1, offset])
+        else:
+            cursor = browse_query.execute(conn, {"after": after}, head=head + [viewer['organization_id']],
+                                          tail=[limit + 1, offset])
         rows = cursor.fetchall()
+        next_cursor = encode_cursor([rows[limit - 1]['sort_key'], rows[limit - 1]['id']]) if len(rows) > limit else None
         
         results = []
-        for row in rows:
-            is_self = (row['id'] == viewer_id)
-            is_admin = (viewer_role in ('Admin', 'Staff'))
-            
+        for row in rows[:limit]:
             member = {
                 "id": row['id'],
                 "full_name": row['full_name'],
@@ -63,26 +145,20 @@ def get_directory_core(viewer_id: int, page: int = 1, limit: int = 20, search: s
                 "profile_pic_url": row['profile_pic_url']
             }
             
-            # Phone visibility
-            if is_admin or is_self or row['share_phone']:
+            if projection == "admin":
                 member['phone'] = row['phone']
-            
-            # Address (PII - Admin/Self only)
-            if is_admin or is_self:
                 member['address'] = row['address']
-            
-            # DOB masking
-            if row['dob']:
-                if is_admin or is_self:
+                if row['dob']:
                     member['dob'] = row['dob']
-                else:
-                    parts = row['dob'].split('-')
-                    if len(parts) == 3:
-                        member['dob'] = f"{parts[1]}-{parts[2]}"
+            else:
+                # Hidden fields come back NULL from the member projection
+                for field in ('phone', 'address', 'dob'):
+                    if row[field] is not None:
+                        member[field] = row[field]
             
             results.append(member)
         
-        return {"ok": True, "data": {"results": results, "page": page, "limit": limit, "offset": offset}, "error_key": None}
+        return {"ok": True, "data": {"results": results, "page": page, "limit": limit, "offset": offset, "next_cursor": next_cursor}, "error_key": None}
 
 def update_profile_core(user_id: int, updates: dict) -> dict:
     """
@@ -139,8 +215,30 @@ def assign_ministry_core(admin_id: int, user_id: int, ministry_id: int, role: st
             
             log_audit_event(admin_id, 'MINISTRY_ASSIGN', 'ministry_assignment', cursor.lastrowid,
                           {'user_id': user_id, 'ministry_id': ministry_id})
+            enqueue_fanout("ministry_backfill", user_id, ministry_id)
             
             return {"ok": True, "data": {"message": "ministry.assigned"}, "error_key": None}
     
     except Exception as e:
         return {"ok": False, "data": None, "error_key": "internal_error"}
+
+def unassign_ministry_core(admin_id: int, user_id: int, ministry_id: int) -> dict:
+    """
+    Core ministry removal logic (soft delete of the member's assignments to the ministry).
+    Returns: {"ok": bool, "data": dict|None, "error_key": str|None}
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE ministry_assignments SET deleted_at = CURRENT_TIMESTAMP
+            WHERE user_id = ? AND ministry_id = ? AND deleted_at IS NULL
+        """, (user_id, ministry_id))
+        if cursor.rowcount == 0:
+            return {"ok": False, "data": None, "error_key": "ministry.assignment_not_found"}
+        conn.commit()
+    
+    log_audit_event(admin_id, 'MINISTRY_UNASSIGN', 'ministry_assignment', None,
+                  {'user_id': user_id, 'ministry_id': ministry_id})
+    enqueue_fanout("ministry_remove", user_id, ministry_id)
+    
+    return {"ok": True, "data": {"message": "ministry.unassigned"}, "error_key": None}
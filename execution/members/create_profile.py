@@ -34,25 +34,28 @@ def create_profile(admin_id, email, full_name, password=None, phone=None, addres
             # Check Admin Permissions (if admin_id provided)
             # For now assuming script usage implies admin or system privilege if not using token
             # But let's check if admin_id is valid admin
+            # The member joins the admin's organization (fallback to default org 1, as in register_user_core)
+            org_id = 1
             if admin_id:
-                cursor.execute("SELECT role FROM users WHERE id = ?", (admin_id,))
+                cursor.execute("SELECT role, organization_id FROM users WHERE id = ?", (admin_id,))
                 res = cursor.fetchone()
                 if not res or res[0] not in ('Admin', 'Staff'):
                      print(json.dumps({"error": "auth.forbidden"}))
                      return False
+                org_id = res[1] or org_id
 
             # Insert User
             cursor.execute("""
-                INSERT INTO users (email, password_hash, role, status)
-                VALUES (?, ?, ?, ?)
-            """, (email, pwd_hash, role, status))
+                INSERT INTO users (email, password_hash, role, status, organization_id)
+                VALUES (?, ?, ?, ?, ?)
+            """, (email, pwd_hash, role, status, org_id))
             user_id = cursor.lastrowid
             
             # Insert Profile
             cursor.execute("""
-                INSERT INTO member_profiles (user_id, full_name, phone, address, dob)
-                VALUES (?, ?, ?, ?, ?)
-            """, (user_id, full_name, phone, address, dob))
+                INSERT INTO member_profiles (user_id, full_name, phone, address, dob, organization_id)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (user_id, full_name, phone, address, dob, org_id))
             
             conn.commit()
             
@@ -9,6 +9,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from db import get_db_connection
 from auth.utils import decode_access_token
+from members.core import search_match
 
 def get_current_user(token):
     payload = decode_access_token(token)
@@ -57,12 +58,15 @@ def get_directory(token, page=1, limit=20, search=None):
             FROM users u
             LEFT JOIN member_profiles p ON u.id = p.user_id
             WHERE u.deleted_at IS NULL
+            AND u.organization_id = (SELECT organization_id FROM users WHERE id = ?)
         """
-        params = []
+        params = [viewer_id]
         
-        if search:
-            query += " AND (p.full_name LIKE ? OR u.email LIKE ?)"
-            params.extend([f"%{search}%", f"%{search}%"])
+        match = search_match(search)
+        if match:
+            # Full-text index (accent-insensitive prefix match), see members.core
+            query += " AND u.id IN (SELECT rowid FROM member_search WHERE member_search MATCH ?)"
+            params.append(match)
             
         query += " ORDER BY p.full_name ASC LIMIT ? OFFSET ?"
         params.extend([limit, offset])
@@ -0,0 +1,761 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations.
+Replaces the hand-run setup_database / update_schema_* / add_multi_tenancy scripts.
+
+Each migration is an idempotent up-step (CREATE ... IF NOT EXISTS, add_column checks
+the existing columns) applied inside its own transaction; applied versions are
+recorded in `schema_version`, so running the migrator twice is a no-op.
+
+Usage: python execution/migrations.py [--status]
+"""
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from db import get_db_connection, init_db_file
+
+MIGRATIONS = []
+
+def migration(version: int, name: str):
+    """Register an up-step. Versions must be unique and increasing."""
+    def register(fn):
+        MIGRATIONS.append((version, name, fn))
+        return fn
+    return register
+
+def column_exists(cursor, table: str, column: str) -> bool:
+    cursor.execute(f"PRAGMA table_info({table})")
+    return any(row[1] == column for row in cursor.fetchall())
+
+def add_column(cursor, table: str, column: str, decl: str):
+    """ALTER TABLE ... ADD COLUMN only when the column is missing."""
+    if not column_exists(cursor, table, column):
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+@migration(1, "core auth tables")
+def _core_tables(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            role TEXT DEFAULT 'Pending',
+            status TEXT DEFAULT 'Pending',
+            language_pref TEXT DEFAULT 'pt-BR',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            deleted_at TIMESTAMP,
+            CHECK (status IN ('Pending', 'Active', 'Banned'))
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_status ON users(status)")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS member_profiles (
+            user_id INTEGER PRIMARY KEY,
+            full_name TEXT,
+            phone TEXT,
+            address TEXT,
+            dob DATE,
+            baptism_date DATE,
+            bio TEXT,
+            ministry_history TEXT,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ministries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            description TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            deleted_at TIMESTAMP
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ministry_assignments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            ministry_id INTEGER NOT NULL,
+            role TEXT,
+            is_lead BOOLEAN DEFAULT 0,
+            assigned_by INTEGER,
+            start_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            deleted_at TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id),
+            FOREIGN KEY (ministry_id) REFERENCES ministries(id)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_assignments_user ON ministry_assignments(user_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_assignments_ministry ON ministry_assignments(ministry_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_assignments_lead ON ministry_assignments(is_lead)")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS audit_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            actor_id INTEGER,
+            action_type TEXT NOT NULL,
+            resource_type TEXT,
+            resource_id TEXT,
+            metadata TEXT, -- JSON blob
+            ip_address TEXT
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_actor_time ON audit_logs(actor_id, timestamp)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_resource ON audit_logs(resource_type, resource_id)")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            message TEXT NOT NULL,
+            is_read BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_notifications_user_read ON notifications(user_id, is_read)")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS password_resets (
+            token TEXT PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            expires_at TIMESTAMP NOT NULL,
+            is_used BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_password_resets_user ON password_resets(user_id)")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS domain_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_id TEXT UNIQUE NOT NULL, -- UUID
+            event_type TEXT NOT NULL,
+            payload TEXT,
+            status TEXT DEFAULT 'PENDING',
+            processed_at TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_status ON domain_events(status)")
+
+@migration(2, "member profile picture and phone sharing")
+def _member_profile_columns(cursor):
+    add_column(cursor, "member_profiles", "profile_pic_url", "TEXT")
+    add_column(cursor, "member_profiles", "share_phone", "BOOLEAN DEFAULT 0")
+
+@migration(3, "announcements")
+def _announcements(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS announcements (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            body TEXT,
+            target_type TEXT CHECK(target_type IN ('Global', 'Role', 'Ministry')),
+            target_id TEXT, -- Null if Global, Role Name, or Ministry ID
+            is_pinned BOOLEAN DEFAULT 0,
+            expires_at TIMESTAMP,
+            created_by INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            deleted_at TIMESTAMP,
+            FOREIGN KEY (created_by) REFERENCES users(id)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_announcements_expiry ON announcements(expires_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_announcements_target ON announcements(target_type, target_id)")
+
+@migration(4, "events and rsvps")
+def _events(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT,
+            start_at TIMESTAMP NOT NULL,
+            end_at TIMESTAMP NOT NULL,
+            location TEXT,
+            is_public BOOLEAN DEFAULT 0,
+            rsvp_required BOOLEAN DEFAULT 0,
+            target_ministry_ids TEXT DEFAULT '[]', -- JSON Array
+            created_by INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            deleted_at TIMESTAMP,
+            FOREIGN KEY (created_by) REFERENCES users(id),
+            CONSTRAINT check_event_dates CHECK (end_at > start_at)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_start_at ON events(start_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_public_start ON events(is_public, start_at)")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS event_rsvps (
+            event_id INTEGER,
+            user_id INTEGER,
+            status TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (event_id, user_id),
+            FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+            CONSTRAINT check_rsvp_status CHECK (status IN ('going', 'maybe', 'not_going'))
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_rsvps_user ON event_rsvps(user_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_rsvps_event ON event_rsvps(event_id)")
+
+@migration(5, "worship file assets")
+def _assets(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS assets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            filename TEXT NOT NULL,
+            storage_path TEXT NOT NULL UNIQUE,
+            size_bytes INTEGER NOT NULL,
+            mime_type TEXT NOT NULL,
+            checksum TEXT,
+            uploaded_by INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            deleted_at TIMESTAMP,
+            FOREIGN KEY (uploaded_by) REFERENCES users(id)
+        )
+    """)
+
+@migration(6, "music repertoire")
+def _repertoire(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS songs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            artist TEXT,
+            bpm INTEGER,
+            default_key TEXT,
+            created_by INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            deleted_at TIMESTAMP,
+            FOREIGN KEY (created_by) REFERENCES users(id)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS instrument_tags (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            key TEXT NOT NULL UNIQUE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS song_assets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            song_id INTEGER NOT NULL,
+            type TEXT NOT NULL CHECK (type IN ('LINK', 'FILE')),
+            url TEXT,
+            asset_id INTEGER,
+            label TEXT,
+            instrument_tag_ids TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            deleted_at TIMESTAMP,
+            FOREIGN KEY (song_id) REFERENCES songs(id),
+            FOREIGN KEY (asset_id) REFERENCES assets(id)
+        )
+    """)
+
+@migration(7, "music scheduling")
+def _scheduling(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS service_plans (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date DATE NOT NULL,
+            event_id INTEGER,
+            notes TEXT,
+            created_by INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            deleted_at TIMESTAMP,
+            FOREIGN KEY (event_id) REFERENCES events(id),
+            FOREIGN KEY (created_by) REFERENCES users(id)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS service_setlist (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            plan_id INTEGER NOT NULL,
+            song_id INTEGER NOT NULL,
+            order_index INTEGER NOT NULL,
+            FOREIGN KEY (plan_id) REFERENCES service_plans(id),
+            FOREIGN KEY (song_id) REFERENCES songs(id)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS roster_entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            plan_id INTEGER NOT NULL,
+            musician_id INTEGER NOT NULL,
+            instrument TEXT NOT NULL,
+            status TEXT DEFAULT 'pending' CHECK (status IN ('pending', 'confirmed', 'declined')),
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (plan_id) REFERENCES service_plans(id),
+            FOREIGN KEY (musician_id) REFERENCES users(id)
+        )
+    """)
+
+@migration(8, "multi-tenancy")
+def _multi_tenancy(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS organizations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            slug TEXT UNIQUE NOT NULL,
+            email TEXT,
+            phone TEXT,
+            address TEXT,
+            city TEXT,
+            state TEXT,
+            country TEXT DEFAULT 'Brazil',
+            website TEXT,
+            logo_url TEXT,
+            description TEXT,
+            founded_year INTEGER,
+            is_active BOOLEAN DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            deleted_at TIMESTAMP
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_org_slug ON organizations(slug)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_org_active ON organizations(is_active)")
+
+    tenant_tables = ["users", "events", "announcements", "songs", "member_profiles"]
+    for table in tenant_tables:
+        add_column(cursor, table, "organization_id", "INTEGER REFERENCES organizations(id)")
+
+    # Default organization (PIBG) owns every pre-existing row
+    cursor.execute("""
+        INSERT OR IGNORE INTO organizations
+        (id, name, slug, email, phone, city, country, description, is_active)
+        VALUES (1, 'PIBG - Primeira Igreja Brasileira de Greenville', 'pibg-greenville',
+               'contato@pibg.church', '+1-864-555-0123', 'Greenville', 'USA',
+               'Primeira Igreja Brasileira de Greenville', 1)
+    """)
+    for table in tenant_tables:
+        cursor.execute(f"UPDATE {table} SET organization_id = 1 WHERE organization_id IS NULL")
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_org ON users(organization_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_org ON events(organization_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_announcements_org ON announcements(organization_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_songs_org ON songs(organization_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_members_org ON member_profiles(organization_id)")
+
+@migration(9, "composite indexes for tenant calendar, feed and login-failure lookups")
+def _composite_indexes(cursor):
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_org_deleted_start ON events(organization_id, deleted_at, start_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_announcements_org_deleted_expires ON announcements(organization_id, deleted_at, expires_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_action_ip_time ON audit_logs(action_type, ip_address, timestamp)")
+
+@migration(10, "login attempts for rate limiting")
+def _login_attempts(cursor):
+    # Login failures keyed by columns instead of LIKE over audit_logs.metadata;
+    # rows older than LOGIN_ATTEMPT_TTL_MINUTES are pruned by auth.utils.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS login_attempts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ip_address TEXT,
+            email TEXT,
+            attempted_at TIMESTAMP NOT NULL
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_login_attempts_ip_time ON login_attempts(ip_address, attempted_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_login_attempts_email_time ON login_attempts(email, attempted_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_login_attempts_time ON login_attempts(attempted_at)")
+
+@migration(11, "rate limiter snapshot")
+def _rate_limit_hits(cursor):
+    # Written by infra.rate_limiter when RATE_LIMIT_PERSIST=true; replaced wholesale on each snapshot
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS rate_limit_hits (
+            limiter TEXT NOT NULL,
+            key TEXT NOT NULL,
+            hit_at REAL NOT NULL
+        )
+    """)
+
+@migration(12, "normalized event targets")
+def _event_targets(cursor):
+    # One row per (event, target ministry); replaces parsing events.target_ministry_ids on reads
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS event_targets (
+            event_id INTEGER NOT NULL,
+            ministry_id INTEGER NOT NULL,
+            PRIMARY KEY (event_id, ministry_id),
+            FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE,
+            FOREIGN KEY (ministry_id) REFERENCES ministries(id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_event_targets_ministry ON event_targets(ministry_id, event_id)")
+    cursor.execute("""
+        INSERT OR IGNORE INTO event_targets (event_id, ministry_id)
+        SELECT e.id, CAST(j.value AS INTEGER)
+        FROM events e,
+             json_each(CASE WHEN json_valid(e.target_ministry_ids) THEN e.target_ministry_ids ELSE '[]' END) j
+        WHERE e.deleted_at IS NULL AND CAST(j.value AS INTEGER) > 0
+    """)
+
+@migration(13, "materialized rsvp counters")
+def _rsvp_counts(cursor):
+    add_column(cursor, "event_rsvps", "guests", "INTEGER NOT NULL DEFAULT 0")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS event_rsvp_counts (
+            event_id INTEGER PRIMARY KEY,
+            going INTEGER NOT NULL DEFAULT 0,
+            maybe INTEGER NOT NULL DEFAULT 0,
+            not_going INTEGER NOT NULL DEFAULT 0,
+            guests INTEGER NOT NULL DEFAULT 0, -- extra guests of 'going' RSVPs
+            FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE
+        )
+    """)
+    cursor.execute("DELETE FROM event_rsvp_counts")
+    cursor.execute("""
+        INSERT INTO event_rsvp_counts (event_id, going, maybe, not_going, guests)
+        SELECT event_id,
+               sum(status = 'going'), sum(status = 'maybe'), sum(status = 'not_going'),
+               sum(CASE WHEN status = 'going' THEN guests ELSE 0 END)
+        FROM event_rsvps GROUP BY event_id
+    """)
+    # Counters follow every write to event_rsvps in the writer's own transaction
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_rsvp_counts_insert AFTER INSERT ON event_rsvps BEGIN
+            -- NOT EXISTS rather than OR IGNORE: an UPSERT's conflict policy overrides the trigger's
+            INSERT INTO event_rsvp_counts (event_id)
+                SELECT NEW.event_id WHERE NOT EXISTS (SELECT 1 FROM event_rsvp_counts WHERE event_id = NEW.event_id);
+            UPDATE event_rsvp_counts SET
+                going = going + (NEW.status = 'going'),
+                maybe = maybe + (NEW.status = 'maybe'),
+                not_going = not_going + (NEW.status = 'not_going'),
+                guests = guests + CASE WHEN NEW.status = 'going' THEN NEW.guests ELSE 0 END
+            WHERE event_id = NEW.event_id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_rsvp_counts_delete AFTER DELETE ON event_rsvps BEGIN
+            UPDATE event_rsvp_counts SET
+                going = going - (OLD.status = 'going'),
+                maybe = maybe - (OLD.status = 'maybe'),
+                not_going = not_going - (OLD.status = 'not_going'),
+                guests = guests - CASE WHEN OLD.status = 'going' THEN OLD.guests ELSE 0 END
+            WHERE event_id = OLD.event_id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_rsvp_counts_update AFTER UPDATE OF event_id, status, guests ON event_rsvps BEGIN
+            UPDATE event_rsvp_counts SET
+                going = going - (OLD.status = 'going'),
+                maybe = maybe - (OLD.status = 'maybe'),
+                not_going = not_going - (OLD.status = 'not_going'),
+                guests = guests - CASE WHEN OLD.status = 'going' THEN OLD.guests ELSE 0 END
+            WHERE event_id = OLD.event_id;
+            INSERT INTO event_rsvp_counts (event_id)
+                SELECT NEW.event_id WHERE NOT EXISTS (SELECT 1 FROM event_rsvp_counts WHERE event_id = NEW.event_id);
+            UPDATE event_rsvp_counts SET
+                going = going + (NEW.status = 'going'),
+                maybe = maybe + (NEW.status = 'maybe'),
+                not_going = not_going + (NEW.status = 'not_going'),
+                guests = guests + CASE WHEN NEW.status = 'going' THEN NEW.guests ELSE 0 END
+            WHERE event_id = NEW.event_id;
+        END
+    """)
+
+@migration(14, "single rsvp store")
+def _single_rsvp_store(cursor):
+    # event_rsvps becomes the only RSVP table; the ORM-era `rsvps` rows are folded into it
+    add_column(cursor, "event_rsvps", "notes", "TEXT")
+    add_column(cursor, "event_rsvps", "created_at", "TIMESTAMP")
+    cursor.execute("UPDATE event_rsvps SET created_at = updated_at WHERE created_at IS NULL")
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'rsvps'")
+    if cursor.fetchone():
+        cursor.execute("""
+            INSERT INTO event_rsvps (event_id, user_id, status, guests, notes, created_at, updated_at)
+            SELECT event_id, user_id,
+                   CASE lower(status) WHEN 'confirmed' THEN 'going' WHEN 'declined' THEN 'not_going' ELSE 'maybe' END,
+                   max(coalesce(guests_count, 1) - 1, 0), notes, created_at, updated_at
+            FROM rsvps r
+            WHERE event_id IN (SELECT id FROM events) AND user_id IN (SELECT id FROM users)
+              AND lower(status) != 'pending'
+              AND r.id = (SELECT r2.id FROM rsvps r2 WHERE r2.event_id = r.event_id AND r2.user_id = r.user_id
+                          ORDER BY r2.updated_at DESC, r2.id DESC LIMIT 1)
+            ON CONFLICT(event_id, user_id) DO NOTHING
+        """)
+
+@migration(15, "announcement inbox")
+def _announcement_inbox(cursor):
+    # Fan-out-on-write feed rows, filled by announcements.fanout for organizations with feed_fanout = 'write'
+    add_column(cursor, "organizations", "feed_fanout", "TEXT DEFAULT 'read'")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS announcement_inbox (
+            user_id INTEGER NOT NULL,
+            announcement_id INTEGER NOT NULL,
+            is_pinned BOOLEAN NOT NULL DEFAULT 0,
+            created_at TIMESTAMP,
+            expires_at TIMESTAMP,
+            PRIMARY KEY (user_id, announcement_id),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+            FOREIGN KEY (announcement_id) REFERENCES announcements(id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_inbox_feed
+        ON announcement_inbox(user_id, is_pinned DESC, created_at DESC, announcement_id DESC)
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_inbox_announcement ON announcement_inbox(announcement_id)")
+
+@migration(16, "covering announcement feed index")
+def _announcement_feed_index(cursor):
+    # Serves the pinned-first feed and its keyset cursor without a sort; the trailing columns make it covering
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_announcements_feed
+        ON announcements(organization_id, deleted_at, is_pinned, created_at, id, expires_at, target_type, target_id)
+    """)
+    cursor.execute("DROP INDEX IF EXISTS idx_announcements_org_deleted_expires")
+
+@migration(17, "member directory full-text search")
+def _member_search(cursor):
+    # One FTS5 row per live user (rowid = users.id); unicode61 folds case and diacritics ("João" ~ "joao")
+    refresh = """
+        DELETE FROM member_search WHERE rowid = {uid};
+        INSERT INTO member_search (rowid, full_name, email, bio)
+        SELECT u.id, p.full_name, u.email, p.bio
+        FROM users u LEFT JOIN member_profiles p ON p.user_id = u.id
+        WHERE u.id = {uid} AND u.deleted_at IS NULL;
+    """
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS member_search USING fts5(
+            full_name, email, bio,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+    triggers = {
+        "trg_member_search_user_insert": ("AFTER INSERT ON users", "NEW.id"),
+        "trg_member_search_user_update": ("AFTER UPDATE OF email, deleted_at ON users", "NEW.id"),
+        "trg_member_search_profile_insert": ("AFTER INSERT ON member_profiles", "NEW.user_id"),
+        "trg_member_search_profile_update": ("AFTER UPDATE OF full_name, bio ON member_profiles", "NEW.user_id"),
+        "trg_member_search_profile_delete": ("AFTER DELETE ON member_profiles", "OLD.user_id"),
+    }
+    for name, (event, uid) in triggers.items():
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {name} {event}
+            BEGIN
+                {refresh.format(uid=uid)}
+            END
+        """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_member_search_user_delete AFTER DELETE ON users
+        BEGIN
+            DELETE FROM member_search WHERE rowid = OLD.id;
+        END
+    """)
+    cursor.execute("DELETE FROM member_search")
+    cursor.execute("""
+        INSERT INTO member_search (rowid, full_name, email, bio)
+        SELECT u.id, p.full_name, u.email, p.bio
+        FROM users u LEFT JOIN member_profiles p ON p.user_id = u.id
+        WHERE u.deleted_at IS NULL
+    """)
+
+@migration(18, "tenant-scoped member directory")
+def _tenant_directory(cursor):
+    # Directory pages are read in (organization, name) order straight off this index.
+    # users.deleted_at lives on the other side of the join, so it is checked per row via the users PK.
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_member_profiles_org_name
+        ON member_profiles(organization_id, COALESCE(full_name, ''), user_id)
+    """)
+    # member_search gains the tenant (UNINDEXED: filtered per match, not tokenized)
+    for name in ("user_insert", "user_update", "user_delete", "profile_insert", "profile_update", "profile_delete"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS trg_member_search_{name}")
+    cursor.execute("DROP TABLE IF EXISTS member_search")
+    cursor.execute("""
+        CREATE VIRTUAL TABLE member_search USING fts5(
+            full_name, email, bio,
+            organization_id UNINDEXED,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+    refresh = """
+        DELETE FROM member_search WHERE rowid = {uid};
+        INSERT INTO member_search (rowid, full_name, email, bio, organization_id)
+        SELECT u.id, p.full_name, u.email, p.bio, u.organization_id
+        FROM users u LEFT JOIN member_profiles p ON p.user_id = u.id
+        WHERE u.id = {uid} AND u.deleted_at IS NULL;
+    """
+    triggers = {
+        "trg_member_search_user_insert": ("AFTER INSERT ON users", "NEW.id"),
+        "trg_member_search_user_update": ("AFTER UPDATE OF email, deleted_at, organization_id ON users", "NEW.id"),
+        "trg_member_search_profile_insert": ("AFTER INSERT ON member_profiles", "NEW.user_id"),
+        "trg_member_search_profile_update": ("AFTER UPDATE OF full_name, bio ON member_profiles", "NEW.user_id"),
+        "trg_member_search_profile_delete": ("AFTER DELETE ON member_profiles", "OLD.user_id"),
+    }
+    for name, (event, uid) in triggers.items():
+        cursor.execute(f"""
+            CREATE TRIGGER {name} {event}
+            BEGIN
+                {refresh.format(uid=uid)}
+            END
+        """)
+    cursor.execute("""
+        CREATE TRIGGER trg_member_search_user_delete AFTER DELETE ON users
+        BEGIN
+            DELETE FROM member_search WHERE rowid = OLD.id;
+        END
+    """)
+    cursor.execute("""
+        INSERT INTO member_search (rowid, full_name, email, bio, organization_id)
+        SELECT u.id, p.full_name, u.email, p.bio, u.organization_id
+        FROM users u LEFT JOIN member_profiles p ON p.user_id = u.id
+        WHERE u.deleted_at IS NULL
+    """)
+
+@migration(19, "content-addressed asset blobs")
+def _asset_blobs(cursor):
+    # Uploads are stored once per content (storage_path = ab/cd/<sha256>) and shared by every
+    # asset row with that checksum, so assets.storage_path can no longer be UNIQUE: rebuild it.
+    cursor.execute("""
+        CREATE TABLE assets_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            filename TEXT NOT NULL,
+            storage_path TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            mime_type TEXT NOT NULL,
+            checksum TEXT,
+            uploaded_by INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            deleted_at TIMESTAMP,
+            FOREIGN KEY (uploaded_by) REFERENCES users(id)
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO assets_new (id, filename, storage_path, size_bytes, mime_type, checksum, uploaded_by, created_at, deleted_at)
+        SELECT id, filename, storage_path, size_bytes, mime_type, checksum, uploaded_by, created_at, deleted_at FROM assets
+    """)
+    cursor.execute("DROP TABLE assets")
+    cursor.execute("ALTER TABLE assets_new RENAME TO assets")
+    # One row per stored blob; ref_count = live (not soft-deleted) assets pointing at it.
+    # orphaned_at is set when the count drops to 0 and starts the GC grace period.
+    # Files uploaded before this migration keep their random names and are not tracked here.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS asset_blobs (
+            checksum TEXT PRIMARY KEY,
+            storage_path TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            ref_count INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            orphaned_at TIMESTAMP
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_asset_blobs_orphaned ON asset_blobs(orphaned_at) WHERE ref_count = 0")
+
+@migration(20, "legacy rsvp ids")
+def _legacy_rsvp_ids(cursor):
+    # The deprecated DELETE /rsvp/{rsvp_id} takes ORM-era `rsvps` ids only; map each folded RSVP
+    # to the id of the row migration 14 took it from, so that id space never mixes with event ids
+    add_column(cursor, "event_rsvps", "legacy_rsvp_id", "INTEGER")
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'rsvps'")
+    if cursor.fetchone():
+        cursor.execute("""
+            UPDATE event_rsvps SET legacy_rsvp_id = (
+                SELECT r.id FROM rsvps r WHERE r.event_id = event_rsvps.event_id AND r.user_id = event_rsvps.user_id
+                ORDER BY r.updated_at DESC, r.id DESC LIMIT 1
+            )
+            WHERE legacy_rsvp_id IS NULL
+        """)
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_event_rsvps_legacy_id
+        ON event_rsvps(legacy_rsvp_id) WHERE legacy_rsvp_id IS NOT NULL
+    """)
+
+@migration(21, "announcement feed version")
+def _announcement_feed_version(cursor):
+    # Bumped by every write to announcements, in the writer's own transaction (API, CLI scripts or
+    # another worker alike); cached feeds built at an older version are rebuilt (announcements.feed_cache)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS announcement_feed_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO announcement_feed_version (id, version) VALUES (1, 0)")
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_announcement_feed_version_{event.lower()} AFTER {event} ON announcements
+            BEGIN
+                UPDATE announcement_feed_version SET version = version + 1 WHERE id = 1;
+            END
+        """)
+
+def ensure_version_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+def applied_versions(conn) -> set:
+    cursor = conn.cursor()
+    ensure_version_table(cursor)
+    conn.commit()
+    cursor.execute("SELECT version FROM schema_version")
+    return {row[0] for row in cursor.fetchall()}
+
+def current_version() -> int:
+    with get_db_connection() as conn:
+        versions = applied_versions(conn)
+    return max(versions) if versions else 0
+
+def migrate(target: int = None, verbose: bool = True) -> list:
+    """Apply every pending migration up to `target` (default: latest). Returns the applied versions."""
+    init_db_file()
+    applied = []
+    with get_db_connection() as conn:
+        done = applied_versions(conn)
+        for version, name, step in sorted(MIGRATIONS):
+            if version in done or (target is not None and version > target):
+                continue
+            cursor = conn.cursor()
+            try:
+                conn.execute("BEGIN")
+                step(cursor)
+                cursor.execute("INSERT INTO schema_version (version, name) VALUES (?, ?)", (version, name))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            applied.append(version)
+            if verbose:
+                print(f"[OK] {version:03d} {name}")
+    return applied
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply schema migrations")
+    parser.add_argument("--status", action="store_true", help="Show applied/pending migrations and exit")
+    parser.add_argument("--target", type=int, help="Migrate up to this version")
+    args = parser.parse_args()
+
+    if args.status:
+        with get_db_connection() as conn:
+            done = applied_versions(conn)
+        for version, name, _ in sorted(MIGRATIONS):
+            print(f"{'applied' if version in done else 'pending'}  {version:03d} {name}")
+    else:
+        applied = migrate(args.target)
+        print(f"Schema at version {current_version()} ({len(applied)} migration(s) applied)")
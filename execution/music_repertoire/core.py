@@ -10,12 +10,20 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from db import get_db_connection
 from audit import log_audit_event
+from infra.query_registry import register_query
 
 # Error keys
 ERR_SONG_NOT_FOUND = "song.not_found"
 ERR_INVALID_ASSET_TYPE = "song.invalid_asset_type"
 ERR_ASSET_NOT_FOUND = "song.asset_not_found"
 
+LIST_SONGS_QUERY = register_query(
+    "songs.list",
+    "SELECT * FROM songs WHERE deleted_at IS NULL",
+    [("search", "(title LIKE ? OR artist LIKE ?)")],
+    " ORDER BY title ASC LIMIT ? OFFSET ?",
+)
+
 def create_song_core(creator_id: int, title: str, artist: str = None, bpm: int = None, default_key: str = None) -> dict:
     """Create a new song in the repertoire."""
     try:
@@ -81,19 +89,9 @@ def list_songs_core(viewer_id: int, search: str = None, limit: int = 50, offset:
     try:
         with get_db_connection() as conn:
             conn.row_factory = lambda cursor, row: dict(zip([col[0] for col in cursor.description], row))
-            cursor = conn.cursor()
-            
-            query = "SELECT * FROM songs WHERE deleted_at IS NULL"
-            params = []
-            
-            if search:
-                query += " AND (title LIKE ? OR artist LIKE ?)"
-                params.extend([f"%{search}%", f"%{search}%"])
-            
-            query += " ORDER BY title ASC LIMIT ? OFFSET ?"
-            params.extend([limit, offset])
-            
-            cursor.execute(query, params)
+            cursor = LIST_SONGS_QUERY.execute(conn, {
+                "search": f"%{search}%" if search else None,
+            }, tail=[limit, offset])
             songs = cursor.fetchall()
             
             return {
@@ -12,9 +12,11 @@ def reset_limits():
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     try:
-        cursor.execute("DELETE FROM audit_logs WHERE action_type = 'AUTH_LOGIN_FAIL'")
-        conn.commit()
+        cursor.execute("DELETE FROM login_attempts")
         print(f"Deleted {cursor.rowcount} rows.")
+        # Persisted in-memory limiter state (RATE_LIMIT_PERSIST); a running API keeps its own until restart
+        cursor.execute("DELETE FROM rate_limit_hits")
+        conn.commit()
     except Exception as e:
         print(e)
     conn.close()
@@ -47,13 +47,7 @@ if __name__ == '__main__':
     print("╚" + "="*58 + "╝")
     
     scripts = [
-        'setup_database',  # Core auth tables
-        'update_schema_members',  # Member profiles
-        'update_schema_announcements',  # Announcements
-        'update_schema_events',  # Events
-        'update_schema_worship_files',  # Worship files
-        'update_schema_worship_repertoire',  # Songs
-        'update_schema_worship_schedule',  # Schedule
+        'migrations',  # Versioned schema (all tables and indexes)
         'seed_pibg_data',  # Populate with test data
     ]
     
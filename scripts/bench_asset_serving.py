@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark: throughput of the asset-serving paths, writing each body into a local
+socket drained by another thread (as a server writes to a client):
+- fileresponse: Starlette's FileResponse driven through ASGI (the previous download path)
+- stream:       chunked read() calls (files.delivery.iter_file_range, ASSET_SERVE_MODE=stream)
+- mmap:         memory-map slices (iter_mmap_range), called directly
+- response:     FileRangeResponse driven through ASGI with no extensions advertised, i.e.
+                ASSET_SERVE_MODE=mmap as uvicorn runs it (mmap slices on the threadpool)
+- sendfile:     os.sendfile from the file to the socket. Not a path this app can take behind
+                uvicorn; it is the reference for ASSET_SERVE_MODE=accel (nginx sends the file)
+                and for servers implementing the ASGI pathsend/zerocopy extensions
+Reports MB/s and CPU seconds per GB served (serving side only; the drain thread's CPU
+is subtracted). Modes needing Starlette or os.sendfile are skipped when unavailable.
+
+Usage: python scripts/bench_asset_serving.py [--size-mb 20] [--repeat 20]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import tempfile
+import threading
+import time
+import json
+
+from bench_common import summarize
+
+from files.delivery import iter_file_range, iter_mmap_range, DOWNLOAD_CHUNK_SIZE
+
+class Drain:
+    """Socket pair whose far end is read and discarded by a background thread."""
+
+    def __init__(self):
+        self.out, self._in = socket.socketpair()
+        self.cpu = 0.0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        buffer = bytearray(1024 * 1024)
+        while self._in.recv_into(buffer):
+            self.cpu = time.thread_time()
+
+    def close(self):
+        self.out.close()
+        self._thread.join()
+        self._in.close()
+
+def serve_chunks(chunks, sock):
+    for chunk in chunks:
+        sock.sendall(chunk)
+
+def serve_sendfile(path, sock):
+    with open(path, 'rb') as f:
+        offset, remaining = 0, os.fstat(f.fileno()).st_size
+        while remaining > 0:
+            sent = os.sendfile(sock.fileno(), f.fileno(), offset, remaining)
+            if sent == 0:
+                break
+            offset += sent
+            remaining -= sent
+
+def serve_asgi(response, sock):
+    """Run an ASGI response the way a server without send extensions would, writing its body to sock."""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            sock.sendall(message["body"])
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [], "extensions": {}}
+    asyncio.run(response(scope, receive, send))
+
+def make_fileresponse_server():
+    try:
+        from starlette.responses import FileResponse
+    except ImportError:
+        return None
+    return lambda path, sock: serve_asgi(FileResponse(path, media_type="audio/mpeg"), sock)
+
+def make_response_server():
+    try:
+        from app.core.file_response import FileRangeResponse
+    except ImportError:
+        return None
+    return lambda path, sock: serve_asgi(
+        FileRangeResponse(path, 0, os.path.getsize(path) - 1, media_type="audio/mpeg"), sock)
+
+def main():
+    parser = argparse.ArgumentParser(description="Asset serving throughput benchmark")
+    parser.add_argument("--size-mb", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    size = args.size_mb * 1024 * 1024
+    fd, path = tempfile.mkstemp(prefix='church_bench_asset_', suffix='.mp3')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(os.urandom(size))
+
+    modes = []
+    fileresponse = make_fileresponse_server()
+    if fileresponse is None:
+        print(json.dumps({"mode": "fileresponse", "skipped": "starlette not installed"}))
+    else:
+        modes.append(("fileresponse", fileresponse))
+    modes.append(("stream", lambda p, sock: serve_chunks(iter_file_range(p), sock)))
+    modes.append(("mmap", lambda p, sock: serve_chunks(iter_mmap_range(p), sock)))
+    response = make_response_server()
+    if response is None:
+        print(json.dumps({"mode": "response", "skipped": "fastapi not installed"}))
+    else:
+        modes.append(("response", response))
+    if hasattr(os, 'sendfile'):
+        modes.append(("sendfile", serve_sendfile))
+    else:
+        print(json.dumps({"mode": "sendfile", "skipped": "os.sendfile not available"}))
+
+    try:
+        for mode, serve in modes:
+            drain = Drain()
+            serve(path, drain.out)  # warm up (page cache, imports)
+            timings = []
+            wall_started, cpu_started, drain_started = time.perf_counter(), time.process_time(), drain.cpu
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                serve(path, drain.out)
+                timings.append((time.perf_counter() - started) * 1000)
+            wall = time.perf_counter() - wall_started
+            cpu = time.process_time() - cpu_started - (drain.cpu - drain_started)
+            drain.close()
+            gb = size * args.repeat / 1024 ** 3
+            print(json.dumps({
+                "mode": mode,
+                "chunk_kb": DOWNLOAD_CHUNK_SIZE // 1024,
+                "ms_per_file": summarize(timings),
+                "mb_per_s": round(size * args.repeat / 1024 ** 2 / wall, 1),
+                "cpu_s_per_gb": round(cpu / gb, 3),
+            }))
+    finally:
+        os.remove(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: event-loop latency under concurrent mixed traffic, with core calls
+run inline on the event loop (before) vs. offloaded to the DB thread pool (after).
+
+Each simulated client loops over a mix of directory / feed / plans / events reads
+and profile writes, while a probe coroutine measures how long a trivial request
+(like GET /health) waits for the event loop.
+
+Usage: python scripts/bench_async_db.py [--clients 50] [--requests 40]
+"""
+import argparse
+import asyncio
+import random
+import time
+import json
+
+from bench_common import make_bench_db, seed, summarize
+
+from app.core.async_db import run_db, shutdown_db_executor
+from members.core import get_directory_core, update_profile_core
+from announcements.core import get_feed_core
+from music_scheduling.core import list_plans_core
+from events.core import list_events_core
+
+def build_mix(user_ids, rnd):
+    viewer = rnd.choice(user_ids)
+    return rnd.choice([
+        (get_directory_core, (viewer,), {"limit": 50, "search": rnd.choice([None, "Member 01", "member1"])}),
+        (get_feed_core, (viewer, "Member"), {"organization_id": 1}),
+        (list_plans_core, (viewer,), {}),
+        (list_events_core, (viewer,), {"organization_id": 1}),
+        (update_profile_core, (viewer, {"bio": f"updated {rnd.random()}"}), {}),
+    ])
+
+async def run_mode(mode, user_ids, clients, requests_per_client):
+    latencies = []
+    probe_latencies = []
+    done = asyncio.Event()
+
+    async def client(idx):
+        rnd = random.Random(idx)
+        for _ in range(requests_per_client):
+            fn, args, kwargs = build_mix(user_ids, rnd)
+            started = time.perf_counter()
+            # Yield once, like a request waiting for the loop to pick it up
+            await asyncio.sleep(0)
+            if mode == "inline":
+                fn(*args, **kwargs)
+            else:
+                await run_db(fn, *args, **kwargs)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    async def probe():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            probe_latencies.append((time.perf_counter() - started) * 1000 - 5)
+
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await probe_task
+
+    return {
+        "mode": mode,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "db_request_ms": summarize(latencies),
+        "loop_stall_ms": summarize(probe_latencies),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Async DB offload benchmark")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=40, help="requests per client")
+    args = parser.parse_args()
+
+    path = make_bench_db()
+    user_ids = seed()
+    print(f"Bench DB: {path}")
+
+    for mode in ("inline", "offloaded"):
+        result = asyncio.run(run_mode(mode, user_ids, args.clients, args.requests))
+        print(json.dumps(result))
+    shutdown_db_executor()
+
+if __name__ == "__main__":
+    main()
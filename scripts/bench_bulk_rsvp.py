@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: N individual RSVP calls (one request/transaction/audit row each) vs one
+bulk_rsvp_core call carrying the same N (user, event, status) tuples.
+
+Each call runs inside its own UnitOfWork, like an API request.
+
+Usage: python scripts/bench_bulk_rsvp.py [--sizes 5,20,100,500] [--repeat 5]
+"""
+import argparse
+import random
+import time
+import json
+
+from bench_common import make_bench_db, seed, summarize
+
+import db
+from events.core import rsvp_event_core, bulk_rsvp_core
+
+def make_items(user_ids, events, n, rnd):
+    return [{"user_id": rnd.choice(user_ids), "event_id": rnd.randint(1, events),
+             "status": rnd.choice(("going", "maybe", "not_going")), "guests": rnd.randint(0, 2)}
+            for _ in range(n)]
+
+def run_individual(actor_id, items):
+    for item in items:
+        with db.UnitOfWork():
+            rsvp_event_core(item["user_id"], item["event_id"], item["status"], item["guests"])
+
+def run_bulk(actor_id, items):
+    with db.UnitOfWork():
+        result = bulk_rsvp_core(actor_id, items)
+    assert result["ok"], result
+
+def audit_rows():
+    with db.get_db_connection() as conn:
+        return conn.execute("SELECT count(*) FROM audit_logs WHERE action_type IN ('RSVP_CHANGE', 'RSVP_BULK')").fetchone()[0]
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk vs individual RSVP benchmark")
+    parser.add_argument("--sizes", default="5,20,100,500")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    path = make_bench_db()
+    events = 200
+    user_ids = seed(members=1000, events=events)
+    admin_id = user_ids[0]  # seed() makes the first member an Admin
+    print(f"Bench DB: {path}")
+
+    rnd = random.Random(7)
+    for n in (int(x) for x in args.sizes.split(',')):
+        for mode, fn in (("individual", run_individual), ("bulk", run_bulk)):
+            timings = []
+            audit_before = audit_rows()
+            for _ in range(args.repeat):
+                items = make_items(user_ids, events, n, rnd)
+                started = time.perf_counter()
+                fn(admin_id, items)
+                timings.append((time.perf_counter() - started) * 1000)
+            # Audit rows go through the request transaction, so they are already visible here
+            print(json.dumps({
+                "items": n,
+                "mode": mode,
+                "total_ms": summarize(timings),
+                "audit_rows_per_batch": (audit_rows() - audit_before) / args.repeat,
+            }))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Shared helpers for the benchmark scripts: build a throwaway database with the
+schema migrations and seed it with a synthetic congregation.
+"""
+import os
+import sys
+import json
+import random
+import tempfile
+import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+EXECUTION_DIR = os.path.join(ROOT, 'execution')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, EXECUTION_DIR)
+
+import db
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[k]
+
+def summarize(values):
+    return {
+        "n": len(values),
+        "p50": round(percentile(values, 50), 2),
+        "p95": round(percentile(values, 95), 2),
+        "p99": round(percentile(values, 99), 2),
+        "max": round(max(values), 2) if values else 0.0,
+    }
+
+def make_bench_db():
+    """Point execution/db.py at a fresh temp database built with the migrations. Returns its path."""
+    path = os.path.join(tempfile.mkdtemp(prefix='church_bench_'), 'church_app.db')
+    db.close_pool()
+    db.DB_PATH = path
+
+    import migrations
+    migrations.migrate(verbose=False)
+    return path
+
+def seed(members=2000, ministries=20, events=1500, announcements=800, plans=300, seed_value=42):
+    """Insert a synthetic congregation. Returns the list of member ids."""
+    rnd = random.Random(seed_value)
+    now = datetime.datetime(2026, 1, 1)
+    with db.get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany("INSERT INTO ministries (name) VALUES (?)", [(f"Ministry {i}",) for i in range(ministries)])
+        cursor.executemany("""
+            INSERT INTO users (email, password_hash, role, status, organization_id) VALUES (?, 'x', ?, 'Active', 1)
+        """, [(f"member{i}@example.com", 'Admin' if i == 0 else 'Member') for i in range(members)])
+        user_ids = [r[0] for r in cursor.execute("SELECT id FROM users ORDER BY id")]
+        cursor.executemany("""
+            INSERT INTO member_profiles (user_id, full_name, phone, address, dob, bio, share_phone, organization_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+        """, [(uid, f"Member {uid:05d}", "555-0100", "Rua A, 1", "1990-05-17", "Bio " * 20, uid % 2) for uid in user_ids])
+        cursor.executemany("""
+            INSERT INTO ministry_assignments (user_id, ministry_id, role) VALUES (?, ?, 'Member')
+        """, [(uid, rnd.randint(1, ministries)) for uid in user_ids for _ in range(2)])
+        cursor.executemany("""
+            INSERT INTO events (title, start_at, end_at, is_public, target_ministry_ids, created_by, organization_id)
+            VALUES (?, ?, ?, ?, ?, 1, 1)
+        """, [(f"Event {i}",
+               (now + datetime.timedelta(hours=6 * i)).isoformat(),
+               (now + datetime.timedelta(hours=6 * i + 2)).isoformat(),
+               i % 3 == 0,
+               json.dumps([str(rnd.randint(1, ministries)) for _ in range(rnd.randint(0, 3))]))
+              for i in range(events)])
+        cursor.execute("""
+            INSERT INTO event_targets (event_id, ministry_id)
+            SELECT DISTINCT e.id, CAST(j.value AS INTEGER) FROM events e, json_each(e.target_ministry_ids) j
+        """)
+        cursor.executemany("""
+            INSERT INTO announcements (title, body, target_type, target_id, is_pinned, created_by, organization_id)
+            VALUES (?, ?, ?, ?, ?, 1, 1)
+        """, [(f"Announcement {i}", "Body " * 30, t, tid, i % 25 == 0)
+              for i in range(announcements)
+              for t, tid in [rnd.choice([('Global', None), ('Role', 'Member'), ('Ministry', str(rnd.randint(1, ministries)))])]])
+        cursor.executemany("""
+            INSERT INTO service_plans (date, notes, created_by) VALUES (?, 'Sunday service', 1)
+        """, [((now + datetime.timedelta(days=7 * i)).date().isoformat(),) for i in range(plans)])
+        conn.commit()
+    return user_ids
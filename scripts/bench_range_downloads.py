@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark: a web player scrubbing through a rehearsal MP3. Each seek either
+re-downloads the whole file (the old plain FileResponse) or asks for a byte range
+(files.delivery.parse_range + iter_file_range, as served with 206 by
+GET /worship/files/{id}/download); a revalidation with the asset's ETag is answered
+304 without a body. Every request includes the asset lookup (get_asset_path_core).
+Reports latency and bytes sent per request.
+
+Usage: python scripts/bench_range_downloads.py [--size-mb 20] [--seeks 50] [--window-kb 256]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import json
+
+from bench_common import make_bench_db, seed, summarize
+
+import files.core as files_core
+from files.delivery import asset_headers, is_not_modified, parse_range, iter_file_range
+
+def serve(asset_id, request_headers):
+    """What the download endpoint does for one request: (status, bytes sent)."""
+    asset = files_core.get_asset_path_core(1, asset_id)['data']
+    headers = asset_headers(asset)
+    if is_not_modified(request_headers, headers.get("ETag"), headers.get("Last-Modified")):
+        return 304, 0
+    path = os.path.join(files_core.STORAGE_DIR, asset['storage_path'])
+    byte_range = parse_range(request_headers.get("range"), asset['size_bytes'])
+    start, end = byte_range if byte_range else (0, asset['size_bytes'] - 1)
+    return (206 if byte_range else 200), sum(len(chunk) for chunk in iter_file_range(path, start, end))
+
+def main():
+    parser = argparse.ArgumentParser(description="Full download vs Range vs 304 benchmark")
+    parser.add_argument("--size-mb", type=int, default=20)
+    parser.add_argument("--seeks", type=int, default=50)
+    parser.add_argument("--window-kb", type=int, default=256)
+    args = parser.parse_args()
+
+    path = make_bench_db()
+    seed(members=10, ministries=1, events=1, announcements=1)
+    files_core.STORAGE_DIR = tempfile.mkdtemp(prefix='church_bench_assets_')
+    print(f"Bench DB: {path}")
+
+    size = args.size_mb * 1024 * 1024
+    content = os.urandom(size)
+    asset_id = files_core.upload_asset_core(1, "rehearsal.mp3", content, "audio/mpeg")['data']['asset_id']
+    asset = files_core.get_asset_path_core(1, asset_id)['data']
+    etag = asset_headers(asset)["ETag"]
+
+    rnd = random.Random(42)
+    window = args.window_kb * 1024
+    positions = [rnd.randrange(0, size - window) for _ in range(args.seeks)]
+
+    # The ranged bytes are exactly the requested slice of the file
+    status, sent = serve(asset_id, {"range": f"bytes={positions[0]}-{positions[0] + window - 1}"})
+    assert (status, sent) == (206, window)
+    stored = os.path.join(files_core.STORAGE_DIR, asset['storage_path'])
+    assert b"".join(iter_file_range(stored, positions[0], positions[0] + window - 1)) == content[positions[0]:positions[0] + window]
+
+    modes = [
+        ("full_file", lambda pos: {}),
+        ("range", lambda pos: {"range": f"bytes={pos}-{pos + window - 1}"}),
+        ("revalidate_304", lambda pos: {"if-none-match": etag}),
+    ]
+    for mode, request_headers in modes:
+        timings, sent_total = [], 0
+        for pos in positions:
+            started = time.perf_counter()
+            status, sent = serve(asset_id, request_headers(pos))
+            timings.append((time.perf_counter() - started) * 1000)
+            sent_total += sent
+        print(json.dumps({
+            "mode": mode,
+            "status": status,
+            "requests": len(positions),
+            "ms": summarize(timings),
+            "mb_sent": round(sent_total / (1024 * 1024), 2),
+        }))
+
+if __name__ == "__main__":
+    main()
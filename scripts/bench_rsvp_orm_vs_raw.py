@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: reading an event's attendee list through SQLAlchemy ORM hydration vs
+raw sqlite3 tuples mapped by events.rsvps.rsvp_to_dict vs the streamed JSON path
+(iter_event_rsvps_json). Reports rows/s per mode.
+
+The ORM mode needs SQLAlchemy installed; it is skipped otherwise.
+
+Usage: python scripts/bench_rsvp_orm_vs_raw.py [--attendees 5000] [--repeat 10]
+"""
+import argparse
+import time
+import json
+
+from bench_common import make_bench_db, seed, summarize
+
+import db
+from events.rsvps import RSVP_COLUMNS, rsvp_to_dict, API_STATUS, iter_event_rsvps_json
+
+def fill_event(event_id, user_ids):
+    with db.get_db_connection() as conn:
+        conn.executemany("""
+            INSERT INTO event_rsvps (event_id, user_id, status, guests, created_at) VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, [(event_id, uid, ("going", "maybe", "not_going")[uid % 3], uid % 3) for uid in user_ids])
+        conn.commit()
+
+def make_orm_reader(path):
+    try:
+        from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime
+        from sqlalchemy.orm import declarative_base, Session
+    except ImportError:
+        return None
+    Base = declarative_base()
+
+    class EventRSVP(Base):
+        __tablename__ = "event_rsvps"
+        event_id = Column(Integer, primary_key=True)
+        user_id = Column(Integer, primary_key=True)
+        status = Column(String)
+        guests = Column(Integer)
+        notes = Column(Text)
+        created_at = Column(DateTime)
+        updated_at = Column(DateTime)
+
+    engine = create_engine(f"sqlite:///{path}")
+
+    def read(event_id):
+        with Session(engine) as session:
+            rows = session.query(EventRSVP).filter(EventRSVP.event_id == event_id).order_by(EventRSVP.user_id).all()
+            return [{
+                "id": r.event_id, "event_id": r.event_id, "user_id": r.user_id,
+                "status": API_STATUS[r.status], "guests_count": (r.guests or 0) + 1, "notes": r.notes,
+                "created_at": r.created_at, "updated_at": r.updated_at,
+            } for r in rows]
+    return read
+
+def read_raw(event_id):
+    with db.get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        rows = cursor.execute(
+            f"SELECT {RSVP_COLUMNS} FROM event_rsvps WHERE event_id = ? ORDER BY user_id", (event_id,)
+        ).fetchall()
+    return [rsvp_to_dict(row) for row in rows]
+
+def read_stream(event_id):
+    return sum(len(chunk) for chunk in iter_event_rsvps_json(event_id))
+
+def main():
+    parser = argparse.ArgumentParser(description="ORM vs raw RSVP read benchmark")
+    parser.add_argument("--attendees", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    path = make_bench_db()
+    user_ids = seed(members=args.attendees, events=10)
+    event_id = 1
+    fill_event(event_id, user_ids)
+    print(f"Bench DB: {path}")
+
+    modes = [("raw_tuples", read_raw), ("stream_json", read_stream)]
+    orm_read = make_orm_reader(path)
+    if orm_read is None:
+        print(json.dumps({"mode": "orm", "skipped": "sqlalchemy not installed"}))
+    else:
+        modes.insert(0, ("orm", orm_read))
+
+    for mode, fn in modes:
+        fn(event_id)  # warm up
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            fn(event_id)
+            timings.append((time.perf_counter() - started) * 1000)
+        p50 = summarize(timings)["p50"]
+        print(json.dumps({
+            "mode": mode,
+            "rows": len(user_ids),
+            "ms": summarize(timings),
+            "rows_per_s": round(len(user_ids) / (p50 / 1000)) if p50 else None,
+        }))
+
+if __name__ == "__main__":
+    main()
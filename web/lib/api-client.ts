@@ -59,7 +59,7 @@ class ApiClient {
     async login(email: string, password: string, organization_slug?: string) {
         const body: any = { email, password };
         if (organization_slug) body.organization_slug = organization_slug;
-        return this.request<{ token: string; user_id: number; role: string }>('/auth/login', {
+        return this.request<{ access_token: string; token_type: string; token: string; user_id: number; role: string }>('/auth/login', {
             method: 'POST',
             body: JSON.stringify(body),
         });
@@ -132,11 +132,19 @@ class ApiClient {
         });
     }
 
+    async cancelRsvp(eventId: number) {
+        return this.request<{ message: string }>(`/rsvp/events/${eventId}/rsvp`, {
+            method: 'DELETE',
+        });
+    }
+
     // Announcements endpoints
-    async getAnnouncementsFeed(params: { limit?: number; offset?: number } = {}) {
+    // Pass next_cursor back as `cursor` for the next page, since_cursor as `since` for newer posts only
+    async getAnnouncementsFeed(params: { limit?: number; cursor?: string; since?: string } = {}) {
         const query = new URLSearchParams();
         if (params.limit) query.set('limit', params.limit.toString());
-        if (params.offset) query.set('offset', params.offset.toString());
+        if (params.cursor) query.set('cursor', params.cursor);
+        if (params.since) query.set('since', params.since);
 
         // Include selected organization slug from localStorage when available
         if (typeof window !== 'undefined') {
@@ -144,7 +152,13 @@ class ApiClient {
             if (orgSlug) query.set('organization', orgSlug);
         }
 
-        return this.request<{ results: any[]; limit: number; offset: number }>(
+        return this.request<{
+            results: any[];
+            limit: number;
+            next_cursor?: string | null;
+            since_cursor: string;
+            has_more?: boolean;
+        }>(
             `/announcements/feed?${query.toString()}`
         );
     }